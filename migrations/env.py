@@ -5,6 +5,8 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from shelfaware.food_inventory.models import Base, include_name
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -18,7 +20,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -44,6 +46,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -65,7 +69,14 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER most things, so alter tables by copying them. The copy drops the
+            # table's triggers, so a batch migration on food_items or list_items must create the
+            # search triggers of migration 0006 again
+            render_as_batch=connection.dialect.name == "sqlite",
+            # The full-text search tables are not models
+            include_name=include_name,
         )
 
         with context.begin_transaction():
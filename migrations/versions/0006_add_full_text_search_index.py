@@ -0,0 +1,90 @@
+"""add full text search index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 20:31:04.118702
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The search index as of this revision. Copied rather than imported from models, so later changes
+# to the models cannot change what this migration does.
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "name, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_trigram USING fts5(name, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS search_food_items_insert AFTER INSERT ON food_items BEGIN
+        INSERT INTO search_index (rowid, name, description) VALUES (new.id * 2, new.name, new.description);
+        INSERT INTO search_trigram (rowid, name) VALUES (new.id * 2, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_food_items_update AFTER UPDATE OF name, description ON food_items BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+        DELETE FROM search_trigram WHERE rowid = old.id * 2;
+        INSERT INTO search_index (rowid, name, description) VALUES (new.id * 2, new.name, new.description);
+        INSERT INTO search_trigram (rowid, name) VALUES (new.id * 2, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_food_items_delete AFTER DELETE ON food_items BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2;
+        DELETE FROM search_trigram WHERE rowid = old.id * 2;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_list_items_insert AFTER INSERT ON list_items
+    WHEN new.date_removed IS NULL BEGIN
+        INSERT INTO search_index (rowid, name) VALUES (new.id * 2 + 1, new.name);
+        INSERT INTO search_trigram (rowid, name) VALUES (new.id * 2 + 1, new.name);
+    END""",
+    # Removing an item from its list takes it out of the index
+    """CREATE TRIGGER IF NOT EXISTS search_list_items_update AFTER UPDATE OF name, date_removed ON list_items BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        DELETE FROM search_trigram WHERE rowid = old.id * 2 + 1;
+        INSERT INTO search_index (rowid, name) SELECT new.id * 2 + 1, new.name WHERE new.date_removed IS NULL;
+        INSERT INTO search_trigram (rowid, name) SELECT new.id * 2 + 1, new.name WHERE new.date_removed IS NULL;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_list_items_delete AFTER DELETE ON list_items BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 2 + 1;
+        DELETE FROM search_trigram WHERE rowid = old.id * 2 + 1;
+    END""",
+)
+
+SEARCH_INDEX_DROP = (
+    "DROP TRIGGER IF EXISTS search_food_items_insert",
+    "DROP TRIGGER IF EXISTS search_food_items_update",
+    "DROP TRIGGER IF EXISTS search_food_items_delete",
+    "DROP TRIGGER IF EXISTS search_list_items_insert",
+    "DROP TRIGGER IF EXISTS search_list_items_update",
+    "DROP TRIGGER IF EXISTS search_list_items_delete",
+    "DROP TABLE IF EXISTS search_index",
+    "DROP TABLE IF EXISTS search_trigram",
+)
+
+SEARCH_INDEX_BACKFILL = (
+    "DELETE FROM search_index",
+    "DELETE FROM search_trigram",
+    "INSERT INTO search_index (rowid, name, description) SELECT id * 2, name, description FROM food_items",
+    "INSERT INTO search_trigram (rowid, name) SELECT id * 2, name FROM food_items",
+    "INSERT INTO search_index (rowid, name) SELECT id * 2 + 1, name FROM list_items WHERE date_removed IS NULL",
+    "INSERT INTO search_trigram (rowid, name) SELECT id * 2 + 1, name FROM list_items WHERE date_removed IS NULL",
+)
+
+
+def upgrade() -> None:
+    # FTS5 virtual tables and their triggers are SQLite only; other databases search without them
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DDL + SEARCH_INDEX_BACKFILL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in SEARCH_INDEX_DROP:
+        op.execute(statement)
@@ -0,0 +1,150 @@
+"""
+Benchmark consumption forecasting over a large action history.
+
+Generates --users users with --items items each and --days of purchases and consumption, then
+times get_forecast for single users (one query into arrays, one vectorized pass), the same
+forecast computed with a per-action Python loop, and one pass over every user's history.
+
+Usage:
+    python benchmarks/bench_analytics.py --users 100 --items 500 --days 730
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, insert
+
+from shelfaware.food_inventory.analytics import ActionHistory, forecast, history_query
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, Category, List, ListItem, User
+
+NOW = time.time()
+
+
+def populate(engine, users, items, days, seed=0):
+    rng = np.random.default_rng(seed)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"user{u}"} for u in range(users)])
+        conn.execute(insert(List), [{"name": "Pantry", "user_id": u + 1} for u in range(users)])
+        conn.execute(insert(Category), [{"name": "Produce"}])
+        conn.execute(insert(ListItem), [
+            {"name": f"Item {u}-{i}", "quantity": 1.0, "list_id": u + 1, "category_id": 1}
+            for u in range(users) for i in range(items)
+        ])
+
+    total = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for user in range(users):
+            item_ids = user * items + np.arange(items) + 1
+            # Each item is used at its own rate and bought back every one to four weeks
+            consume_rate = rng.uniform(0.02, 0.2, items)
+            purchase_every = rng.uniform(7, 30, items)
+            consumes = rng.poisson(consume_rate * days)
+            purchases = np.maximum((days / purchase_every).astype(int), 1)
+
+            counts = consumes + purchases
+            action_items = np.repeat(item_ids, counts)
+            is_purchase = np.concatenate([
+                np.r_[np.ones(p, dtype=bool), np.zeros(c, dtype=bool)] for p, c in zip(purchases, consumes)
+            ])
+            quantity = np.where(is_purchase, np.repeat(consume_rate * purchase_every, counts).round() + 1, 1.0)
+            seconds = NOW - rng.uniform(0, days * 86400, counts.sum())
+            dates = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
+            dates = np.char.replace(dates, "T", " ")
+
+            cursor.executemany(
+                "INSERT INTO actions (action_type, quantity, date, user_id, list_item_id) VALUES (?, ?, ?, ?, ?)",
+                zip(np.where(is_purchase, "purchase", "consume").tolist(), quantity.tolist(), dates.tolist(),
+                    [user + 1] * len(action_items), action_items.tolist()),
+            )
+            total += len(action_items)
+        raw.commit()
+    finally:
+        raw.close()
+    return total
+
+
+def forecast_loop(rows, now, window_days=90.0):
+    # The same statistics as analytics.forecast, one action at a time
+    now_days = now / 86400
+    stats = {}
+    for user_id, item_id, delta, day in rows:
+        item = stats.setdefault((user_id, item_id), [0.0, 0.0, day])
+        item[0] += delta
+        if delta < 0 and day >= now_days - window_days:
+            item[1] -= delta
+    result = {}
+    for key, (stock, used, first) in stats.items():
+        rate = used / min(max(now_days - first, 1.0), window_days)
+        result[key] = 0.0 if stock <= 0 else (stock / rate if rate > 0 else float("inf"))
+    return result
+
+
+def median_ms(times):
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        actions = populate(engine, args.users, args.items, args.days)
+        print(f"Inserted {actions} actions in {time.perf_counter() - start:.1f}s "
+              f"({actions // (args.users * args.items)} per item)")
+
+        manager = InventoryManager(engine=engine)
+        load_times, vector_times, loop_times, total_times = [], [], [], []
+        for i in range(args.repeat):
+            username = f"user{i % args.users}"
+            start = time.perf_counter()
+            rows = manager.session.execute(history_query("sqlite", username)).all()
+            loaded = time.perf_counter()
+            vectorized = forecast(ActionHistory.from_rows(rows), now=NOW)
+            computed = time.perf_counter()
+            looped = forecast_loop(rows, NOW)
+            loop_times.append(time.perf_counter() - computed)
+            load_times.append(loaded - start)
+            vector_times.append(computed - loaded)
+
+            start = time.perf_counter()
+            manager.get_forecast(username, now=NOW).shopping_list()
+            total_times.append(time.perf_counter() - start)
+
+            expected = [looped[(user, item)] for user, item in zip(vectorized.user_ids.tolist(),
+                                                                   vectorized.list_item_ids.tolist())]
+            if not np.allclose(vectorized.days_until_empty, expected):
+                raise SystemExit("Vectorized and loop forecasts disagree")
+        manager.session.commit()
+
+        print(f"Per user ({len(rows)} actions, {len(vectorized)} items):")
+        print(f"  load (one query)         {median_ms(load_times):8.1f} ms")
+        print(f"  forecast, vectorized     {median_ms(vector_times):8.1f} ms")
+        print(f"  forecast, Python loop    {median_ms(loop_times):8.1f} ms "
+              f"({median_ms(loop_times) / median_ms(vector_times):.1f}x)")
+        print(f"  get_forecast + shopping  {median_ms(total_times):8.1f} ms")
+
+        start = time.perf_counter()
+        rows = manager.session.execute(history_query("sqlite")).all()
+        loaded = time.perf_counter()
+        result = forecast(ActionHistory.from_rows(rows), now=NOW)
+        computed = time.perf_counter()
+        print(f"All users ({len(rows)} actions, {len(result)} items): load {(loaded - start):.2f}s, "
+              f"forecast {(computed - loaded) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark detection latency of the inference backends on the sample images.
+
+Each backend is given as backend:model_path. Models that have not been exported are skipped.
+Boxes and decoded barcodes are compared with the first backend to check accuracy parity.
+
+Usage:
+    python -m shelfaware.barcode.export models/barcodes.pt --format onnx
+    python benchmarks/bench_backends.py --images ../samples/upc \\
+        --backends ultralytics:models/barcodes.pt onnx:models/barcodes.onnx
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from shelfaware.barcode.detector import BarcodeDetector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--backends", nargs="+", default=[
+        "ultralytics:" + os.path.join(ROOT, "models", "barcodes.pt"),
+        "onnx:" + os.path.join(ROOT, "models", "barcodes.onnx"),
+        "onnx:" + os.path.join(ROOT, "models", "barcodes_int8.onnx"),
+        "ultralytics:" + os.path.join(ROOT, "models", "barcodes_openvino_model"),
+    ])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    reference = None
+    print(f"{'backend':<50} {'load s':>7} {'p50 ms':>8} {'p95 ms':>8} {'boxes':>6} {'parity':>7}")
+    for spec in args.backends:
+        backend, model_path = spec.split(":", 1)
+        if not os.path.exists(model_path):
+            print(f"{spec:<50} skipped, {model_path} not found")
+            continue
+
+        start = time.perf_counter()
+        detector = BarcodeDetector(model_path=model_path, backend=backend)
+        detector.warm_up()
+        load_seconds = time.perf_counter() - start
+
+        images_rgb = [detector.load_image(image_path) for image_path in image_paths]
+        latencies = []
+        for _ in range(args.repeat):
+            for image_rgb in images_rgb:
+                start = time.perf_counter()
+                detector.detect_boxes(image_rgb)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        results = []
+        for image_rgb in images_rgb:
+            boxes = detector.detect_boxes(image_rgb)
+            results.append((len(boxes), sorted(detector.decode_image(image_rgb, boxes))))
+        if reference is None:
+            reference = results
+        matching = sum(result == expected for result, expected in zip(results, reference))
+
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(f"{spec:<50} {load_seconds:>7.2f} {statistics.median(latencies):>8.1f} {p95:>8.1f} "
+              f"{sum(boxes for boxes, _ in results):>6} {matching:>3}/{len(results):<3}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark single-image versus batched barcode detection over a folder of images.
+
+Usage:
+    python benchmarks/bench_batch_inference.py --images ../samples/upc --batch-size 8
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from shelfaware.barcode.detector import BarcodeDetector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_single(detector, image_paths):
+    return [detector.extract_and_decode(image_path) for image_path in image_paths]
+
+
+def run_batched(detector, image_paths, batch_size):
+    return detector.extract_and_decode_batch(image_paths, batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=os.path.join(ROOT, "models", "barcodes.pt"))
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    detector = BarcodeDetector(model_path=args.model)
+
+    # Warm up the model so the first timed run doesn't include lazy initialisation
+    detector.extract_and_decode(image_paths[0])
+
+    single_results = batched_results = None
+    for mode in ("single", "batched"):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            if mode == "single":
+                single_results = run_single(detector, image_paths)
+            else:
+                batched_results = run_batched(detector, image_paths, args.batch_size)
+        elapsed = time.perf_counter() - start
+        images_per_sec = len(image_paths) * args.repeat / elapsed
+        print(f"{mode:>8}: {images_per_sec:8.2f} images/sec ({elapsed:.2f}s for {len(image_paths) * args.repeat} images)")
+
+    if single_results != batched_results:
+        print("WARNING: batched results differ from single-image results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark bulk list item and action ingestion against the one-row-per-commit methods.
+
+Usage:
+    python benchmarks/bench_bulk_ingest.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base
+
+
+def new_manager(tmpdir, name):
+    engine = create_engine(f"sqlite:///{os.path.join(tmpdir, name)}.db")
+    Base.metadata.create_all(engine)
+    manager = InventoryManager(engine=engine)
+    manager.add_user("bench_user")
+    manager.add_list("bench_user", "Pantry")
+    for category in ("Produce", "Dairy", "Grains"):
+        manager.add_category(category)
+    return manager
+
+
+def make_items(count):
+    categories = ("Produce", "Dairy", "Grains")
+    return [
+        {"username": "bench_user", "list_name": "Pantry", "item_name": f"Item {i}",
+         "quantity": 1 + i % 5, "category_name": categories[i % 3]}
+        for i in range(count)
+    ]
+
+
+def make_actions(count, items):
+    return [
+        {"username": "bench_user", "item_name": f"Item {i % items}", "action_type": "consume", "quantity": 1}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--single-rows", type=int, default=1000, help="Rows timed with add_list_item/add_action")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        manager = new_manager(tmpdir, "single")
+        items = make_items(args.single_rows)
+        start = time.perf_counter()
+        for item in items:
+            manager.add_list_item(**item)
+        elapsed = time.perf_counter() - start
+        print(f"{'add_list_item':<20} {args.single_rows:>7} rows: {args.single_rows / elapsed:>10,.0f} rows/sec")
+
+        actions = make_actions(args.single_rows, args.single_rows)
+        start = time.perf_counter()
+        for action in actions:
+            manager.add_action(**action)
+        elapsed = time.perf_counter() - start
+        print(f"{'add_action':<20} {args.single_rows:>7} rows: {args.single_rows / elapsed:>10,.0f} rows/sec")
+
+        for size in args.sizes:
+            manager = new_manager(tmpdir, f"bulk_{size}")
+
+            items = make_items(size)
+            start = time.perf_counter()
+            manager.add_list_items_bulk(items)
+            elapsed = time.perf_counter() - start
+            print(f"{'add_list_items_bulk':<20} {size:>7} rows: {size / elapsed:>10,.0f} rows/sec")
+
+            actions = make_actions(size, size)
+            start = time.perf_counter()
+            manager.add_actions_bulk(actions)
+            elapsed = time.perf_counter() - start
+            print(f"{'add_actions_bulk':<20} {size:>7} rows: {size / elapsed:>10,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
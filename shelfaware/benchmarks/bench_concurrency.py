@@ -0,0 +1,91 @@
+"""
+Benchmark one InventoryManager shared by N threads doing mixed reads and writes.
+
+Compares the tuned engine from get_engine() (WAL, synchronous=NORMAL, mmap, busy_timeout, pooled
+connections) with an engine using SQLAlchemy and SQLite defaults.
+
+Usage:
+    python benchmarks/bench_concurrency.py --threads 1 4 8 --ops 200 --write-ratio 0.2
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+
+def setup_manager(engine, items):
+    Base.metadata.create_all(engine)
+    manager = InventoryManager(engine=engine)
+    manager.add_user("bench_user")
+    manager.add_list("bench_user", "Pantry")
+    manager.add_category("Produce")
+    manager.add_list_items_bulk([
+        {"username": "bench_user", "list_name": "Pantry", "item_name": f"Item {i}", "quantity": 1,
+         "category_name": "Produce"}
+        for i in range(items)
+    ])
+    return manager
+
+
+def run(manager, threads, ops, write_ratio, items):
+    errors = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for i in range(ops):
+            try:
+                with manager.session_scope():
+                    if rng.random() < write_ratio:
+                        if rng.random() < 0.5:
+                            manager.add_list_item("bench_user", "Pantry", f"New {seed}-{i}", 1, "Produce")
+                        else:
+                            manager.update_quantity("Pantry", f"Item {rng.randrange(items)}", rng.randrange(10))
+                    else:
+                        manager.get_user_lists("bench_user")
+                        manager.get_list_items("bench_user", "Pantry")
+            except Exception as e:
+                errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--ops", type=int, default=200, help="Operations per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--items", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} {'threads':>8} {'ops/sec':>10} {'errors':>7}")
+    for name in ("default", "tuned"):
+        for threads in args.threads:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+                if name == "tuned":
+                    engine = get_engine(url)
+                else:
+                    engine = create_engine(url, connect_args={"check_same_thread": False})
+                manager = setup_manager(engine, args.items)
+
+                elapsed, errors = run(manager, threads, args.ops, args.write_ratio, args.items)
+                print(f"{name:>8} {threads:>8} {threads * args.ops / elapsed:>10,.0f} {len(errors):>7}")
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Report which decode strategy (grayscale crops or full-frame fallback) succeeds on a folder of images.
+
+Usage:
+    python benchmarks/bench_decode_strategies.py --images ../samples/upc
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from shelfaware.barcode.detector import BarcodeDetector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=os.path.join(ROOT, "models", "barcodes.pt"))
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    args = parser.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    detector = BarcodeDetector(model_path=args.model)
+
+    decoded = 0
+    start = time.perf_counter()
+    for image_path in image_paths:
+        barcodes = detector.extract_and_decode(image_path)
+        decoded += bool(barcodes)
+        print(f"{os.path.basename(image_path)}: {[data for _, data in barcodes]}")
+    elapsed = time.perf_counter() - start
+
+    print(f"\nDecoded {decoded}/{len(image_paths)} images in {elapsed:.2f}s")
+    for name, stats in detector.decode_stats.items():
+        print(
+            f"{name:>10}: attempts={stats.attempts} hits={stats.hits} "
+            f"hit_rate={stats.hit_rate:.2%} mean_latency={stats.mean_latency_ms:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark accuracy and latency of the barcode decoders on a folder of images.
+
+Each decoder is run with every symbology enabled and with only the grocery ones (EAN-13, UPC-A).
+Images are decoded as full grayscale frames, or as crops of the YOLO detections with --model.
+Accuracy is the share of images whose barcode matches the value most decoders agree on.
+Finally every image is decoded at once on 1 and on --threads threads, as BarcodeDetector does
+with the crops of one image. Decoders that are not installed are skipped.
+
+Usage:
+    python benchmarks/bench_decoders.py --images ../samples/upc --threads 4
+    python benchmarks/bench_decoders.py --images ../samples/upc --model models/barcodes.pt
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from shelfaware.barcode.decoders import DECODERS, GROCERY_SYMBOLOGIES, make_decoder
+from shelfaware.barcode.decoding import CropDecodeStrategy, FullFrameDecodeStrategy
+from shelfaware.barcode.loading import load_image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def prepare_images(image_paths, model_path):
+    import numpy as np
+
+    if model_path:
+        from shelfaware.barcode.detector import BarcodeDetector
+        detector = BarcodeDetector(model_path=model_path)
+        strategy = CropDecodeStrategy()
+    else:
+        detector = None
+        strategy = FullFrameDecodeStrategy()
+
+    prepared = []
+    for image_path in image_paths:
+        image_rgb = load_image(image_path, 1600)
+        boxes = detector.detect_boxes(image_rgb) if detector else []
+        # Copied, the full-frame strategy reuses its buffer
+        prepared.append([np.array(image) for image in strategy.prepare(image_rgb, boxes)])
+    return prepared
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--model", help="Decode crops of the detections of this YOLO model instead of full frames")
+    parser.add_argument("--decoders", nargs="+", default=list(DECODERS))
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+    prepared = prepare_images(image_paths, args.model)
+    print(f"{len(image_paths)} images, {sum(map(len, prepared))} {'crops' if args.model else 'frames'}")
+
+    decoders = []
+    for name in args.decoders:
+        for symbologies in (None, GROCERY_SYMBOLOGIES):
+            try:
+                decoders.append((name, symbologies, make_decoder(name, symbologies)))
+            except ImportError as e:
+                print(f"Skipping {name}: {e}")
+                break
+
+    results = {}
+    for name, symbologies, decoder in decoders:
+        times, values = [], []
+        for images in prepared:
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                barcodes = [barcode for image in images for barcode in decoder.decode(image)]
+                times.append(time.perf_counter() - start)
+            # UPC-A is EAN-13 with a leading 0, compare them as 13 digits
+            values.append({data.zfill(13) for _, data in barcodes})
+        results[(name, symbologies)] = (times, values)
+
+    consensus = []
+    for index in range(len(image_paths)):
+        votes = Counter(value for _, values in results.values() for value in values[index])
+        consensus.append(votes.most_common(1)[0][0] if votes else None)
+    found = sum(value is not None for value in consensus)
+
+    print(f"{'decoder':<10} {'symbologies':<12} {'accuracy':>9} {'median ms':>10} {'total ms':>9}")
+    for (name, symbologies), (times, values) in results.items():
+        correct = sum(expected is not None and expected in value for expected, value in zip(consensus, values))
+        total_ms = sum(times) / args.repeat * 1000
+        print(f"{name:<10} {'grocery' if symbologies else 'all':<12} {correct:>4}/{found:<4} "
+              f"{statistics.median(times) * 1000:>10.1f} {total_ms:>9.1f}")
+
+    images = [image for images in prepared for image in images]
+    for name, symbologies, decoder in decoders:
+        if symbologies is None:
+            continue
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            list(map(decoder.decode, images))
+        serial = (time.perf_counter() - start) / args.repeat
+        with ThreadPoolExecutor(args.threads) as executor:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                list(executor.map(decoder.decode, images))
+            parallel = (time.perf_counter() - start) / args.repeat
+        print(f"{name} grocery, {len(images)} images: 1 thread {serial * 1000:.1f} ms, "
+              f"{args.threads} threads {parallel * 1000:.1f} ms ({serial / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark image loading and full-frame decode preparation, before and after the reworked path.
+
+"legacy" repeats what BarcodeDetector used to do with a path: cv2.imread, a BGR to RGB copy,
+Image.fromarray (another copy) and pyzbar's own grayscale conversion. "current" uses
+load_image with the detector's default load_size and FullFrameDecodeStrategy's reused grayscale
+buffer. Each mode runs in its own process so peak RSS is measured separately. pyzbar decoding is
+timed when the zbar library is installed.
+
+Usage:
+    python benchmarks/bench_image_loading.py --images ../samples/upc --repeat 3
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_legacy(image_path, timings):
+    import cv2
+    from PIL import Image
+
+    start = time.perf_counter()
+    image_rgb = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2RGB)
+    timings["load"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    # Image.fromarray copies the frame, then pyzbar converts it to grayscale and takes its bytes
+    gray = Image.fromarray(image_rgb).convert("L")
+    pixels = gray.tobytes()
+    timings["prepare"] += time.perf_counter() - start
+    return gray, pixels
+
+
+def run_current(image_path, timings, strategy, load_size):
+    from shelfaware.barcode.loading import load_image
+
+    start = time.perf_counter()
+    image_rgb = load_image(image_path, load_size)
+    timings["load"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    gray = strategy.prepare(image_rgb, [])[0]
+    pixels = gray.tobytes()
+    timings["prepare"] += time.perf_counter() - start
+    return gray, pixels
+
+
+def run_mode(mode, image_paths, repeat, load_size):
+    from shelfaware.barcode.decoding import FullFrameDecodeStrategy
+
+    try:
+        from pyzbar.pyzbar import decode
+    except ImportError:
+        decode = None
+
+    baseline_rss = peak_rss_mb()
+    strategy = FullFrameDecodeStrategy()
+    timings = {"load": 0.0, "prepare": 0.0, "decode": 0.0}
+    decoded = 0
+    for _ in range(repeat):
+        for image_path in image_paths:
+            if mode == "legacy":
+                gray, _ = run_legacy(image_path, timings)
+            else:
+                gray, _ = run_current(image_path, timings, strategy, load_size)
+            if decode is not None:
+                start = time.perf_counter()
+                decoded += len(decode(gray))
+                timings["decode"] += time.perf_counter() - start
+
+    images = len(image_paths) * repeat
+    return {
+        "mode": mode,
+        "size": list(gray.size),
+        "load_ms": timings["load"] * 1000 / images,
+        "prepare_ms": timings["prepare"] * 1000 / images,
+        "decode_ms": timings["decode"] * 1000 / images if decode is not None else None,
+        "decoded": decoded,
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--load-size", type=int, default=1600)
+    parser.add_argument("--mode", choices=("legacy", "current"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    image_paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not image_paths:
+        raise SystemExit(f"No images found in {args.images}")
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, image_paths, args.repeat, args.load_size)))
+        return
+
+    print(f"{'mode':>8} {'decoded at':>11} {'load ms':>8} {'prepare ms':>11} {'decode ms':>10} {'peak RSS MB':>12}")
+    for mode in ("legacy", "current"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--images", args.images, "--repeat", str(args.repeat),
+             "--load-size", str(args.load_size)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output)
+        decode_ms = f"{result['decode_ms']:.1f}" if result["decode_ms"] is not None else "n/a"
+        size = "x".join(str(side) for side in result["size"])
+        print(f"{mode:>8} {size:>11} {result['load_ms']:>8.1f} {result['prepare_ms']:>11.1f} {decode_ms:>10} "
+              f"{result['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Time the inventory hot-path lookups on a generated inventory, with and without the schema indexes.
+
+Usage:
+    python benchmarks/bench_indexes.py --items 1000000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+
+from shelfaware.food_inventory.models import Action, Base, Category, FoodItem, List, ListItem, User
+
+
+def populate(engine, items, users, foods):
+    start = datetime.datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"user{i}"} for i in range(users)])
+        conn.execute(insert(List), [{"name": f"List {i % 3}", "user_id": 1 + i // 3} for i in range(users * 3)])
+        conn.execute(insert(Category), [{"name": "Produce"}])
+        conn.execute(insert(FoodItem), [{"name": f"Food {i}", "barcode": f"{i:013d}"} for i in range(foods)])
+
+        for offset in range(0, items, 100000):
+            count = min(100000, items - offset)
+            conn.execute(insert(ListItem), [
+                {
+                    "name": f"Item {i}",
+                    "quantity": 1.0,
+                    "list_id": 1 + i % (users * 3),
+                    "category_id": 1,
+                    "food_id": 1 + i % foods,
+                    "date_added": start + datetime.timedelta(minutes=i),
+                    "date_removed": start if i % 4 == 0 else None,
+                }
+                for i in range(offset, offset + count)
+            ])
+            conn.execute(insert(Action), [
+                {
+                    "action_type": "consume",
+                    "quantity": 1.0,
+                    "user_id": 1 + i % users,
+                    "list_item_id": 1 + i,
+                    "date": start + datetime.timedelta(minutes=i),
+                }
+                for i in range(offset, offset + count)
+            ])
+
+
+def queries(items, users, foods):
+    return {
+        "ListItem.name": lambda: select(ListItem.id).where(ListItem.name == f"Item {random.randrange(items)}"),
+        "List.name + user_id": lambda: select(List.id).where(
+            List.user_id == random.randrange(1, users), List.name == "List 1"
+        ),
+        "FoodItem.barcode": lambda: select(FoodItem.id).where(FoodItem.barcode == f"{random.randrange(foods):013d}"),
+        "FoodItem.name": lambda: select(FoodItem.id).where(FoodItem.name == f"Food {random.randrange(foods)}"),
+        "Action.list_item_id": lambda: select(Action.id).where(
+            Action.list_item_id == random.randrange(1, items)
+        ).order_by(Action.date),
+        "active items in list": lambda: select(ListItem.id).where(
+            ListItem.list_id == random.randrange(1, users * 3), ListItem.date_removed.is_(None)
+        ).order_by(ListItem.date_added),
+    }
+
+
+def time_queries(engine, statements, repeat):
+    timings = {}
+    with engine.connect() as conn:
+        for name, statement in statements.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(statement()).all()
+            timings[name] = 1000 * (time.perf_counter() - start) / repeat
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--foods", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+
+        start = time.perf_counter()
+        populate(engine, args.items, args.users, args.foods)
+        print(f"generated {args.items:,} list items and actions in {time.perf_counter() - start:.1f}s\n")
+
+        statements = queries(args.items, args.users, args.foods)
+        indexed = time_queries(engine, statements, args.repeat)
+
+        # Drop the secondary indexes, keeping primary keys and unique constraints
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.drop(conn)
+        scanned = time_queries(engine, statements, max(1, args.repeat // 10))
+
+        print(f"{'lookup':>22} {'scan ms':>10} {'indexed ms':>11} {'speedup':>8}")
+        for name in statements:
+            print(f"{name:>22} {scanned[name]:>10.2f} {indexed[name]:>11.3f} {scanned[name] / indexed[name]:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark the barcode ingestion pipeline: scanned image to list items.
+
+Resolution: --scans barcodes drawn with Zipf popularity from --products products, a third of
+which are already in the database, are added in batches of --batch-size with ScanIngestor and,
+as a baseline, one at a time with the InventoryManager methods (a FoodItem barcode query, an API
+lookup and a commit per scan). Open Food Facts is simulated with --api-latency-ms per call.
+
+End to end: the photos in --images are cycled to --images-count images and ingested with
+ScanIngestor.ingest (detection one batch ahead on a background thread) and sequentially. Without
+--model, full frames are decoded with --decoder in place of the YOLO detector.
+
+Usage:
+    python benchmarks/bench_ingest.py --scans 5000 --products 2000 --api-latency-ms 100
+    python benchmarks/bench_ingest.py --images ../samples/upc --model models/barcodes.pt
+"""
+
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from shelfaware.barcode.decoders import GROCERY_SYMBOLOGIES, make_decoder
+from shelfaware.barcode.gtin import gtin_check_digit
+from shelfaware.barcode.loading import load_image
+from shelfaware.food_inventory.ingest import ScanIngestor
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, FoodItem, get_engine
+from shelfaware.openfoods.food import FoodProduct
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SimulatedFoodClient:
+    # Every barcode is a product; each call waits as long as one round of concurrent requests
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def fetch_products(self, codes):
+        self.calls += 1
+        time.sleep(self.latency)
+        return [FoodProduct(f"Product {code}", ["brand"], ["groceries"], None) for code in codes]
+
+    def fetch_product(self, code):
+        return self.fetch_products([code])[0]
+
+
+class FullFrameDetector:
+    # Stands in for BarcodeDetector without a model: decodes whole frames
+    def __init__(self, decoder):
+        self.decoder = make_decoder(decoder, GROCERY_SYMBOLOGIES)
+
+    def extract_and_decode_batch(self, images, batch_size=8):
+        return [self.decoder.decode(load_image(image, 1600)) for image in images]
+
+
+def make_manager(tmpdir, name):
+    engine = get_engine(f"sqlite:///{os.path.join(tmpdir, name)}")
+    Base.metadata.create_all(engine)
+    manager = InventoryManager(engine)
+    manager.add_user("bench")
+    manager.add_list("bench", "Pantry")
+    manager.add_category("Uncategorized")
+    return manager
+
+
+def catalogue(products, seed=0):
+    rng = np.random.default_rng(seed)
+    bodies = rng.integers(10 ** 11, 10 ** 12, products)
+    return [f"{body}{gtin_check_digit(str(body))}" for body in bodies]
+
+
+def preload(manager, codes):
+    manager.session.execute(FoodItem.__table__.insert(), [{"name": f"Product {code}", "barcode": code} for code in codes])
+    manager.session.commit()
+
+
+def bench_resolution(args, tmpdir):
+    codes = catalogue(args.products)
+    rng = np.random.default_rng(1)
+    ranks = np.minimum(rng.zipf(1.2, args.scans), args.products) - 1
+    scans = [codes[rank] for rank in ranks]
+    known = codes[::3]
+    latency = args.api_latency_ms / 1000
+
+    manager = make_manager(tmpdir, "pipeline.db")
+    preload(manager, known)
+    client = SimulatedFoodClient(latency)
+    ingestor = ScanIngestor(manager, food_client=client)
+    for label in ("cold", "warm"):
+        start = time.perf_counter()
+        for i in range(0, len(scans), args.batch_size):
+            ingestor.add_scans("bench", "Pantry", scans[i:i + args.batch_size])
+        seconds = time.perf_counter() - start
+        print(f"ScanIngestor, {label} map:  {len(scans) / seconds:8.1f} scans/sec ({client.calls} API calls)")
+        client.calls = 0
+
+    baseline_scans = scans[:args.baseline_scans]
+    manager = make_manager(tmpdir, "baseline.db")
+    preload(manager, known)
+    client = SimulatedFoodClient(latency)
+    start = time.perf_counter()
+    for code in baseline_scans:
+        name = manager.session.query(FoodItem.name).filter_by(barcode=code).limit(1).scalar()
+        if name is None:
+            name = client.fetch_product(code).product_name
+            manager.add_food_item(name, barcode=code)
+        manager.add_list_item("bench", "Pantry", name, 1, "Uncategorized", food_name=name)
+    seconds = time.perf_counter() - start
+    print(f"One scan at a time:       {len(baseline_scans) / seconds:8.1f} scans/sec "
+          f"({client.calls} API calls, first {len(baseline_scans)} scans)")
+
+
+def bench_end_to_end(args, tmpdir):
+    paths = sorted(glob.glob(os.path.join(args.images, "*.jpg")))
+    if not paths:
+        print(f"No images found in {args.images}, skipping the end to end benchmark")
+        return
+    if args.model:
+        from shelfaware.barcode.detector import BarcodeDetector
+        detector = BarcodeDetector(args.model, decoder=args.decoder, symbologies=GROCERY_SYMBOLOGIES)
+        detector.warm_up()
+    else:
+        detector = FullFrameDetector(args.decoder)
+    # Encoded bytes, so file reads are not timed
+    images = []
+    for path in paths:
+        with open(path, "rb") as f:
+            images.append(f.read())
+    images = [images[i % len(images)] for i in range(args.images_count)]
+    latency = args.api_latency_ms / 1000
+
+    manager = make_manager(tmpdir, "end_to_end.db")
+    ingestor = ScanIngestor(manager, detector, SimulatedFoodClient(latency))
+    stats = ingestor.ingest(images, "bench", "Pantry", batch_size=args.batch_size)
+    print(stats.summary())
+
+    manager = make_manager(tmpdir, "sequential.db")
+    ingestor = ScanIngestor(manager, detector, SimulatedFoodClient(latency))
+    scans = 0
+    start = time.perf_counter()
+    for i in range(0, len(images), args.batch_size):
+        barcodes = detector.extract_and_decode_batch(images[i:i + args.batch_size])
+        codes = [data for image_barcodes in barcodes for _, data in image_barcodes]
+        scans += len(codes)
+        ingestor.add_scans("bench", "Pantry", codes)
+    seconds = time.perf_counter() - start
+    print(f"Sequential: {scans} barcodes in {seconds:.2f}s: {scans / seconds:.1f} scans/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scans", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--baseline-scans", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--api-latency-ms", type=float, default=100)
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--images-count", type=int, default=64)
+    parser.add_argument("--model", help="YOLO model for the end to end benchmark")
+    parser.add_argument("--decoder", default="zxing", choices=("pyzbar", "opencv", "zxing"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bench_resolution(args, tmpdir)
+        bench_end_to_end(args, tmpdir)
+
+
+if __name__ == "__main__":
+    main()
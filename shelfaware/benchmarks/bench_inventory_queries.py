@@ -0,0 +1,75 @@
+"""
+Count SQL statements and time per InventoryManager operation on a list with many items.
+
+Usage:
+    python benchmarks/bench_inventory_queries.py --items 10000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, insert, select
+
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, Category, List, ListItem
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def populate(engine, items):
+    with engine.begin() as conn:
+        list_id = conn.execute(select(List.id).where(List.name == "Pantry")).scalar_one()
+        category_id = conn.execute(select(Category.id).where(Category.name == "Produce")).scalar_one()
+        conn.execute(insert(ListItem), [
+            {"name": f"Item {i}", "quantity": 1.0, "list_id": list_id, "category_id": category_id}
+            for i in range(items)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        manager = InventoryManager(engine=engine)
+
+        manager.add_user("bench_user")
+        manager.add_list("bench_user", "Pantry")
+        manager.add_category("Produce")
+        populate(engine, args.items)
+
+        operations = {
+            "add_list_item": lambda i: manager.add_list_item("bench_user", "Pantry", f"New {i}", 1, "Produce"),
+            "get_user_lists": lambda i: manager.get_user_lists("bench_user"),
+            "get_list_items": lambda i: manager.get_list_items("bench_user", "Pantry"),
+            "update_quantity": lambda i: manager.update_quantity("Pantry", f"Item {i}", 2),
+            "remove_list_item": lambda i: manager.remove_list_item("Pantry", f"Item {i}"),
+            "add_action": lambda i: manager.add_action("bench_user", f"Item {i}", "consume", 1),
+        }
+
+        counter = StatementCounter(engine)
+        print(f"{'operation':>18} {'statements/op':>14} {'ms/op':>10}")
+        for name, operation in operations.items():
+            counter.count = 0
+            start = time.perf_counter()
+            for i in range(args.repeat):
+                operation(i)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>18} {counter.count / args.repeat:>14.1f} {1000 * elapsed / args.repeat:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
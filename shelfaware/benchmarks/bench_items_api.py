@@ -0,0 +1,97 @@
+"""
+Load test the server's /items endpoints in-process, async database layer against the sync one.
+
+The sync path runs InventoryManager on the thread pool, which the server uses on SQLite. The
+async path runs AsyncInventoryManager on aiosqlite, which the server uses for other databases.
+Requests go through httpx's ASGI transport, so no sockets or uvicorn workers are involved.
+
+Usage:
+    python benchmarks/bench_items_api.py --concurrency 1 10 50 --requests 1000 --write-ratio 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+
+from shelfaware import server
+from shelfaware.food_inventory.async_inventory import AsyncInventoryManager, get_async_engine
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+
+def seed(url, items):
+    engine = get_engine(url)
+    Base.metadata.create_all(engine)
+    manager = InventoryManager(engine=engine)
+    manager.add_user("bench_user")
+    manager.add_list("bench_user", "Pantry")
+    manager.add_category("Uncategorized")
+    manager.add_list_items_bulk([
+        {"username": "bench_user", "list_name": "Pantry", "item_name": f"Item {i}", "quantity": 1,
+         "category_name": "Uncategorized"}
+        for i in range(items)
+    ])
+    return engine
+
+
+async def load(app, concurrency, requests, write_ratio):
+    params = {"username": "bench_user", "list_name": "Pantry"}
+    latencies = []
+    counter = iter(range(requests))
+    rng = random.Random(0)
+
+    async def client_loop(client):
+        for i in counter:
+            start = time.perf_counter()
+            if rng.random() < write_ratio:
+                response = await client.post("/items", params=params, json={"name": f"New {i}", "quantity": 1})
+            else:
+                response = await client.get("/items", params=params)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return requests / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--items", type=int, default=50, help="Items on the list before the run")
+    args = parser.parse_args()
+
+    print(f"{'path':>6} {'concurrency':>12} {'req/sec':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for path in ("sync", "async"):
+        for concurrency in args.concurrency:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+                engine = seed(url, args.items)
+
+                async_engine = get_async_engine(url)
+                with patch.object(server, "use_sync_inventory", return_value=path == "sync"), \
+                        patch.object(server, "get_sync_inventory", return_value=InventoryManager(engine=engine)), \
+                        patch.object(server, "get_inventory", return_value=AsyncInventoryManager(async_engine)):
+                    rate, p50, p99 = asyncio.run(load(server.app, concurrency, args.requests, args.write_ratio))
+                asyncio.run(async_engine.dispose())
+
+                print(f"{path:>6} {concurrency:>12} {rate:>9,.0f} {p50:>8.2f} {p99:>8.2f}")
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark reading a long list: ORM hydration against column projection, OFFSET against keyset
+pages, and materialized against streamed exports.
+
+Inserts --items list items on one list, linked to --foods food items each carrying an
+--image-kb legacy image BLOB, then measures time and tracemalloc peak of:
+
+    hydration  every item as ListItem objects with their FoodItem and Category, with the image
+               deferred (the mapping's default) and undeferred, against active_items_select
+    paging     a --page-size page at increasing depths, with OFFSET and with a keyset cursor
+    export     every item as dicts from .all(), against iter_active_items (yield_per)
+
+Usage:
+    python benchmarks/bench_items_pagination.py --items 200000 --foods 2000 --image-kb 32
+"""
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload
+
+from shelfaware.food_inventory.inventory import (
+    InventoryManager, item_dicts, active_items_select, encode_cursor
+)
+from shelfaware.food_inventory.models import Base, FoodItem, ListItem, get_engine
+
+FIELDS = ("id", "name", "quantity", "date_added", "category", "food_name")
+
+
+def populate(manager, items, foods, image_kb, batch=50_000):
+    manager.add_user("bench")
+    manager.add_list("bench", "Pantry")
+    manager.add_category("Groceries")
+    session = manager.session
+    list_id = manager._list_id_query("bench", "Pantry").scalar()
+    category_id = manager._get_category_id("Groceries")
+
+    image = os.urandom(image_kb * 1024)
+    session.execute(insert(FoodItem), [
+        {"name": f"Food {i}", "barcode": f"{i:013d}", "image": image} for i in range(foods)
+    ])
+    food_ids = session.scalars(select(FoodItem.id).order_by(FoodItem.id)).all()
+
+    # One item a minute, with a few added at the same time to exercise the id tie-break
+    start = datetime.datetime(2024, 1, 1)
+    for offset in range(0, items, batch):
+        session.execute(insert(ListItem), [
+            {"name": f"Item {i}", "quantity": 1.0, "list_id": list_id, "category_id": category_id,
+             "food_id": food_ids[i % foods], "date_added": start + datetime.timedelta(minutes=i - i % 3)}
+            for i in range(offset, min(offset + batch, items))
+        ])
+    session.commit()
+    return list_id
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds * 1000, peak / 1e6, result
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def bench_hydration(manager, list_id):
+    session = manager.session
+
+    def orm(*options):
+        def run():
+            items = (
+                session.query(ListItem)
+                .options(joinedload(ListItem.food), joinedload(ListItem.category), *options)
+                .filter(ListItem.list_id == list_id, ListItem.date_removed.is_(None))
+                .order_by(ListItem.date_added, ListItem.id)
+                .all()
+            )
+            rows = [{"id": item.id, "name": item.name, "quantity": item.quantity, "date_added": item.date_added,
+                     "category": item.category.name, "food_name": item.food.name} for item in items]
+            session.expunge_all()
+            return rows
+        return run
+
+    def projection():
+        return item_dicts(session.execute(active_items_select(list_id, FIELDS)), FIELDS)
+
+    print(f"{'hydration':<28} {'rows':>8} {'ms':>9} {'peak MB':>9}")
+    runs = (
+        ("ORM, image deferred", orm()),
+        ("ORM, image loaded", orm(joinedload(ListItem.food).undefer(FoodItem.image))),
+        ("projection", projection),
+    )
+    for label, function in runs:
+        ms, peak, rows = measure(function)
+        print(f"{label:<28} {len(rows):>8} {ms:>9.0f} {peak:>9.1f}")
+        session.commit()
+
+
+def bench_paging(manager, list_id, items, page_size, repeat):
+    session = manager.session
+    ordered = session.execute(
+        select(ListItem.date_added, ListItem.id)
+        .where(ListItem.list_id == list_id)
+        .order_by(ListItem.date_added, ListItem.id)
+    ).all()
+
+    print(f"{'page depth':<28} {'OFFSET ms':>9} {'keyset ms':>9}")
+    for depth in sorted({depth for depth in (0, 10_000, items // 2, items - page_size) if 0 <= depth < items}):
+        cursor = encode_cursor(*ordered[depth - 1]) if depth else None
+        offset_ms, by_offset = timed(
+            lambda: session.execute(active_items_select(list_id, FIELDS, limit=page_size).offset(depth)).all(), repeat
+        )
+        keyset_ms, by_cursor = timed(
+            lambda: session.execute(active_items_select(list_id, FIELDS, cursor, page_size)).all(), repeat
+        )
+        assert by_offset == by_cursor
+        print(f"{depth:<28} {offset_ms:>9.2f} {keyset_ms:>9.2f}")
+    session.commit()
+
+
+def bench_export(manager, batch_size):
+    def materialized():
+        return len(item_dicts(manager.session.execute(active_items_select(
+            manager._list_id_query("bench", "Pantry").scalar_subquery(), FIELDS)).all(), FIELDS))
+
+    def streamed():
+        return sum(1 for _ in manager.iter_active_items("bench", "Pantry", FIELDS, batch_size))
+
+    print(f"{'export':<28} {'rows':>8} {'ms':>9} {'peak MB':>9}")
+    for label, function in (("all()", materialized), (f"yield_per({batch_size})", streamed)):
+        ms, peak, count = measure(function)
+        print(f"{label:<28} {count:>8} {ms:>9.0f} {peak:>9.1f}")
+        manager.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--image-kb", type=int, default=32)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = get_engine(f"sqlite:///{os.path.join(tmpdir, 'items.db')}")
+        Base.metadata.create_all(engine)
+        manager = InventoryManager(engine)
+        start = time.perf_counter()
+        list_id = populate(manager, args.items, args.foods, args.image_kb)
+        print(f"Inserted {args.items} items and {args.foods} foods in {time.perf_counter() - start:.1f}s")
+
+        bench_hydration(manager, list_id)
+        bench_paging(manager, list_id, args.items, args.page_size, args.repeat)
+        bench_export(manager, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark importing a synthetic Open Food Facts dump into the local mirror and looking products up.
+
+Usage:
+    python benchmarks/bench_mirror.py --products 1000000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import tempfile
+import time
+
+from shelfaware.openfoods.mirror import ProductMirror
+
+
+def write_dump(path, count):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "code": f"{i:013d}",
+                "product_name": f"Product {i}",
+                "brands_tags": ["brand-a", "brand-b"],
+                "categories_tags": ["en:plant-based-foods", "en:cereals"],
+                "image_front_url": f"https://images.openfoodfacts.org/{i}.jpg",
+                "nutriments": {"energy-kcal_100g": i % 500, "sugars_100g": i % 50},
+            }) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump_path = os.path.join(tmpdir, "products.jsonl.gz")
+        write_dump(dump_path, args.products)
+
+        mirror = ProductMirror(os.path.join(tmpdir, "mirror.db"))
+        start = time.perf_counter()
+        mirror.import_dump(dump_path)
+        elapsed = time.perf_counter() - start
+        print(f"import: {args.products / elapsed:,.0f} products/sec ({elapsed:.2f}s)")
+
+        codes = [f"{random.randrange(args.products * 2):013d}" for _ in range(args.lookups)]
+        start = time.perf_counter()
+        hits = sum(mirror.get(code) is not None for code in codes)
+        elapsed = time.perf_counter() - start
+        print(f"lookup: {1e6 * elapsed / args.lookups:.1f}us per lookup ({hits} hits, {args.lookups - hits} misses)")
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
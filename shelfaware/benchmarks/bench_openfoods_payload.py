@@ -0,0 +1,61 @@
+"""
+Compare payload size and parse time of full and slim (fields=) Open Food Facts responses.
+
+Runs over recorded API responses, by default the fixtures in shelfaware/openfoods/tests.
+
+Usage:
+    python benchmarks/bench_openfoods_payload.py [response.json ...]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+
+from shelfaware.openfoods.client import PRODUCT_FIELDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "shelfaware", "openfoods", "tests", "*.json")
+
+
+def time_parse(loads, payload, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loads(payload)
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("responses", nargs="*", default=sorted(glob.glob(FIXTURES)))
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    decoders = {"json": json.loads}
+    try:
+        import orjson
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+
+    for path in args.responses:
+        with open(path, "rb") as f:
+            full = f.read()
+        document = json.loads(full)
+        product = document.get("product", {})
+        slim = json.dumps({
+            "code": document.get("code"),
+            "status": document.get("status", 1),
+            "product": {field: product[field] for field in PRODUCT_FIELDS if field in product},
+        }).encode()
+
+        print(f"{os.path.basename(path)}: full {len(full):,} bytes, slim {len(slim):,} bytes "
+              f"({len(full) / len(slim):.0f}x smaller)")
+        for name, loads in decoders.items():
+            print(f"  {name:>6}: full {time_parse(loads, full, args.repeat):.3f}ms, "
+                  f"slim {time_parse(loads, slim, args.repeat):.3f}ms per parse")
+
+
+if __name__ == "__main__":
+    main()
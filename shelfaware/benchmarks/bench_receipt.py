@@ -0,0 +1,55 @@
+"""
+Benchmark the stages of receipt line-item extraction on the sample receipts.
+
+Prints the time spent loading, detecting, preprocessing, OCR'ing and parsing each receipt,
+and the time Tesseract takes on the whole photo instead of only the detected receipt region.
+Needs a receipt model trained on dev_notebooks/ReceiptExtractorIS-1.yaml, pytesseract and the
+tesseract binary.
+
+Usage:
+    python benchmarks/bench_receipt.py --model models/receipts.pt --repeat 3
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from shelfaware.barcode.loading import load_image
+from shelfaware.receipt.detector import STAGES, ReceiptDetector
+from shelfaware.receipt.preprocess import prepare_receipt
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", nargs="+",
+                        default=sorted(glob.glob(os.path.join(ROOT, "..", "samples", "receipt*.jpg"))))
+    parser.add_argument("--model", default=os.path.join(ROOT, "models", "receipts.pt"))
+    parser.add_argument("--backend", default="ultralytics", choices=("ultralytics", "onnx"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    detector = ReceiptDetector(args.model, backend=args.backend)
+    for image_path in args.images:
+        scans = [detector.scan(image_path) for _ in range(args.repeat)]
+        result = scans[-1]
+        print(f"{os.path.basename(image_path)}: box={result.box} items={len(result.items)}")
+        for stage in STAGES:
+            times = [scan.timings[stage] for scan in scans if stage in scan.timings]
+            if times:
+                print(f"  {stage:<11} {statistics.median(times) * 1000:8.1f} ms")
+        print(f"  {'total':<11} {statistics.median(scan.total_seconds for scan in scans) * 1000:8.1f} ms")
+
+        # The same preprocessing and OCR over the whole photo, as without detection
+        image_rgb = load_image(image_path, detector.load_size)
+        height, width = image_rgb.shape[:2]
+        start = time.perf_counter()
+        detector.ocr(prepare_receipt(image_rgb, [0, 0, width, height], target_width=width))
+        print(f"  full-frame OCR {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Load test POST /scan in-process with different numbers of detector worker processes.
+
+Requests go through httpx's ASGI transport to the server app, with the Open Food Facts lookup
+stubbed out so only upload handling, batching and inference are measured. --simulate-ms replaces
+the YOLO model by a CPU-bound stand-in (a fixed cost per batch plus a cost per image), to see the
+effect of batching and worker count on machines without the model or torch.
+
+Usage:
+    python benchmarks/bench_scan_workers.py --workers 1 2 4 --concurrency 16 --requests 200
+    python benchmarks/bench_scan_workers.py --simulate-ms 40 5 --workers 1 2 4
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import time
+from unittest.mock import patch
+
+import cv2
+import httpx
+import numpy as np
+
+from shelfaware import server
+from shelfaware.barcode.pool import BarcodeWorkerPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class SimulatedDetector:
+    # Burns CPU like a forward pass: batch_ms once per batch plus image_ms per image
+    batch_ms = 40.0
+    image_ms = 5.0
+
+    def __init__(self, model_path, confidence_threshold=0.5):
+        pass
+
+    def warm_up(self):
+        return 0.0
+
+    def extract_and_decode_batch(self, input_images, batch_size=8):
+        deadline = time.perf_counter() + (self.batch_ms + self.image_ms * len(input_images)) / 1000
+        while time.perf_counter() < deadline:
+            pass
+        return [[("EAN13", "4099100207149")] for _ in input_images]
+
+
+class OfflineFoodClient:
+    def fetch_products(self, codes):
+        return [None] * len(codes)
+
+
+def load_images(path, count):
+    image_paths = sorted(glob.glob(os.path.join(path, "*.jpg")))
+    if image_paths:
+        images = []
+        for image_path in image_paths:
+            with open(image_path, "rb") as f:
+                images.append(f.read())
+        return images
+
+    # Synthetic 1280x720 photos when there is no sample folder
+    rng = np.random.default_rng(0)
+    return [
+        cv2.imencode(".jpg", rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8))[1].tobytes()
+        for _ in range(count)
+    ]
+
+
+async def load(pool, images, concurrency, requests):
+    latencies = []
+    counter = iter(range(requests))
+
+    async def client_loop(client):
+        for i in counter:
+            start = time.perf_counter()
+            response = await client.post(
+                "/scan", content=images[i % len(images)], headers={"Content-Type": "image/jpeg"}
+            )
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    with patch.object(server, "get_scan_pool", return_value=pool), \
+            patch.object(server, "get_food_client", return_value=OfflineFoodClient()):
+        await pool.start()
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        await pool.close()
+
+    latencies = np.array(latencies) * 1000
+    return requests / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=os.path.join(ROOT, "models", "barcodes.pt"))
+    parser.add_argument("--images", default=os.path.join(ROOT, "..", "samples", "upc"))
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--max-batch", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--batch-window-ms", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--simulate-ms", type=float, nargs=2, metavar=("BATCH_MS", "IMAGE_MS"),
+                        help="Use a simulated detector instead of the YOLO model")
+    args = parser.parse_args()
+
+    detector_factory = None
+    if args.simulate_ms:
+        SimulatedDetector.batch_ms, SimulatedDetector.image_ms = args.simulate_ms
+        detector_factory = SimulatedDetector
+
+    images = load_images(args.images, count=16)
+
+    print(f"{'workers':>8} {'max batch':>10} {'req/sec':>9} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+    for workers in args.workers:
+        for max_batch in args.max_batch:
+            pool = BarcodeWorkerPool(
+                args.model, workers=workers, max_batch=max_batch, batch_window=args.batch_window_ms / 1000,
+                detector_factory=detector_factory,
+            )
+            rate, p50, p99 = asyncio.run(load(pool, images, args.concurrency, args.requests))
+            mean_batch = pool.images_scanned / pool.batches_run
+            print(f"{workers:>8} {max_batch:>10} {rate:>9,.1f} {p50:>8.1f} {p99:>8.1f} {mean_batch:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
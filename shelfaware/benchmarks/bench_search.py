@@ -0,0 +1,125 @@
+"""
+Benchmark search latency over a large index of food items.
+
+Inserts --items food items (names like "Zumora organic bananas 500 g", descriptions with brands
+and categories) through the search index triggers, then times InventoryManager.search for
+prefix, multi-word, brand, typo and deep-page queries, against a LIKE scan of the names.
+
+Usage:
+    python benchmarks/bench_search.py --items 1000000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+FOODS = [
+    "bananas", "apples", "oranges", "grapes", "strawberries", "blueberries", "lemons", "avocados", "tomatoes",
+    "potatoes", "onions", "carrots", "broccoli", "spinach", "lettuce", "cucumbers", "peppers", "mushrooms",
+    "milk", "oat milk", "almond milk", "yogurt", "butter", "cheddar", "mozzarella", "eggs", "bread", "bagels",
+    "tortillas", "rice", "pasta", "oats", "granola", "cereal", "flour", "sugar", "coffee", "tea", "orange juice",
+    "peanut butter", "jam", "honey", "olive oil", "ketchup", "mustard", "salsa", "hummus", "chicken breast",
+    "ground beef", "salmon", "tuna", "tofu", "black beans", "chickpeas", "lentils", "chocolate", "cookies",
+    "crackers", "chips", "ice cream",
+]
+ADJECTIVES = ["", "organic", "whole", "low fat", "unsweetened", "smoked", "frozen", "fresh", "wholegrain", "spicy"]
+SIZES = ["250 g", "500 g", "1 kg", "1 l", "2 l", "6 pack", "12 oz", "family size"]
+CATEGORIES = ["fruits", "vegetables", "dairies", "breads", "beverages", "snacks", "meats", "seafood", "condiments"]
+SYLLABLES = ["ka", "zu", "mo", "ra", "li", "ve", "to", "ne", "sa", "ri", "po", "da", "fi", "go", "mi", "xa"]
+
+QUERIES = {
+    "two letters": "ba",
+    "prefix": "ban",
+    "word": "bananas",
+    "two words": "organic ban",
+    "brand": None,  # filled in with a generated brand
+    "typo": "bannanas",
+    "typo, two words": "peanutt buter",
+}
+
+
+def brand_names(count, rng):
+    return ["".join(rng.choice(SYLLABLES, rng.integers(2, 4))).capitalize() for _ in range(count)]
+
+
+def populate(manager, items, batch=50_000, seed=0):
+    rng = np.random.default_rng(seed)
+    brands = brand_names(500, rng)
+    raw = manager.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, items, batch):
+            count = min(batch, items - start)
+            brand = rng.integers(0, len(brands), count)
+            food = rng.integers(0, len(FOODS), count)
+            adjective = rng.integers(0, len(ADJECTIVES), count)
+            size = rng.integers(0, len(SIZES), count)
+            category = rng.integers(0, len(CATEGORIES), count)
+            rows = [
+                (" ".join(part for part in (brands[b], ADJECTIVES[a], FOODS[f], SIZES[s]) if part),
+                 f"Brands: {brands[b].lower()}\nCategories: {CATEGORIES[c]}")
+                for b, f, a, s, c in zip(brand.tolist(), food.tolist(), adjective.tolist(), size.tolist(),
+                                         category.tolist())
+            ]
+            cursor.executemany("INSERT INTO food_items (name, description) VALUES (?, ?)", rows)
+            raw.commit()
+    finally:
+        raw.close()
+    return brands
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1000, times[int(len(times) * 0.95) - 1] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = get_engine(f"sqlite:///{os.path.join(tmpdir, 'search.db')}")
+        Base.metadata.create_all(engine)
+        manager = InventoryManager(engine)
+
+        start = time.perf_counter()
+        brands = populate(manager, args.items)
+        seconds = time.perf_counter() - start
+        size_mb = os.path.getsize(os.path.join(tmpdir, "search.db")) / 1e6
+        print(f"Indexed {args.items} food items in {seconds:.1f}s ({args.items / seconds:.0f} rows/sec), "
+              f"database {size_mb:.0f} MB")
+
+        queries = dict(QUERIES, brand=brands[0].lower())
+        print(f"{'query':<18} {'text':<16} {'mode':<10} {'results':>7} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, query in queries.items():
+            p50, p95, page = timed(lambda: manager.search(query, kinds=("food",), limit=args.limit), args.repeat)
+            print(f"{label:<18} {query:<16} {str(page.mode):<10} {len(page.results):>7} {p50:>8.1f} {p95:>8.1f}")
+
+        p50, p95, page = timed(lambda: manager.search("bananas", kinds=("food",), limit=args.limit, offset=200),
+                               args.repeat)
+        print(f"{'page 11':<18} {'bananas':<16} {str(page.mode):<10} {len(page.results):>7} {p50:>8.1f} {p95:>8.1f}")
+
+        connection = manager.session.connection()
+        like = "SELECT id, name FROM food_items WHERE name LIKE '%bananas%' ORDER BY length(name) LIMIT 20"
+        p50, p95, rows = timed(lambda: connection.exec_driver_sql(like).all(), max(args.repeat // 4, 3))
+        print(f"{'LIKE scan':<18} {'bananas':<16} {'-':<10} {len(rows):>7} {p50:>8.1f} {p95:>8.1f}")
+        manager.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure cold import time of the server and barcode modules with python -X importtime.
+
+Each module is imported in a fresh interpreter, several times, and the median cumulative import
+time is reported with the slowest imports it pulled in. Heavy inference dependencies that got
+imported are listed, since none of them should load until a detector is built. With --budget-ms
+the script exits non-zero when a module goes over budget, so it can run in CI.
+
+Usage:
+    python benchmarks/bench_startup.py --modules shelfaware.server --budget-ms 1500
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ("torch", "ultralytics", "cv2", "pyzbar", "matplotlib")
+
+
+def import_times(module=None):
+    """
+    Imports a module in a new interpreter and parses the -X importtime report.
+
+    Args:
+        module (str): Module to import. None only starts the interpreter.
+
+    Returns:
+        dict: Cumulative import time in microseconds per imported module name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}" if module else "pass"],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modules", nargs="+", default=[
+        "shelfaware.server", "shelfaware.barcode.detector", "shelfaware.barcode.pool", "shelfaware.openfoods.client",
+    ])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest direct imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail if a module takes longer than this to import")
+    args = parser.parse_args()
+
+    # Modules the interpreter imports at startup (site, encodings, ...) are left out of the listing
+    startup_modules = set(import_times())
+
+    over_budget = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        total_ms = statistics.median(run[module] for run in runs) / 1000
+        heavy = [name for name in HEAVY_MODULES if name in runs[0]]
+
+        print(f"{module}: {total_ms:.0f} ms (median of {args.repeat})")
+        print(f"  heavy modules imported: {', '.join(heavy) or 'none'}")
+        slowest = sorted(
+            ((name, statistics.median(run.get(name, 0) for run in runs) / 1000)
+             for name in runs[0] if "." not in name and name not in startup_modules),
+            key=lambda item: item[1], reverse=True,
+        )
+        for name, ms in slowest[:args.top]:
+            print(f"  {name:<30} {ms:8.1f} ms")
+
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        raise SystemExit(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
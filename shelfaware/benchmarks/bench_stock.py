@@ -0,0 +1,116 @@
+"""
+Compare reading a user's stock from the stock table with aggregating the action log on the fly.
+
+Actions are spread over --users users and --items list items each. The on-the-fly query is the
+GROUP BY over the user's actions that get_stock replaces. Also times add_action, which now
+upserts the stock row in the same transaction, and rebuilding and verifying the whole table.
+
+Usage:
+    python benchmarks/bench_stock.py --actions 1000000 --users 100 --items 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import (
+    Action, Base, Category, List, ListItem, User, stock_delta_expression
+)
+
+ACTION_TYPES = ("purchase", "purchase", "consume", "remove")
+
+
+def populate(engine, users, items, actions, batch=50000):
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"username": f"user{u}"} for u in range(users)])
+        conn.execute(insert(List), [{"name": "Pantry", "user_id": u + 1} for u in range(users)])
+        conn.execute(insert(Category), [{"name": "Produce"}])
+        conn.execute(insert(ListItem), [
+            {"name": f"Item {u}-{i}", "quantity": 1.0, "list_id": u + 1, "category_id": 1}
+            for u in range(users) for i in range(items)
+        ])
+        for start in range(0, actions, batch):
+            rows = []
+            for _ in range(min(batch, actions - start)):
+                user = rng.randrange(users)
+                rows.append({
+                    "action_type": rng.choice(ACTION_TYPES),
+                    "quantity": float(rng.randint(1, 3)),
+                    "user_id": user + 1,
+                    "list_item_id": user * items + rng.randrange(items) + 1,
+                })
+            conn.execute(insert(Action), rows)
+
+
+def aggregate_stock(session, username):
+    # What reading stock costs without the table: replay the user's whole log
+    rows = session.execute(
+        select(ListItem.name, func.sum(stock_delta_expression()).label("quantity"))
+        .join(ListItem, ListItem.id == Action.list_item_id)
+        .join(User, User.id == Action.user_id)
+        .where(User.username == username)
+        .group_by(Action.list_item_id)
+        .having(func.sum(stock_delta_expression()) > 0)
+        .order_by(ListItem.name, ListItem.id)
+    )
+    return [{"name": name, "quantity": quantity} for name, quantity in rows]
+
+
+def timed(function, repeat):
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = function(i)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actions", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        start = time.perf_counter()
+        populate(engine, args.users, args.items, args.actions)
+        print(f"Inserted {args.actions} actions in {time.perf_counter() - start:.1f}s")
+
+        manager = InventoryManager(engine=engine)
+        start = time.perf_counter()
+        rows = manager.rebuild_stock()
+        print(f"rebuild_stock: {rows} rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+        start = time.perf_counter()
+        mismatches = manager.verify_stock()
+        print(f"verify_stock: {len(mismatches)} mismatches in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        def username(i):
+            return f"user{i % args.users}"
+
+        stock_ms, stock = timed(lambda i: manager.get_stock(username(i)), args.repeat)
+        aggregate_ms, aggregate = timed(lambda i: aggregate_stock(manager.session, username(i)), args.repeat)
+        if stock != aggregate:
+            raise SystemExit("get_stock and the aggregation disagree")
+        print(f"get_stock (stock table):     {stock_ms:8.2f} ms/user")
+        print(f"aggregate actions on the fly: {aggregate_ms:8.2f} ms/user ({aggregate_ms / stock_ms:.1f}x)")
+
+        add_ms, _ = timed(lambda i: manager.add_action(username(i), f"Item {i % args.users}-0", "purchase"),
+                          args.repeat)
+        print(f"add_action with stock upsert: {add_ms:8.2f} ms")
+        if manager.verify_stock():
+            raise SystemExit("Stock is inconsistent after add_action")
+
+
+if __name__ == "__main__":
+    main()
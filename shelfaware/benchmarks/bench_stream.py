@@ -0,0 +1,41 @@
+"""
+Measure how many frames per second the streaming scanner keeps up with on a video or camera.
+
+Usage:
+    python benchmarks/bench_stream.py --source 0            # first camera
+    python benchmarks/bench_stream.py --source shelf.mp4
+"""
+
+import argparse
+import os
+import time
+
+from shelfaware.barcode.detector import BarcodeDetector
+from shelfaware.barcode.stream import BarcodeStreamScanner
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default=os.path.join(ROOT, "models", "barcodes.pt"))
+    parser.add_argument("--source", default="0", help="Camera index or video file path")
+    parser.add_argument("--detect-every", type=int, default=5)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    scanner = BarcodeStreamScanner(BarcodeDetector(model_path=args.model), detect_every=args.detect_every)
+
+    start = time.perf_counter()
+    for event in scanner.scan(source):
+        print(f"{time.perf_counter() - start:7.2f}s {event}")
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\nread {scanner.frames_read} frames in {elapsed:.2f}s ({scanner.frames_read / elapsed:.1f} fps), "
+        f"dropped {scanner.frames_dropped}, ran detection on {scanner.detections_run}"
+    )
+
+
+if __name__ == "__main__":
+    main()
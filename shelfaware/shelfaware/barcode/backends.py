@@ -0,0 +1,177 @@
+"""
+Inference backends that run the barcode YOLO model and return bounding boxes.
+
+"ultralytics" runs the model through ultralytics: the PyTorch .pt weights, or any exported format
+ultralytics can load, such as an OpenVINO model directory. "onnx" runs an exported ONNX model
+directly with onnxruntime, so neither torch nor ultralytics is imported.
+
+Models are exported with:
+    python -m shelfaware.barcode.export models/barcodes.pt --format onnx
+"""
+
+# Letterbox fill value used by ultralytics, so the ONNX backend feeds the model the same padding
+LETTERBOX_COLOR = 114
+
+
+class UltralyticsBackend:
+    """
+    Runs a model loaded by ultralytics.YOLO.
+
+    Attributes:
+        model (YOLO): The ultralytics model.
+    """
+
+    name = "ultralytics"
+
+    def __init__(self, model_path):
+        from ultralytics import YOLO
+        self.model = YOLO(model_path)
+
+    def detect(self, images_rgb, confidence_threshold):
+        """
+        Detects barcodes in a batch of images.
+
+        Args:
+            images_rgb (list): Images in RGB format (numpy arrays).
+            confidence_threshold (float): Minimum confidence of a detection.
+
+        Returns:
+            list: One list of (x1, y1, x2, y2) boxes per image, in input order.
+        """
+        results = self.model(images_rgb, conf=confidence_threshold)
+        return [result.boxes.xyxy.tolist() for result in results]
+
+
+class OnnxBackend:
+    """
+    Runs an exported ONNX model with onnxruntime.
+
+    The letterboxed image and the model input tensor are preallocated once and reused for every
+    image, and the input tensor is bound to the session, so each inference only fills the buffer
+    and runs.
+
+    Attributes:
+        session (onnxruntime.InferenceSession): The inference session.
+        input_size (tuple): (width, height) the model was exported with.
+        iou_threshold (float): IoU above which overlapping boxes are suppressed.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path, iou_threshold=0.7, providers=None, threads=None):
+        """
+        Initializes the OnnxBackend.
+
+        Args:
+            model_path (str): Path to the .onnx model, exported with a fixed input size.
+            iou_threshold (float): NMS IoU threshold. Defaults to 0.7, as ultralytics.
+            providers (list): onnxruntime execution providers. Defaults to the CPU provider.
+            threads (int): Intra-op threads. Defaults to onnxruntime's choice.
+        """
+        import numpy as np
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=providers or ["CPUExecutionProvider"])
+        self.iou_threshold = iou_threshold
+
+        model_input = self.session.get_inputs()[0]
+        _, _, height, width = model_input.shape
+        if not isinstance(height, int) or not isinstance(width, int):
+            raise ValueError("The ONNX model must be exported with a fixed input size (dynamic=False).")
+        self.input_size = (width, height)
+
+        self._canvas = np.full((height, width, 3), LETTERBOX_COLOR, dtype=np.uint8)
+        self._input = np.empty((1, 3, height, width), dtype=np.float32)
+        self._binding = self.session.io_binding()
+        self._binding.bind_cpu_input(model_input.name, self._input)
+        self._binding.bind_output(self.session.get_outputs()[0].name)
+
+    def detect(self, images_rgb, confidence_threshold):
+        """
+        Detects barcodes in a batch of images, one inference per image.
+
+        Args:
+            images_rgb (list): Images in RGB format (numpy arrays).
+            confidence_threshold (float): Minimum confidence of a detection.
+
+        Returns:
+            list: One list of (x1, y1, x2, y2) boxes per image, in input order.
+        """
+        all_boxes = []
+        for image_rgb in images_rgb:
+            letterbox = self._preprocess(image_rgb)
+            self.session.run_with_iobinding(self._binding)
+            output = self._binding.copy_outputs_to_cpu()[0]
+            all_boxes.append(self._postprocess(output, confidence_threshold, letterbox, image_rgb.shape))
+        return all_boxes
+
+    def _preprocess(self, image_rgb):
+        import cv2
+        import numpy as np
+
+        height, width = image_rgb.shape[:2]
+        input_width, input_height = self.input_size
+        scale = min(input_width / width, input_height / height)
+        new_width, new_height = round(width * scale), round(height * scale)
+        pad_x, pad_y = (input_width - new_width) // 2, (input_height - new_height) // 2
+
+        self._canvas.fill(LETTERBOX_COLOR)
+        self._canvas[pad_y:pad_y + new_height, pad_x:pad_x + new_width] = cv2.resize(
+            image_rgb, (new_width, new_height), interpolation=cv2.INTER_LINEAR
+        )
+        # ultralytics treats numpy images as BGR and flips them, so the model it runs sees the
+        # RGB images BarcodeDetector passes in with channels reversed. Match that for parity.
+        np.divide(self._canvas[..., ::-1].transpose(2, 0, 1), 255.0, out=self._input[0], casting="unsafe")
+        return scale, pad_x, pad_y
+
+    def _postprocess(self, output, confidence_threshold, letterbox, image_shape):
+        import cv2
+        import numpy as np
+
+        # YOLOv8 output is (1, 4 + classes, anchors): cx, cy, w, h then one score per class
+        predictions = output[0].T
+        scores = predictions[:, 4:].max(axis=1)
+        keep = scores >= confidence_threshold
+        predictions, scores = predictions[keep], scores[keep]
+        if not len(scores):
+            return []
+
+        cx, cy, w, h = predictions[:, :4].T
+        xywh = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        indices = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), confidence_threshold, self.iou_threshold)
+        xywh = xywh[np.asarray(indices, dtype=int).reshape(-1)]
+
+        scale, pad_x, pad_y = letterbox
+        boxes = np.empty_like(xywh)
+        boxes[:, 0] = (xywh[:, 0] - pad_x) / scale
+        boxes[:, 1] = (xywh[:, 1] - pad_y) / scale
+        boxes[:, 2] = (xywh[:, 0] + xywh[:, 2] - pad_x) / scale
+        boxes[:, 3] = (xywh[:, 1] + xywh[:, 3] - pad_y) / scale
+        height, width = image_shape[:2]
+        return np.clip(boxes, 0, [width, height, width, height]).tolist()
+
+
+BACKENDS = {
+    UltralyticsBackend.name: UltralyticsBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def make_backend(backend, model_path):
+    """
+    Builds an inference backend by name.
+
+    Args:
+        backend (str): "ultralytics" or "onnx".
+        model_path (str): Path to the model for that backend.
+
+    Returns:
+        The backend, with a detect(images_rgb, confidence_threshold) method.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}. Expected one of {', '.join(BACKENDS)}.")
+    return BACKENDS[backend](model_path)
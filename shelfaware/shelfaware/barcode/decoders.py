@@ -0,0 +1,213 @@
+"""
+Barcode decoders that turn prepared images (crops or full frames) into barcode values.
+
+"pyzbar" uses zbar, "opencv" uses OpenCV's cv2.barcode detector, and "zxing" uses zxing-cpp
+(`pip install zxing-cpp`). All of them report symbologies with zbar's names (EAN13, UPCA,
+CODE128, ...), so results do not depend on the decoder.
+
+A decoder built with a list of symbologies only reports those. pyzbar and zxing-cpp are told to
+look for nothing else, which skips the work of the other symbologies' scanners; OpenCV only
+supports EAN/UPC, so its results are filtered instead. make_decoder rejects symbologies the decoder
+cannot read, rather than letting it fail or silently find nothing. Each decoder can be called from several
+threads at once, and all three release the GIL while decoding.
+"""
+
+import threading
+
+# The symbologies printed on grocery products
+GROCERY_SYMBOLOGIES = ("EAN13", "UPCA")
+
+_OPENCV_TYPES = {"EAN_13": "EAN13", "EAN_8": "EAN8", "UPC_A": "UPCA", "UPC_E": "UPCE"}
+
+_ZBAR_SYMBOLOGIES = (
+    "EAN13", "EAN8", "EAN5", "EAN2", "UPCA", "UPCE", "ISBN10", "ISBN13", "I25", "DATABAR", "DATABAR_EXP",
+    "CODABAR", "CODE39", "CODE93", "CODE128", "PDF417", "QRCODE", "SQCODE", "COMPOSITE",
+)
+
+_ZXING_FORMATS = {
+    "EAN13": "EAN13",
+    "EAN8": "EAN8",
+    "UPCA": "UPCA",
+    "UPCE": "UPCE",
+    "CODE128": "Code128",
+    "CODE39": "Code39",
+    "CODE93": "Code93",
+    "CODABAR": "Codabar",
+    "I25": "ITF",
+    "DATABAR": "DataBar",
+    "DATABAR_EXP": "DataBarExpanded",
+    "PDF417": "PDF417",
+    "QRCODE": "QRCode",
+}
+
+
+def _as_array(image):
+    import numpy as np
+
+    return np.asarray(image)
+
+
+class PyzbarDecoder:
+    """
+    Decodes barcodes with zbar through pyzbar.
+
+    Attributes:
+        symbologies (tuple): Symbologies decoded, or None for all of them.
+    """
+
+    name = "pyzbar"
+    supported_symbologies = _ZBAR_SYMBOLOGIES
+
+    def __init__(self, symbologies=None):
+        from pyzbar.pyzbar import ZBarSymbol
+
+        self.symbologies = tuple(symbologies) if symbologies else None
+        self._symbols = [ZBarSymbol[name] for name in self.symbologies] if self.symbologies else None
+
+    def decode(self, image):
+        """
+        Decodes the barcodes in an image.
+
+        Args:
+            image (PIL.Image or np.ndarray): A grayscale or RGB image.
+
+        Returns:
+            list: A list of (barcode type, barcode data) tuples.
+        """
+        from pyzbar.pyzbar import decode
+
+        return [(barcode.type, barcode.data.decode("utf-8")) for barcode in decode(image, symbols=self._symbols)]
+
+
+class OpenCVDecoder:
+    """
+    Decodes EAN and UPC barcodes with OpenCV's cv2.barcode detector.
+
+    The detector finds the barcode itself on full frames, but misses barcodes that fill most of the
+    image, so when it finds nothing the whole image is decoded as one barcode region, which suits
+    the padded crops of detected boxes. Detectors keep state between calls, so each thread gets
+    its own.
+
+    Attributes:
+        symbologies (tuple): Symbologies reported, or None for all of them.
+    """
+
+    name = "opencv"
+    supported_symbologies = tuple(_OPENCV_TYPES.values())
+
+    def __init__(self, symbologies=None):
+        import cv2
+        import numpy as np
+
+        self.symbologies = tuple(symbologies) if symbologies else None
+        self._cv2 = cv2
+        self._np = np
+        self._local = threading.local()
+
+    def decode(self, image):
+        """
+        Decodes the barcodes in an image.
+
+        Args:
+            image (PIL.Image or np.ndarray): A grayscale or RGB image.
+
+        Returns:
+            list: A list of (barcode type, barcode data) tuples.
+        """
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = self._local.detector = self._cv2.barcode.BarcodeDetector()
+
+        image = _as_array(image)
+        found, values, types, _ = detector.detectAndDecodeWithType(image)
+        if not found:
+            height, width = image.shape[:2]
+            corners = self._np.array([[[0, height - 1], [0, 0], [width - 1, 0], [width - 1, height - 1]]],
+                                     dtype=self._np.float32)
+            found, values, types = detector.decodeWithType(image, corners)
+
+        barcodes = []
+        if found:
+            for value, opencv_type in zip(values, types):
+                barcode_type = _OPENCV_TYPES.get(opencv_type, opencv_type)
+                if value and (self.symbologies is None or barcode_type in self.symbologies):
+                    barcodes.append((barcode_type, value))
+        return barcodes
+
+
+class ZxingDecoder:
+    """
+    Decodes barcodes with zxing-cpp.
+
+    Attributes:
+        symbologies (tuple): Symbologies decoded, or None for all of them.
+    """
+
+    name = "zxing"
+    supported_symbologies = tuple(_ZXING_FORMATS)
+
+    def __init__(self, symbologies=None):
+        import zxingcpp
+
+        self.symbologies = tuple(symbologies) if symbologies else None
+        self._zxingcpp = zxingcpp
+        self._formats = None
+        if self.symbologies:
+            self._formats = getattr(zxingcpp.BarcodeFormat, _ZXING_FORMATS[self.symbologies[0]])
+            for name in self.symbologies[1:]:
+                self._formats |= getattr(zxingcpp.BarcodeFormat, _ZXING_FORMATS[name])
+        self._types = {zxing: zbar for zbar, zxing in _ZXING_FORMATS.items()}
+
+    def decode(self, image):
+        """
+        Decodes the barcodes in an image.
+
+        Args:
+            image (PIL.Image or np.ndarray): A grayscale or RGB image.
+
+        Returns:
+            list: A list of (barcode type, barcode data) tuples.
+        """
+        if self._formats is None:
+            results = self._zxingcpp.read_barcodes(_as_array(image))
+        else:
+            results = self._zxingcpp.read_barcodes(_as_array(image), formats=self._formats)
+        barcodes = []
+        for result in results:
+            barcode_type, data = self._types.get(result.format.name, result.format.name), result.text
+            if barcode_type == "EAN13" and data.startswith("0") and self.symbologies and "UPCA" in self.symbologies:
+                # zxing-cpp reports UPC-A as EAN-13 with a leading 0; zbar reports it as UPC-A when asked for it
+                barcode_type, data = "UPCA", data[1:]
+            barcodes.append((barcode_type, data))
+        return barcodes
+
+
+DECODERS = {
+    PyzbarDecoder.name: PyzbarDecoder,
+    OpenCVDecoder.name: OpenCVDecoder,
+    ZxingDecoder.name: ZxingDecoder,
+}
+
+
+def make_decoder(decoder, symbologies=None):
+    """
+    Builds a barcode decoder by name.
+
+    Args:
+        decoder (str): "pyzbar", "opencv" or "zxing".
+        symbologies (list): Symbologies to decode, e.g. GROCERY_SYMBOLOGIES. Defaults to all.
+
+    Returns:
+        The decoder, with a decode(image) method returning (barcode type, barcode data) tuples.
+
+    Raises:
+        ValueError: If the decoder is unknown or cannot read one of the symbologies.
+    """
+    if decoder not in DECODERS:
+        raise ValueError(f"Unknown decoder {decoder}. Expected one of {', '.join(DECODERS)}.")
+    supported = DECODERS[decoder].supported_symbologies
+    unknown = [name for name in symbologies or () if name not in supported]
+    if unknown:
+        raise ValueError(f"Unknown symbologies {', '.join(unknown)} for the {decoder} decoder. "
+                         f"Expected some of {', '.join(supported)}.")
+    return DECODERS[decoder](symbologies)
@@ -0,0 +1,152 @@
+"""
+Decode strategies used by BarcodeDetector to turn YOLO detections into images for pyzbar.
+
+Strategies are tried in order and the first one that decodes a barcode wins, so cheap
+strategies (small grayscale crops) go first and the full frame is only used as a fallback.
+"""
+
+import time
+
+from PIL import Image
+
+
+class DecodeStats:
+    """
+    Hit-rate and latency counters for a single decode strategy.
+
+    Attributes:
+        attempts (int): Number of images the strategy was tried on.
+        hits (int): Number of attempts that decoded at least one barcode.
+        total_seconds (float): Time spent preparing and decoding, summed over all attempts.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.total_seconds = 0.0
+
+    def record(self, hit, seconds):
+        self.attempts += 1
+        self.hits += int(hit)
+        self.total_seconds += seconds
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_latency_ms(self):
+        return 1000 * self.total_seconds / self.attempts if self.attempts else 0.0
+
+    def as_dict(self):
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate,
+            "mean_latency_ms": self.mean_latency_ms,
+        }
+
+    def __repr__(self):
+        return f"<DecodeStats(attempts={self.attempts}, hits={self.hits}, hit_rate={self.hit_rate:.2f}, mean_latency_ms={self.mean_latency_ms:.1f})>"
+
+
+class CropDecodeStrategy:
+    """
+    Decodes padded grayscale crops of the detected barcode boxes.
+
+    Attributes:
+        padding (float): Padding added around each box, as a fraction of the box size.
+        target_width (int): Width in pixels each crop is rescaled to before decoding.
+    """
+
+    name = "crop"
+
+    def __init__(self, padding=0.15, target_width=640):
+        self.padding = padding
+        self.target_width = target_width
+
+    def prepare(self, image_rgb, boxes):
+        """
+        Builds grayscale crops of the detected boxes.
+
+        Args:
+            image_rgb (np.ndarray): The full image in RGB format.
+            boxes (list): Bounding boxes as (x1, y1, x2, y2) in pixel coordinates.
+
+        Returns:
+            list: A list of cropped grayscale images (PIL.Image).
+        """
+        import cv2
+
+        height, width = image_rgb.shape[:2]
+        cropped_images = []
+        for x1, y1, x2, y2 in boxes:
+            pad_x = (x2 - x1) * self.padding
+            pad_y = (y2 - y1) * self.padding
+            x1, y1 = max(int(x1 - pad_x), 0), max(int(y1 - pad_y), 0)
+            x2, y2 = min(int(x2 + pad_x), width), min(int(y2 + pad_y), height)
+            if x2 <= x1 or y2 <= y1:
+                continue
+
+            # Convert only the crop to grayscale, pyzbar would do it anyway
+            crop = cv2.cvtColor(image_rgb[y1:y2, x1:x2], cv2.COLOR_RGB2GRAY)
+
+            scale = self.target_width / crop.shape[1]
+            if scale != 1:
+                interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+                crop = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=interpolation)
+
+            cropped_images.append(Image.fromarray(crop))
+        return cropped_images
+
+
+class FullFrameDecodeStrategy:
+    """
+    Decodes the entire image. Slow on large photos, so it is used as the last resort.
+
+    The image is converted to grayscale into one buffer that is reused across calls, and handed
+    to pyzbar as an "L" image sharing that buffer, so pyzbar does not convert (and copy) the RGB
+    frame itself. The returned image is only valid until the next call.
+    """
+
+    name = "full_frame"
+
+    def __init__(self):
+        self._gray = None
+
+    def prepare(self, image_rgb, boxes):
+        import cv2
+        import numpy as np
+
+        height, width = image_rgb.shape[:2]
+        if self._gray is None or self._gray.shape != (height, width):
+            self._gray = np.empty((height, width), dtype=np.uint8)
+        cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY, dst=self._gray)
+        return [Image.frombuffer("L", (width, height), self._gray, "raw", "L", 0, 1)]
+
+
+def decode_with_strategies(strategies, stats, decode_fn, image_rgb, boxes):
+    """
+    Runs the strategies in order until one of them decodes a barcode.
+
+    Args:
+        strategies (list): Decode strategies, cheapest first.
+        stats (dict): DecodeStats per strategy name, updated in place.
+        decode_fn (callable): Decodes a list of images into (barcode type, barcode data) tuples.
+        image_rgb (np.ndarray): The full image in RGB format.
+        boxes (list): Bounding boxes as (x1, y1, x2, y2) in pixel coordinates.
+
+    Returns:
+        list: A list of tuples where each tuple contains the barcode type and the decoded barcode data.
+    """
+    for strategy in strategies:
+        start = time.perf_counter()
+        images = strategy.prepare(image_rgb, boxes)
+        if not images:
+            continue
+
+        barcodes = decode_fn(images)
+        stats.setdefault(strategy.name, DecodeStats()).record(bool(barcodes), time.perf_counter() - start)
+        if barcodes:
+            return barcodes
+    return []
@@ -1,120 +1,242 @@
-import cv2
+"""
+Barcode detection with a YOLO model and decoding with pyzbar, OpenCV or zxing-cpp.
+
+ultralytics (and torch), cv2, numpy and pyzbar are imported when first used rather than with
+this module, so importing the barcode package stays cheap for processes that never run inference.
+The model runs through one of the inference backends in backends.py, and barcodes are read by
+one of the decoders in decoders.py.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 from PIL import Image
-from pyzbar.pyzbar import decode
-from ultralytics import YOLO
+
+from .backends import make_backend
+from .decoders import make_decoder
+from .decoding import CropDecodeStrategy, FullFrameDecodeStrategy, decode_with_strategies
+from .loading import load_image
 
 
 class BarcodeDetector:
     """
-    A class to detect and decode barcodes from images using YOLO and pyzbar.
+    A class to detect and decode barcodes from images using YOLO and a barcode decoder.
 
     Attributes:
-        model (YOLO): The YOLO model used for detecting barcodes.
+        backend (UltralyticsBackend or OnnxBackend): Runs the YOLO model used for detecting barcodes.
+        decoder (PyzbarDecoder or OpenCVDecoder or ZxingDecoder): Reads the barcodes in prepared images.
+        decode_threads (int): Threads decoding the crops of one image in parallel.
         confidence_threshold (float): The confidence threshold for barcode detection.
+        decode_strategies (list): Strategies tried in order until one decodes a barcode.
+        decode_stats (dict): Hit-rate and latency counters (DecodeStats) per strategy name.
+        load_size (int): Minimum longest side encoded images are decoded at, or None for full size.
     """
 
-    def __init__(self, model_path, confidence_threshold=0.5):
+    def __init__(self, model_path, confidence_threshold=0.5, decode_strategies=None, backend="ultralytics",
+                 load_size=1600, decoder="pyzbar", symbologies=None, decode_threads=None):
         """
         Initializes the BarcodeDetector with the given model path and confidence threshold.
 
         Args:
             model_path (str): Path to the YOLO model weights.
             confidence_threshold (float): The confidence threshold for barcode detection.
+            decode_strategies (list): Decode strategies, cheapest first. Defaults to decoding
+                grayscale crops of the detected boxes and falling back to the full frame.
+            backend (str): "ultralytics" to run .pt weights (or an exported OpenVINO directory)
+                through ultralytics, or "onnx" to run an exported .onnx model with onnxruntime.
+            load_size (int): Images from paths or bytes are decoded at 1/2, 1/4 or 1/8 scale when
+                their longest side stays at least this long. Defaults to 1600, which keeps a
+                12 MP phone photo at 2000x1500. None decodes at full resolution.
+            decoder (str): "pyzbar", "opencv" or "zxing". Defaults to "pyzbar".
+            symbologies (list): Barcode types to decode, e.g. decoders.GROCERY_SYMBOLOGIES for
+                EAN-13 and UPC-A only. Defaults to every type the decoder supports.
+            decode_threads (int): Threads decoding crops in parallel. The decoders release the
+                GIL, so crops decode on several cores. Defaults to the CPU count, at most 4.
+                Detectors in worker processes should use 1, since the processes already share
+                the cores.
         """
-        self.model = YOLO(model_path)
+        self.backend = make_backend(backend, model_path)
+        self.decoder = make_decoder(decoder, symbologies)
+        self.decode_threads = decode_threads or min(os.cpu_count() or 1, 4)
+        self._decode_executor = None
         self.confidence_threshold = confidence_threshold
+        self.decode_strategies = decode_strategies or [CropDecodeStrategy(), FullFrameDecodeStrategy()]
+        self.decode_stats = {}
+        self.load_size = load_size
+
+    def warm_up(self, image_size=(640, 480)):
+        """
+        Runs one inference and one decode on a blank image.
+
+        The first call into the model initializes its weights, the inference backend and the
+        barcode decoder, which can take far longer than a normal call. Warming up at startup keeps
+        that cost out of the first real request.
+
+        Args:
+            image_size (tuple): (width, height) of the blank image. Defaults to (640, 480).
+
+        Returns:
+            float: Seconds spent warming up.
+        """
+        import numpy as np
+
+        start = time.perf_counter()
+        width, height = image_size
+        image_rgb = np.zeros((height, width, 3), dtype=np.uint8)
+        self.detect_boxes(image_rgb)
+        self.decode_barcodes([Image.fromarray(image_rgb)])
+        return time.perf_counter() - start
+
+    def close(self):
+        """
+        Shuts down the decode threads. Decoding after close() starts them again.
+        """
+        if self._decode_executor is not None:
+            self._decode_executor.shutdown()
+            self._decode_executor = None
 
-    def _load_image(self, input_image):
+    def load_image(self, input_image):
         """
-        Load and process an image, which can be either a path, a cv2 image, or a PIL image.
+        Load and process an image, which can be a path, encoded image bytes, a cv2 image, or a PIL image.
 
         Args:
-            input_image (str or np.ndarray or PIL.Image): The input image which can be a file path, 
-            a cv2 image (numpy array), or a PIL Image.
+            input_image (str or bytes or memoryview or np.ndarray or PIL.Image): The input image which can
+            be a file path, an encoded image in memory, a cv2 image (numpy array), or a PIL Image.
 
         Returns:
             np.ndarray: The image in RGB format as a numpy array.
         """
-        if isinstance(input_image, str):
-            # Load image from file path
-            image = cv2.imread(input_image)
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        elif isinstance(input_image, np.ndarray):
-            # If the input is a cv2 image (numpy array)
-            image_rgb = cv2.cvtColor(input_image, cv2.COLOR_BGR2RGB)
-        elif isinstance(input_image, Image.Image):
-            # If the input is a PIL image, convert it to numpy array in RGB format
-            image_rgb = np.array(input_image.convert('RGB'))
-        else:
-            raise ValueError("Invalid input image type. Expected file path, cv2 image, or PIL image.")
+        return load_image(input_image, self.load_size)
+
+    def detect_boxes(self, image_rgb):
+        """
+        Runs the YOLO model on an image and returns the detected bounding boxes.
+
+        Args:
+            image_rgb (np.ndarray): The image in RGB format.
+
+        Returns:
+            list: Bounding boxes as (x1, y1, x2, y2) in pixel coordinates.
+        """
+        return self.detect_boxes_batch([image_rgb])[0]
+
+    def detect_boxes_batch(self, images_rgb):
+        """
+        Runs the YOLO model on a batch of images.
+
+        Args:
+            images_rgb (list): Images in RGB format.
 
-        return image_rgb
+        Returns:
+            list: One list of (x1, y1, x2, y2) boxes per image, in input order.
+        """
+        return self.backend.detect(images_rgb, self.confidence_threshold)
 
     def find_barcodes(self, input_image):
         """
         Detects barcodes in the provided image and returns the cropped regions containing the barcodes.
 
         Args:
-            input_image (str or np.ndarray or PIL.Image): The input image which can be a file path, 
-            a cv2 image (numpy array), or a PIL Image.
+            input_image (str or bytes or np.ndarray or PIL.Image): The input image which can be a file path,
+            encoded image bytes, a cv2 image (numpy array), or a PIL Image.
 
         Returns:
-            list: A list of cropped images (PIL.Image) where barcodes are detected. 
-                  If no cropping is performed, the entire image is returned if barcodes are detected.
-        """
-        image_rgb = self._load_image(input_image)
-
-        # Perform YOLOv8 detection
-        results = self.model(image_rgb, conf=self.confidence_threshold)
-        cropped_images = []
-
-        # If results are found, add the full image (cropping disabled for better performance)
-        if len(results) > 0:
-            cropped_images.append(Image.fromarray(image_rgb))
-
-        # Cropping logic is disabled due to better performance when using the entire image.
-        # Uncomment the code below to enable cropping of detected barcodes.
-        #
-        # for result in results:
-        #     boxes = result.boxes.xyxy  # Bounding boxes
-        #     for box in boxes:
-        #         x1, y1, x2, y2 = map(int, box)  # Convert to integer
-        #         cropped_image = image_rgb[y1:y2, x1:x2]
-        #         cropped_image = Image.fromarray(cropped_image)
-        #         cropped_images.append(cropped_image)
-                
-        return cropped_images
+            list: A list of cropped images (PIL.Image) where barcodes are detected, prepared
+                  by the first decode strategy (padded grayscale crops by default).
+        """
+        image_rgb = self.load_image(input_image)
+        boxes = self.detect_boxes(image_rgb)
+        return self.decode_strategies[0].prepare(image_rgb, boxes)
 
     def decode_barcodes(self, cropped_images):
         """
-        Decodes barcodes from a list of cropped images using pyzbar.
+        Decodes barcodes from a list of cropped images with the decoder.
+
+        Several crops are decoded in parallel on the decode threads.
 
         Args:
             cropped_images (list): A list of cropped images (PIL.Image) from which barcodes will be decoded.
 
         Returns:
-            list: A list of tuples where each tuple contains the barcode type and the decoded barcode data.
+            list: A list of tuples where each tuple contains the barcode type and the decoded barcode data,
+                in crop order.
         """
-        barcodes = []
-        for cropped_image in cropped_images:
-            decoded_barcodes = decode(cropped_image)
-            for barcode in decoded_barcodes:
-                barcode_data = barcode.data.decode('utf-8')  # EAN-13 data
-                barcode_type = barcode.type  # Type of barcode (EAN13, CODE128, etc.)
-                barcodes.append((barcode_type, barcode_data))
-        return barcodes
+        if self.decode_threads > 1 and len(cropped_images) > 1:
+            if self._decode_executor is None:
+                self._decode_executor = ThreadPoolExecutor(self.decode_threads, thread_name_prefix="barcode-decode")
+            results = self._decode_executor.map(self.decoder.decode, cropped_images)
+        else:
+            results = map(self.decoder.decode, cropped_images)
+        return [barcode for barcodes in results for barcode in barcodes]
 
     def extract_and_decode(self, input_image):
         """
-        Detects and decodes barcodes from an image. It is a combination of find_barcodes and decode_barcodes.
+        Detects and decodes barcodes from an image.
+
+        The decode strategies are tried in order, so the detected boxes are decoded as small
+        grayscale crops first and the full frame is only decoded when no crop yields a barcode.
+
+        Args:
+            input_image (str or bytes or np.ndarray or PIL.Image): The input image which can be a file path,
+            encoded image bytes, a cv2 image (numpy array), or a PIL Image.
+
+        Returns:
+            list: A list of tuples where each tuple contains the barcode type and the decoded barcode data.
+        """
+        image_rgb = self.load_image(input_image)
+        boxes = self.detect_boxes(image_rgb)
+        return self.decode_image(image_rgb, boxes)
+
+    def decode_image(self, image_rgb, boxes):
+        """
+        Decodes the barcodes in boxes already detected on an image, using the decode strategies.
+
+        Together with detect_boxes_batch, this lets callers keep the boxes, or run detection and
+        decoding in separate steps.
 
         Args:
-            input_image (str or np.ndarray or PIL.Image): The input image which can be a file path, 
-            a cv2 image (numpy array), or a PIL Image.
+            image_rgb (np.ndarray): The image in RGB format.
+            boxes (list): Bounding boxes as (x1, y1, x2, y2), as returned by detect_boxes.
 
         Returns:
             list: A list of tuples where each tuple contains the barcode type and the decoded barcode data.
         """
-        cropped_images = self.find_barcodes(input_image)
-        barcodes = self.decode_barcodes(cropped_images)
-        return barcodes
+        return decode_with_strategies(
+            self.decode_strategies, self.decode_stats, self.decode_barcodes, image_rgb, boxes
+        )
+
+    def extract_and_decode_batch(self, input_images, batch_size=8):
+        """
+        Detects and decodes barcodes from many images, running the YOLO model on whole batches.
+
+        Each batch is loaded and handed to the backend as a single list. With the ultralytics
+        backend, letterboxing and the forward pass are done once per batch instead of once per
+        image; the ONNX backend runs its fixed-size model once per image. The barcode decode stage
+        then runs over the results of each image using the decode strategies.
+
+        Args:
+            input_images (iterable): File paths, encoded image bytes, cv2 images (numpy arrays) or PIL Images.
+            batch_size (int): The number of images sent to the model in one forward pass.
+
+        Returns:
+            list: One list of (barcode type, barcode data) tuples per input image, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        all_barcodes = []
+        images = iter(input_images)
+        while True:
+            batch = list(islice(images, batch_size))
+            if not batch:
+                break
+
+            images_rgb = [self.load_image(input_image) for input_image in batch]
+            batch_boxes = self.detect_boxes_batch(images_rgb)
+
+            for image_rgb, boxes in zip(images_rgb, batch_boxes):
+                all_barcodes.append(self.decode_image(image_rgb, boxes))
+
+        return all_barcodes
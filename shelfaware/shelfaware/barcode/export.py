@@ -0,0 +1,118 @@
+"""
+Export the barcode YOLO model for faster CPU inference backends.
+
+ONNX models run with BarcodeDetector(backend="onnx") through onnxruntime. OpenVINO model
+directories run with the default ultralytics backend. --int8 quantizes the ONNX model statically,
+calibrated on sample images, or asks ultralytics for an INT8 OpenVINO model.
+
+Usage:
+    python -m shelfaware.barcode.export models/barcodes.pt --format onnx
+    python -m shelfaware.barcode.export models/barcodes.pt --format onnx --int8 --calibration ../samples/upc
+"""
+
+import argparse
+import glob
+import os
+
+from .backends import OnnxBackend
+
+FORMATS = ("onnx", "openvino")
+
+
+class _CalibrationReader:
+    # Feeds quantize_static the same input tensors OnnxBackend builds at inference time
+    def __init__(self, onnx_path, image_paths):
+        self.backend = OnnxBackend(onnx_path)
+        self.input_name = self.backend.session.get_inputs()[0].name
+        self.image_paths = iter(image_paths)
+
+    def get_next(self):
+        import cv2
+
+        for image_path in self.image_paths:
+            image = cv2.imread(image_path)
+            if image is None:
+                continue
+            self.backend._preprocess(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            return {self.input_name: self.backend._input.copy()}
+        return None
+
+
+def quantize_onnx(onnx_path, calibration_dir, output_path=None, limit=32):
+    """
+    Quantizes an ONNX model to INT8, calibrating activations on sample images.
+
+    Args:
+        onnx_path (str): Path of the float ONNX model.
+        calibration_dir (str): Directory of .jpg images similar to what will be scanned.
+        output_path (str): Path of the quantized model. Defaults to <name>_int8.onnx next to it.
+        limit (int): Maximum number of calibration images. Defaults to 32.
+
+    Returns:
+        str: Path of the quantized model.
+    """
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    image_paths = sorted(glob.glob(os.path.join(calibration_dir, "*.jpg")))[:limit]
+    if not image_paths:
+        raise ValueError(f"No calibration images found in {calibration_dir}.")
+
+    output_path = output_path or os.path.splitext(onnx_path)[0] + "_int8.onnx"
+    quantize_static(
+        onnx_path,
+        output_path,
+        _CalibrationReader(onnx_path, image_paths),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    return output_path
+
+
+def export_model(model_path, format="onnx", imgsz=640, int8=False, calibration_dir=None):
+    """
+    Exports the YOLO .pt weights to another format with ultralytics.
+
+    ONNX models are exported with a fixed input size and no dynamic axes, which OnnxBackend
+    requires and which lets onnxruntime plan its buffers once.
+
+    Args:
+        model_path (str): Path to the YOLO .pt weights.
+        format (str): "onnx" or "openvino". Defaults to "onnx".
+        imgsz (int): Square input size of the exported model. Defaults to 640.
+        int8 (bool): Quantize to INT8. Defaults to False.
+        calibration_dir (str): Images to calibrate ONNX INT8 quantization on. Required for
+            ONNX with int8.
+
+    Returns:
+        str: Path of the exported model (a directory for OpenVINO).
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported format {format}. Expected one of {', '.join(FORMATS)}.")
+    if format == "onnx" and int8 and not calibration_dir:
+        raise ValueError("INT8 ONNX export needs calibration images.")
+
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    if format == "onnx":
+        path = model.export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+        if int8:
+            path = quantize_onnx(path, calibration_dir)
+        return path
+    return model.export(format="openvino", imgsz=imgsz, int8=int8)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the barcode model for faster CPU inference.")
+    parser.add_argument("model", help="Path of the YOLO .pt weights")
+    parser.add_argument("--format", choices=FORMATS, default="onnx")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--int8", action="store_true", help="Quantize to INT8")
+    parser.add_argument("--calibration", help="Directory of images to calibrate ONNX INT8 quantization")
+    args = parser.parse_args()
+
+    path = export_model(args.model, format=args.format, imgsz=args.imgsz, int8=args.int8,
+                        calibration_dir=args.calibration)
+    print(f"Exported {path}")
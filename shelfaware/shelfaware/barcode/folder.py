@@ -0,0 +1,256 @@
+"""
+Incremental barcode scanning of a directory of photos, with results streamed to a JSONL manifest.
+
+Each worker process builds its own detector and scans batches of files: it reads, hashes and
+decodes them, runs detection on the batch and decodes the barcodes, then sends back only the
+manifest records. The parent process appends one record per file. Files whose content hash is
+already in the manifest are skipped before they are decoded, so re-running a scan over the same
+directory only processes new photos.
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff")
+
+STAGES = ("read", "hash", "decode", "detect", "barcode_decode", "write")
+
+# Set in each worker process by _init_worker
+_detector = None
+_known_hashes = frozenset()
+_load_size = None
+
+
+def find_images(directory):
+    """
+    Lists the image files under a directory, recursively, in a stable order.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        list: Paths of files with an image extension.
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return paths
+
+
+def read_manifest_hashes(manifest_path):
+    """
+    Returns the content hashes already recorded in a manifest.
+
+    Args:
+        manifest_path (str): Path of the JSONL manifest. A missing file has no hashes.
+
+    Returns:
+        set: SHA-256 hex digests.
+    """
+    hashes = set()
+    if not os.path.exists(manifest_path):
+        return hashes
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                hashes.add(json.loads(line)["sha256"])
+            except (ValueError, KeyError):
+                # A partial last line from an interrupted run is scanned again
+                continue
+    return hashes
+
+
+def _init_worker(detector_factory, known_hashes, load_size):
+    global _detector, _known_hashes, _load_size
+    _detector = detector_factory()
+    _known_hashes = known_hashes
+    _load_size = load_size
+
+
+def _read_and_decode(path, timings):
+    from .loading import load_image
+
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        data = f.read()
+    timings["read"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    sha256 = hashlib.sha256(data).hexdigest()
+    timings["hash"] += time.perf_counter() - start
+
+    record = {"path": path, "sha256": sha256, "bytes": len(data)}
+    if sha256 in _known_hashes:
+        return record, None
+
+    start = time.perf_counter()
+    try:
+        image_rgb = load_image(data, _load_size)
+    except ValueError as e:
+        record["error"] = str(e)
+        image_rgb = None
+    timings["decode"] += time.perf_counter() - start
+    return record, image_rgb
+
+
+def _scan_files(paths):
+    # Returns the records of a batch of files and the time spent per stage. Only the records
+    # leave the worker, the decoded images never do.
+    timings = dict.fromkeys(STAGES[:-1], 0.0)
+    records, loaded = [], []
+    for path in paths:
+        record, image_rgb = _read_and_decode(path, timings)
+        records.append(record)
+        if image_rgb is not None:
+            loaded.append((record, image_rgb))
+    if not loaded:
+        return records, timings
+
+    start = time.perf_counter()
+    all_boxes = _detector.detect_boxes_batch([image_rgb for _, image_rgb in loaded])
+    timings["detect"] += time.perf_counter() - start
+
+    for (record, image_rgb), boxes in zip(loaded, all_boxes):
+        start = time.perf_counter()
+        barcodes = _detector.decode_image(image_rgb, boxes)
+        timings["barcode_decode"] += time.perf_counter() - start
+
+        record["height"], record["width"] = image_rgb.shape[:2]
+        record["boxes"] = [[round(value, 1) for value in box] for box in boxes]
+        record["barcodes"] = [{"type": barcode_type, "data": data} for barcode_type, data in barcodes]
+    return records, timings
+
+
+class FolderScanStats:
+    """
+    Counters and per-stage timing of a folder scan.
+
+    Stage times are summed over images. Every stage but write runs on the worker processes, so
+    their totals can exceed the wall time.
+
+    Attributes:
+        scanned (int): Images decoded and run through detection.
+        skipped (int): Files whose hash was already in the manifest (or repeated within the run).
+        failed (int): Files that could not be decoded as images.
+        barcodes (int): Barcodes decoded.
+        stage_seconds (dict): Total seconds per stage.
+        wall_seconds (float): Wall time of the scan.
+    """
+
+    def __init__(self):
+        self.scanned = 0
+        self.skipped = 0
+        self.failed = 0
+        self.barcodes = 0
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.wall_seconds = 0.0
+
+    @property
+    def images_per_second(self):
+        return self.scanned / self.wall_seconds if self.wall_seconds else 0.0
+
+    def add_timings(self, timings):
+        for stage, seconds in timings.items():
+            self.stage_seconds[stage] += seconds
+
+    def summary(self):
+        lines = [
+            f"Scanned {self.scanned} images ({self.skipped} skipped, {self.failed} failed), "
+            f"{self.barcodes} barcodes in {self.wall_seconds:.1f}s: {self.images_per_second:.2f} images/sec"
+        ]
+        processed = max(self.scanned + self.failed, 1)
+        for stage in STAGES:
+            total = self.stage_seconds[stage]
+            lines.append(f"  {stage:<15} {total:8.2f}s total {total * 1000 / processed:8.1f} ms/image")
+        return "\n".join(lines)
+
+
+def _scan_batches(executor, paths, batch_size, max_in_flight):
+    # Yields results as they complete, with a bounded number of batches submitted at once
+    paths = iter(paths)
+    pending = set()
+    while True:
+        while len(pending) < max_in_flight:
+            batch = list(islice(paths, batch_size))
+            if not batch:
+                break
+            pending.add(executor.submit(_scan_files, batch))
+        if not pending:
+            return
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def scan_folder(directory, detector_factory, manifest_path, workers=None, batch_size=8, load_size=1600):
+    """
+    Scans the images under a directory and appends one record per new image to a manifest.
+
+    Each record holds the path, SHA-256, size in bytes, decoded image size and the barcodes with
+    their boxes, or an error for files that are not decodable images.
+
+    Args:
+        directory (str): Directory of photos, searched recursively.
+        detector_factory (callable): Called with no arguments in each worker process to build the
+            BarcodeDetector used for detection and decoding, e.g.
+            functools.partial(BarcodeDetector, "models/barcodes.pt"). Must be picklable.
+        manifest_path (str): JSONL manifest, created if missing and appended to otherwise.
+        workers (int): Worker processes scanning files. Defaults to the CPU count.
+            0 scans in the calling process.
+        batch_size (int): Images per detection batch. Defaults to 8.
+        load_size (int): Passed to load_image. Defaults to 1600.
+
+    Returns:
+        FolderScanStats: Counters and per-stage timing.
+    """
+    stats = FolderScanStats()
+    start = time.perf_counter()
+    known_hashes = read_manifest_hashes(manifest_path)
+    paths = find_images(directory)
+    workers = os.cpu_count() if workers is None else workers
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest:
+
+        def handle(records, timings):
+            stats.add_timings(timings)
+            write_start = time.perf_counter()
+            for record in records:
+                if "barcodes" not in record and "error" not in record:
+                    stats.skipped += 1
+                elif record["sha256"] in known_hashes:
+                    # The same content appeared earlier in this run under another path
+                    stats.skipped += 1
+                else:
+                    known_hashes.add(record["sha256"])
+                    if "error" in record:
+                        stats.failed += 1
+                    else:
+                        stats.scanned += 1
+                        stats.barcodes += len(record["barcodes"])
+                    manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+            stats.stage_seconds["write"] += time.perf_counter() - write_start
+
+        if workers:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(detector_factory, frozenset(known_hashes), load_size)) as executor:
+                for result in _scan_batches(executor, paths, batch_size, max_in_flight=workers * 2):
+                    handle(*result)
+        else:
+            _init_worker(detector_factory, frozenset(known_hashes), load_size)
+            paths = iter(paths)
+            while True:
+                batch = list(islice(paths, batch_size))
+                if not batch:
+                    break
+                handle(*_scan_files(batch))
+
+    stats.wall_seconds = time.perf_counter() - start
+    return stats
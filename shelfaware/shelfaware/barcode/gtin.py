@@ -0,0 +1,72 @@
+"""
+Normalization of retail barcodes (GTINs) to one canonical key.
+
+The same product is printed and decoded under several spellings: a UPC-A code is the EAN-13 code
+with a leading 0 dropped, and GTIN-14 (case and pallet codes, or values padded by some scanners)
+adds an indicator digit in front. Every spelling of a GTIN-12 or GTIN-13 maps to the 13-digit form,
+which is also the key Open Food Facts uses. GTIN-14 codes with a non-zero indicator digit and
+8-digit EAN-8 codes are kept as they are.
+"""
+
+GTIN_LENGTHS = (8, 12, 13, 14)
+
+
+def gtin_check_digit(digits):
+    """
+    Computes the GS1 check digit of a GTIN without its check digit.
+
+    Args:
+        digits (str): The digits before the check digit.
+
+    Returns:
+        str: The check digit.
+    """
+    # Weights alternate 3, 1 starting from the digit next to the check digit
+    total = sum(int(digit) * (3 if i % 2 == 0 else 1) for i, digit in enumerate(reversed(digits)))
+    return str((10 - total % 10) % 10)
+
+
+def normalize_gtin(code):
+    """
+    Returns the canonical key of an EAN-8, UPC-A, EAN-13 or GTIN-14 barcode.
+
+    Spaces and dashes are ignored.
+
+    Args:
+        code (str): The decoded barcode.
+
+    Returns:
+        str: 13 digits for GTIN-12/13 (and GTIN-14 with indicator 0), otherwise the code itself.
+
+    Raises:
+        ValueError: If the code is not a GTIN or its check digit is wrong.
+    """
+    digits = str(code).replace(" ", "").replace("-", "")
+    if not digits.isdigit() or len(digits) not in GTIN_LENGTHS:
+        raise ValueError(f"{code!r} is not an EAN-8, UPC-A, EAN-13 or GTIN-14 barcode.")
+    if gtin_check_digit(digits[:-1]) != digits[-1]:
+        raise ValueError(f"{code!r} has an invalid check digit.")
+
+    if len(digits) == 12:
+        return "0" + digits
+    if len(digits) == 14 and digits[0] == "0":
+        return digits[1:]
+    return digits
+
+
+def gtin_variants(key):
+    """
+    Lists the spellings a canonical key may have been stored under, for matching legacy rows.
+
+    Args:
+        key (str): A key returned by normalize_gtin.
+
+    Returns:
+        list: The key first, then its 12 and 14 digit spellings where they exist.
+    """
+    variants = [key]
+    if len(key) == 13:
+        variants.append("0" + key)
+        if key[0] == "0":
+            variants.append(key[1:])
+    return variants
@@ -0,0 +1,109 @@
+"""
+Image loading for BarcodeDetector, with as few full-size copies as possible.
+
+Encoded images (file paths, bytes, memoryviews) are decoded straight from the source buffer and,
+when they are larger than needed, at 1/2, 1/4 or 1/8 scale: libjpeg then skips most of the
+work instead of decoding the full image and resizing it. The decoded buffer is owned by the
+loader, so it is converted to RGB in place instead of into a copy.
+"""
+
+import os
+from io import BytesIO
+
+from PIL import Image
+
+# Decode-time reductions OpenCV supports, largest first
+REDUCTIONS = (8, 4, 2)
+
+# Bytes read to find the image size of encoded data; enough for JPEGs with large EXIF blocks
+HEADER_BYTES = 256 * 1024
+
+
+def reduction_factor(width, height, load_size):
+    """
+    Returns the largest decode-time reduction that keeps the longest side at least load_size.
+
+    Args:
+        width (int): Width of the encoded image.
+        height (int): Height of the encoded image.
+        load_size (int): Minimum longest side after reduction, or None for full resolution.
+
+    Returns:
+        int: 1, 2, 4 or 8.
+    """
+    if load_size is None:
+        return 1
+    for factor in REDUCTIONS:
+        if max(width, height) // factor >= load_size:
+            return factor
+    return 1
+
+
+def _imread_flag(factor):
+    import cv2
+
+    return {
+        1: cv2.IMREAD_COLOR,
+        2: cv2.IMREAD_REDUCED_COLOR_2,
+        4: cv2.IMREAD_REDUCED_COLOR_4,
+        8: cv2.IMREAD_REDUCED_COLOR_8,
+    }[factor]
+
+
+def _encoded_size(source):
+    # Reads only the header, the pixels are decoded by OpenCV
+    try:
+        with Image.open(source) as img:
+            return img.size
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+
+def load_image(input_image, load_size=None):
+    """
+    Loads an image as an RGB numpy array.
+
+    Args:
+        input_image (str or os.PathLike or bytes or bytearray or memoryview or np.ndarray or PIL.Image):
+            A file path, an encoded image (JPEG, PNG, ...) in memory, a cv2 image (BGR numpy
+            array) or a PIL Image.
+        load_size (int): Encoded images whose longest side is at least twice this are decoded
+            at reduced scale, keeping the longest side at least load_size. None always loads at
+            full resolution. Arrays and PIL images, which are already decoded, are never resized.
+
+    Returns:
+        np.ndarray: The image in RGB format.
+
+    Raises:
+        ValueError: If the input type is not supported or the data cannot be decoded.
+    """
+    import cv2
+    import numpy as np
+
+    if isinstance(input_image, (str, os.PathLike)):
+        path = os.fspath(input_image)
+        size = _encoded_size(path)
+        factor = reduction_factor(*size, load_size) if size else 1
+        image = cv2.imread(path, _imread_flag(factor))
+        if image is None:
+            raise ValueError(f"Could not read image {path}.")
+    elif isinstance(input_image, (bytes, bytearray, memoryview)):
+        # np.frombuffer is a view, the encoded data is not copied
+        buffer = np.frombuffer(input_image, dtype=np.uint8)
+        # The header is near the start; BytesIO copies, so only hand it a prefix
+        size = _encoded_size(BytesIO(memoryview(input_image)[:HEADER_BYTES]))
+        factor = reduction_factor(*size, load_size) if size else 1
+        image = cv2.imdecode(buffer, _imread_flag(factor))
+        if image is None:
+            raise ValueError("Could not decode image data.")
+    elif isinstance(input_image, np.ndarray):
+        # The caller owns the array, so the conversion has to go into a new one
+        return cv2.cvtColor(input_image, cv2.COLOR_BGR2RGB)
+    elif isinstance(input_image, Image.Image):
+        rgb = input_image if input_image.mode == "RGB" else input_image.convert("RGB")
+        return np.array(rgb)
+    else:
+        raise ValueError("Invalid input image type. Expected file path, image bytes, cv2 image, or PIL image.")
+
+    # The decoded buffer is ours, so convert it in place
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
@@ -0,0 +1,266 @@
+"""
+Barcode detection in a pool of worker processes, for callers running an asyncio event loop.
+
+Each worker process loads and warms up the YOLO model once when it starts. Images submitted while the
+workers are busy, or within a short window of each other, are coalesced into one batch and
+run through BarcodeDetector.extract_and_decode_batch in a single call. If a worker process dies,
+the batches it was running fail and the processes are replaced before the next batch.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+# The detector of the current worker process, set by _init_worker
+_detector = None
+
+
+class PoolUnavailableError(RuntimeError):
+    """
+    Raised when the worker processes cannot be started (for example when the model or its
+    dependencies are missing) or died while scanning.
+    """
+
+
+def _init_worker(detector_factory, model_path, confidence_threshold, backend, decoder, symbologies):
+    global _detector
+    if detector_factory is None:
+        # Imported here so the parent process never loads ultralytics and torch
+        from .detector import BarcodeDetector
+        # The worker processes already share the cores, so each decodes on one thread
+        detector_factory = partial(BarcodeDetector, backend=backend, decoder=decoder, symbologies=symbologies,
+                                   decode_threads=1)
+    _detector = detector_factory(model_path, confidence_threshold=confidence_threshold)
+    _detector.warm_up()
+
+
+def _warm_up(delay):
+    # Holds the worker briefly, so each warm-up call lands on (and starts) a different process
+    time.sleep(delay)
+    return _detector is not None
+
+
+def _scan_batch(images_data):
+    # The detector decodes the uploads straight from their bytes, at reduced scale when they are large
+    try:
+        return _detector.extract_and_decode_batch(images_data, batch_size=len(images_data))
+    except ValueError:
+        # One undecodable upload fails the whole batch, so scan them one by one to find it
+        return [_scan_one(data) for data in images_data]
+
+
+def _scan_one(image_data):
+    try:
+        return _detector.extract_and_decode_batch([image_data], batch_size=1)[0]
+    except ValueError:
+        # None marks an upload that is not a decodable image
+        return None
+
+
+class BarcodeWorkerPool:
+    """
+    Runs barcode detection on encoded images (JPEG, PNG, ...) in worker processes.
+
+    Attributes:
+        workers (int): Number of worker processes, each with its own copy of the model.
+        max_batch (int): Maximum number of images coalesced into one batch.
+        batch_window (float): Seconds to wait for more images before dispatching a partial batch.
+        batches_run (int): Number of batches sent to the workers.
+        images_scanned (int): Number of images sent to the workers.
+    """
+
+    def __init__(self, model_path="models/barcodes.pt", workers=2, max_batch=8, batch_window=0.005,
+                 confidence_threshold=0.5, backend="ultralytics", decoder="pyzbar", symbologies=None,
+                 detector_factory=None):
+        """
+        Initializes the BarcodeWorkerPool. The worker processes are started by start().
+
+        Args:
+            model_path (str): Path to the YOLO model weights.
+            workers (int): Number of worker processes. Defaults to 2.
+            max_batch (int): Maximum number of images per batch. Defaults to 8.
+            batch_window (float): Seconds to wait for more images before dispatching. Defaults to 5 ms.
+            confidence_threshold (float): The confidence threshold for barcode detection.
+            backend (str): BarcodeDetector inference backend, "ultralytics" or "onnx".
+            decoder (str): BarcodeDetector barcode decoder, "pyzbar", "opencv" or "zxing".
+            symbologies (list): Barcode types to decode. Defaults to all.
+            detector_factory (callable): Called in each worker as detector_factory(model_path,
+                confidence_threshold=...) to build an object with warm_up() and
+                extract_and_decode_batch(). Must be picklable. Defaults to BarcodeDetector.
+        """
+        if workers < 1 or max_batch < 1:
+            raise ValueError("workers and max_batch must be at least 1.")
+        self.model_path = model_path
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.confidence_threshold = confidence_threshold
+        self.backend = backend
+        self.decoder = decoder
+        self.symbologies = symbologies
+        self.detector_factory = detector_factory
+
+        self.batches_run = 0
+        self.images_scanned = 0
+
+        self._executor = None
+        self._broken = False
+        self._queue = None
+        self._dispatcher = None
+        self._slots = None
+        self._starting = None
+
+    async def start(self):
+        """
+        Starts the worker processes and waits until every worker has loaded its model.
+
+        Raises:
+            PoolUnavailableError: If the workers cannot load the model. The next call tries again.
+        """
+        if self._starting is None:
+            self._starting = asyncio.ensure_future(self._start())
+            self._starting.add_done_callback(self._start_done)
+        # Shielded, so a cancelled caller does not cancel the start the other callers are waiting on
+        await asyncio.shield(self._starting)
+
+    def _start_done(self, starting):
+        # A failed or cancelled start is forgotten, so the next call tries again
+        if self._starting is starting and (starting.cancelled() or starting.exception() is not None):
+            self._starting = None
+
+    async def _start(self):
+        self._executor = await self._new_executor()
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _new_executor(self):
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.detector_factory, self.model_path, self.confidence_threshold, self.backend,
+                      self.decoder, self.symbologies),
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.gather(*(
+                loop.run_in_executor(executor, _warm_up, 0.1) for _ in range(self.workers)
+            ))
+        except BrokenProcessPool as e:
+            # A worker initializer raised, so the processes exited without a usable model
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise PoolUnavailableError(f"Barcode workers failed to load {self.model_path}.") from e
+        return executor
+
+    async def _replace_executor(self):
+        # A worker died, which breaks the whole executor, so start a new set of processes
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = await self._new_executor()
+        self._broken = False
+
+    async def close(self):
+        """
+        Stops the dispatcher and shuts down the worker processes.
+        """
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._broken = False
+        self._starting = None
+
+    async def scan(self, image_data):
+        """
+        Detects and decodes the barcodes in an encoded image.
+
+        Args:
+            image_data (bytes): The encoded image, for example the body of a JPEG upload.
+
+        Returns:
+            list: A list of (barcode type, barcode data) tuples.
+
+        Raises:
+            ValueError: If the data is not a decodable image.
+            PoolUnavailableError: If the workers cannot be started or died while scanning it.
+        """
+        await self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((bytes(image_data), future))
+        barcodes = await future
+        if barcodes is None:
+            raise ValueError("Uploaded data is not a decodable image.")
+        return barcodes
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Only take a batch when a worker is free, so requests keep queueing (and are
+            # coalesced into bigger batches) while every worker is busy
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            if self._broken:
+                try:
+                    await self._replace_executor()
+                except PoolUnavailableError as e:
+                    self._slots.release()
+                    self._fail(batch, e)
+                    continue
+
+            self.batches_run += 1
+            self.images_scanned += len(batch)
+            executor = self._executor
+            try:
+                task = loop.run_in_executor(executor, _scan_batch, [data for data, _ in batch])
+            except BrokenProcessPool as e:
+                self._slots.release()
+                self._broken = True
+                self._fail(batch, PoolUnavailableError(f"Barcode workers died and are being restarted: {e}"))
+                continue
+            task.add_done_callback(lambda task, batch=batch, executor=executor: self._finish(task, batch, executor))
+
+    def _fail(self, batch, error):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _finish(self, task, batch, executor):
+        self._slots.release()
+        if task.cancelled():
+            for _, future in batch:
+                future.cancel()
+            return
+        error = task.exception()
+        if isinstance(error, BrokenProcessPool):
+            # Only the current executor is replaced, batches from an old one fail without effect
+            if executor is self._executor:
+                self._broken = True
+            self._fail(batch, PoolUnavailableError("A barcode worker died while scanning. It is being restarted."))
+            return
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(task.result()[i])
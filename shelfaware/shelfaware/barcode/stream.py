@@ -0,0 +1,254 @@
+"""
+Continuous barcode scanning over a video stream (camera, video file or any frame iterator).
+
+Detection only runs every few frames or when the scene changes, boxes are tracked between
+detections so a barcode that stays in view is decoded once, and frames are dropped instead
+of queued when the scanner cannot keep up with a live source.
+"""
+
+import queue
+import threading
+import time
+
+import cv2
+
+from .decoding import CropDecodeStrategy, decode_with_strategies
+
+_END = object()
+
+
+class BarcodeEvent:
+    """
+    A barcode seen for the first time in a stream.
+
+    Attributes:
+        barcode_type (str): Type of barcode (EAN13, CODE128, etc.).
+        barcode_data (str): The decoded barcode data.
+        frame_index (int): Index of the source frame the barcode was decoded from.
+        box (tuple): Bounding box (x1, y1, x2, y2) of the barcode in that frame.
+        timestamp (float): Time the barcode was decoded, as returned by time.time().
+    """
+
+    def __init__(self, barcode_type, barcode_data, frame_index, box, timestamp):
+        self.barcode_type = barcode_type
+        self.barcode_data = barcode_data
+        self.frame_index = frame_index
+        self.box = box
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"<BarcodeEvent(type={self.barcode_type}, data={self.barcode_data}, frame={self.frame_index})>"
+
+
+class _Track:
+    def __init__(self, box):
+        self.box = box
+        self.barcode_data = None
+        self.missed = 0
+
+
+def _iou(box_a, box_b):
+    x1, y1 = max(box_a[0], box_b[0]), max(box_a[1], box_b[1])
+    x2, y2 = min(box_a[2], box_b[2]), min(box_a[3], box_b[3])
+    intersection = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    if intersection == 0:
+        return 0.0
+    area_a = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1])
+    area_b = (box_b[2] - box_b[0]) * (box_b[3] - box_b[1])
+    return intersection / (area_a + area_b - intersection)
+
+
+class BarcodeStreamScanner:
+    """
+    Scans a stream of frames with a BarcodeDetector and yields deduplicated barcode events.
+
+    Attributes:
+        detector (BarcodeDetector): The detector used for box detection and decoding.
+        detect_every (int): Run detection on every Nth processed frame.
+        motion_threshold (float): Mean absolute pixel difference (0-255) on a downscaled grayscale
+            frame that triggers detection before the next scheduled one. None disables it.
+        iou_threshold (float): Minimum IoU for a detected box to continue an existing track.
+        max_missed (int): Number of detections a track may go unseen before it is dropped.
+        dedup_frames (int): A barcode that reappears within this many frames is not reported again.
+        queue_size (int): Frames buffered between the reader thread and the scanner for live sources.
+        frames_read (int): Frames read from the source.
+        frames_dropped (int): Frames dropped because the scanner was behind.
+        detections_run (int): Number of frames the YOLO model was run on.
+    """
+
+    def __init__(self, detector, detect_every=5, motion_threshold=8.0, iou_threshold=0.3,
+                 max_missed=3, dedup_frames=150, queue_size=2, crop_strategy=None):
+        self.detector = detector
+        self.detect_every = detect_every
+        self.motion_threshold = motion_threshold
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.dedup_frames = dedup_frames
+        self.queue_size = queue_size
+        self.crop_strategy = crop_strategy or CropDecodeStrategy()
+
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self.detections_run = 0
+
+    def scan(self, source, realtime=None):
+        """
+        Scans a video source and yields each barcode once while it stays in view.
+
+        Args:
+            source (cv2.VideoCapture or int or str or iterable): An open capture (or any object with
+                its read() and get() methods), a camera index or video path to open with
+                cv2.VideoCapture, or an iterable of BGR frames (numpy arrays). A capture opened
+                from an index or path is released when the scan ends.
+            realtime (bool): Read frames on a background thread and drop the oldest buffered frame
+                when the scanner falls behind. Defaults to True for live captures (camera indices,
+                and captures that report no frame count, such as network streams) and False for
+                video files and iterables, which are then consumed at the scanner's pace.
+
+        Yields:
+            BarcodeEvent: A newly seen barcode.
+        """
+        opened = None
+        if isinstance(source, (int, str)):
+            source = opened = cv2.VideoCapture(source)
+        capture = self._is_capture(source)
+        if realtime is None:
+            realtime = capture and self._is_live(source)
+
+        frames = self._iter_capture(source) if capture else iter(source)
+        if realtime:
+            frames = self._iter_realtime(frames)
+        else:
+            frames = self._iter_counted(frames)
+
+        try:
+            yield from self._scan_frames(frames)
+        finally:
+            # Stops the reader thread before the capture it reads from is released
+            frames.close()
+            if opened is not None:
+                opened.release()
+
+    def _scan_frames(self, frames):
+        tracks = []
+        last_seen = {}
+        reference = None
+        processed = 0
+
+        for frame_index, frame in frames:
+            small = self._small_gray(frame)
+            run_detection = processed % self.detect_every == 0 or reference is None
+            if not run_detection and self.motion_threshold is not None:
+                run_detection = cv2.absdiff(small, reference).mean() > self.motion_threshold
+            processed += 1
+            if not run_detection:
+                continue
+
+            reference = small
+            self.detections_run += 1
+            image_rgb = self.detector.load_image(frame)
+            boxes = self.detector.detect_boxes(image_rgb)
+
+            for event in self._update_tracks(tracks, boxes, image_rgb, frame_index):
+                previous = last_seen.get(event.barcode_data)
+                last_seen[event.barcode_data] = frame_index
+                if previous is None or frame_index - previous > self.dedup_frames:
+                    yield event
+
+    def _update_tracks(self, tracks, boxes, image_rgb, frame_index):
+        matched = set()
+        for box in boxes:
+            track = max(tracks, key=lambda t: _iou(t.box, box), default=None)
+            if track is None or id(track) in matched or _iou(track.box, box) < self.iou_threshold:
+                track = _Track(box)
+                tracks.append(track)
+            matched.add(id(track))
+            track.box = box
+            track.missed = 0
+
+            # A barcode that stays in view is only decoded once
+            if track.barcode_data is not None:
+                continue
+
+            barcodes = decode_with_strategies(
+                [self.crop_strategy], self.detector.decode_stats, self.detector.decode_barcodes, image_rgb, [box]
+            )
+            if barcodes:
+                barcode_type, track.barcode_data = barcodes[0]
+                yield BarcodeEvent(barcode_type, track.barcode_data, frame_index, tuple(box), time.time())
+
+        for track in list(tracks):
+            if id(track) not in matched:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    tracks.remove(track)
+
+    def _is_capture(self, source):
+        # Duck-typed, so wrapped captures are read like cv2.VideoCapture
+        return hasattr(source, "read") and hasattr(source, "get")
+
+    def _is_live(self, capture):
+        # Video files report their length, cameras and network streams report 0 or -1
+        return capture.get(cv2.CAP_PROP_FRAME_COUNT) <= 0
+
+    def _small_gray(self, frame, width=64):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        height = max(1, gray.shape[0] * width // gray.shape[1])
+        return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+
+    def _iter_capture(self, capture):
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                return
+            yield frame
+
+    def _iter_counted(self, frames):
+        for frame in frames:
+            self.frames_read += 1
+            yield self.frames_read - 1, frame
+
+    def _iter_realtime(self, frames):
+        buffer = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        def put_latest(item):
+            while True:
+                try:
+                    buffer.put_nowait(item)
+                    return
+                except queue.Full:
+                    try:
+                        buffer.get_nowait()
+                        self.frames_dropped += 1
+                    except queue.Empty:
+                        pass
+
+        def read():
+            for frame in frames:
+                if stop.is_set():
+                    return
+                self.frames_read += 1
+                put_latest((self.frames_read - 1, frame))
+
+            # The end marker must not be dropped, so wait for the scanner to make room
+            while not stop.is_set():
+                try:
+                    buffer.put(_END, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END:
+                    return
+                yield item
+        finally:
+            stop.set()
+            # Waits for the read in progress, so the caller never releases a capture that the
+            # reader is still reading from. The reader stops after that read.
+            reader.join()
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from shelfaware.barcode.backends import OnnxBackend, make_backend
+from shelfaware.barcode.export import quantize_onnx
+
+# onnxruntime is the optional onnx extra, and onnx only builds the test model
+try:
+    import onnx
+    import onnxruntime
+    from onnx import TensorProto, helper, numpy_helper
+except ImportError:
+    onnx = None
+
+
+def make_onnx_model(path, predictions, size=64):
+    # Stand-in for an exported YOLOv8 model: returns fixed (1, 4 + classes, anchors) predictions.
+    # The input is reduced and multiplied by zero so it stays part of the graph.
+    nodes = [
+        helper.make_node("ReduceMean", ["images"], ["mean"], keepdims=0),
+        helper.make_node("Mul", ["mean", "zero"], ["nothing"]),
+        helper.make_node("Add", ["predictions", "nothing"], ["output0"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "fake_yolo",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, size, size])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, list(predictions.shape))],
+        initializer=[
+            numpy_helper.from_array(predictions.astype(np.float32), "predictions"),
+            numpy_helper.from_array(np.zeros((), dtype=np.float32), "zero"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+@unittest.skipIf(onnx is None, "onnx and onnxruntime are not installed")
+class TestOnnxBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.model_path = os.path.join(self.tmpdir, "fake.onnx")
+        # Columns are cx, cy, w, h, score in the 64x64 letterboxed input
+        predictions = np.array([
+            [32, 32, 20, 10, 0.9],
+            [33, 32, 20, 10, 0.8],  # overlaps the first one, suppressed by NMS
+            [10, 40, 6, 4, 0.3],    # below the confidence threshold
+        ], dtype=np.float32).T[np.newaxis]
+        make_onnx_model(self.model_path, predictions)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_detect_maps_boxes_to_image(self):
+        backend = make_backend("onnx", self.model_path)
+        self.assertEqual(backend.input_size, (64, 64))
+
+        # A 128x64 image is scaled by 0.5 and padded by 16 pixels at the top and bottom
+        image = np.zeros((64, 128, 3), dtype=np.uint8)
+        boxes = backend.detect([image, image], confidence_threshold=0.5)
+
+        self.assertEqual(len(boxes), 2)
+        np.testing.assert_allclose(boxes[0], [[44, 22, 84, 42]], atol=1e-4)
+        self.assertEqual(boxes[0], boxes[1])
+
+    def test_preprocess_reuses_buffers(self):
+        backend = OnnxBackend(self.model_path)
+        buffer = backend._input
+
+        image = np.zeros((64, 128, 3), dtype=np.uint8)
+        image[..., 0] = 255  # red
+        backend._preprocess(image)
+
+        self.assertIs(backend._input, buffer)
+        # Padding rows keep the letterbox colour, the image rows have red in the last channel
+        self.assertAlmostEqual(float(buffer[0, 0, 0, 0]), 114 / 255, places=5)
+        self.assertEqual(float(buffer[0, 2, 32, 32]), 1.0)
+        self.assertEqual(float(buffer[0, 0, 32, 32]), 0.0)
+
+    def test_no_detections(self):
+        backend = OnnxBackend(self.model_path)
+        self.assertEqual(backend.detect([np.zeros((64, 64, 3), dtype=np.uint8)], confidence_threshold=0.95), [[]])
+
+    def test_quantize_needs_images(self):
+        with self.assertRaises(ValueError):
+            quantize_onnx(self.model_path, self.tmpdir)
+
+
+class TestMakeBackend(unittest.TestCase):
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            make_backend("tensorrt", "models/barcodes.pt")
+
+
+if __name__ == '__main__':
+    unittest.main()
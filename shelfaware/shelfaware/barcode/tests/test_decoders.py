@@ -0,0 +1,112 @@
+import threading
+import unittest
+from unittest.mock import Mock, patch
+import cv2
+import numpy as np
+from shelfaware.barcode.decoders import GROCERY_SYMBOLOGIES, OpenCVDecoder, make_decoder
+from shelfaware.barcode.detector import BarcodeDetector
+
+try:
+    import zxingcpp
+except ImportError:
+    zxingcpp = None
+
+L_CODES = ["0001101", "0011001", "0010011", "0111101", "0100011", "0110001", "0101111", "0111011", "0110111", "0001011"]
+G_CODES = ["0100111", "0110011", "0011011", "0100001", "0011101", "0111001", "0000101", "0010001", "0001001", "0010111"]
+R_CODES = ["1110010", "1100110", "1101100", "1000010", "1011100", "1001110", "1010000", "1000100", "1001000", "1110100"]
+PARITY = ["LLLLLL", "LLGLGG", "LLGGLG", "LLGGGL", "LGLLGG", "LGGLLG", "LGGGLL", "LGLGLG", "LGLGGL", "LGGLGL"]
+
+
+def ean13_image(digits, module=3, height=120, quiet=12):
+    # Renders an EAN-13 barcode (a UPC-A code when the first digit is 0) as a grayscale image
+    digits = [int(digit) for digit in digits]
+    check = (10 - sum(digit * (3 if i % 2 else 1) for i, digit in enumerate(digits)) % 10) % 10
+    digits.append(check)
+    left = "".join((L_CODES if parity == "L" else G_CODES)[digit] for parity, digit in zip(PARITY[digits[0]], digits[1:7]))
+    right = "".join(R_CODES[digit] for digit in digits[7:])
+    bits = "0" * quiet + "101" + left + "01010" + right + "101" + "0" * quiet
+    row = np.array([0 if bit == "1" else 255 for bit in bits], dtype=np.uint8).repeat(module)
+    image = np.full((height + 40, row.size), 255, dtype=np.uint8)
+    image[20:20 + height] = row
+    return image, "".join(map(str, digits))
+
+
+class TestDecoders(unittest.TestCase):
+
+    def test_make_decoder(self):
+        self.assertIsInstance(make_decoder("opencv"), OpenCVDecoder)
+        with self.assertRaises(ValueError):
+            make_decoder("unknown")
+
+    def test_unknown_symbology(self):
+        for decoder, symbology in (("pyzbar", "EAN-13"), ("opencv", "CODE128"), ("zxing", "SQCODE")):
+            with self.subTest(decoder=decoder):
+                with self.assertRaisesRegex(ValueError, f"{symbology} for the {decoder} decoder.*EAN13"):
+                    make_decoder(decoder, ["EAN13", symbology])
+
+    def test_opencv_decoder(self):
+        ean13, ean13_data = ean13_image("400638133393")
+        upca, upca_data = ean13_image("003600029145")
+        decoder = make_decoder("opencv")
+
+        self.assertEqual(decoder.decode(ean13), [("EAN13", ean13_data)])
+        self.assertEqual(decoder.decode(upca), [("UPCA", upca_data[1:])])
+        self.assertEqual(decoder.decode(np.full((100, 100), 255, dtype=np.uint8)), [])
+
+        # In a larger frame the detector finds the barcode by itself
+        frame = cv2.copyMakeBorder(ean13, 300, 300, 300, 300, cv2.BORDER_CONSTANT, value=200)
+        self.assertEqual(decoder.decode(cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)), [("EAN13", ean13_data)])
+
+    def test_symbology_filter(self):
+        upca, _ = ean13_image("003600029145")
+        self.assertEqual(len(make_decoder("opencv", GROCERY_SYMBOLOGIES).decode(upca)), 1)
+        self.assertEqual(make_decoder("opencv", ["EAN13"]).decode(upca), [])
+
+    @unittest.skipIf(zxingcpp is None, "zxing-cpp is not installed")
+    def test_zxing_decoder(self):
+        ean13, ean13_data = ean13_image("400638133393")
+        upca, upca_data = ean13_image("003600029145")
+
+        self.assertEqual(make_decoder("zxing").decode(ean13), [("EAN13", ean13_data)])
+        self.assertEqual(make_decoder("zxing", GROCERY_SYMBOLOGIES).decode(upca), [("UPCA", upca_data[1:])])
+        self.assertEqual(make_decoder("zxing", ["CODE128"]).decode(ean13), [])
+
+
+class TestParallelDecoding(unittest.TestCase):
+
+    def make_detector(self, decode_threads):
+        with patch("shelfaware.barcode.detector.make_backend"):
+            return BarcodeDetector("model.pt", decoder="opencv", decode_threads=decode_threads)
+
+    def test_decodes_crops_in_parallel_and_in_order(self):
+        detector = self.make_detector(decode_threads=3)
+        threads = set()
+        barrier = threading.Barrier(3, timeout=5)
+
+        def decode(crop):
+            # Every crop waits for the others, which only returns if all three run at once
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return [("EAN13", str(crop))]
+
+        detector.decoder = Mock(decode=decode)
+        self.assertEqual(detector.decode_barcodes([1, 2, 3]), [("EAN13", "1"), ("EAN13", "2"), ("EAN13", "3")])
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(name.startswith("barcode-decode") for name in threads))
+
+        executor = detector._decode_executor
+        detector.close()
+        self.assertIsNone(detector._decode_executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(decode, 4)
+
+    def test_single_thread_decodes_inline(self):
+        detector = self.make_detector(decode_threads=1)
+        images = [ean13_image("400638133393")[0], ean13_image("003600029145")[0]]
+
+        self.assertEqual(detector.decode_barcodes(images), [("EAN13", "4006381333931"), ("UPCA", "036000291452")])
+        self.assertIsNone(detector._decode_executor)
+
+
+if __name__ == '__main__':
+    unittest.main()
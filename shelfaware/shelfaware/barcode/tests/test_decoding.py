@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+from PIL import Image
+from shelfaware.barcode.decoding import (
+    CropDecodeStrategy,
+    DecodeStats,
+    FullFrameDecodeStrategy,
+    decode_with_strategies,
+)
+
+
+class TestDecodeStrategies(unittest.TestCase):
+
+    def setUp(self):
+        self.image_rgb = np.zeros((300, 400, 3), dtype=np.uint8)
+        self.boxes = [(100.0, 100.0, 200.0, 150.0)]
+
+    def test_crop_strategy_pads_grayscales_and_rescales(self):
+        strategy = CropDecodeStrategy(padding=0.1, target_width=220)
+        crops = strategy.prepare(self.image_rgb, self.boxes)
+
+        self.assertEqual(len(crops), 1)
+        self.assertIsInstance(crops[0], Image.Image)
+        self.assertEqual(crops[0].mode, "L", "Crops should be grayscale")
+        # 100x50 box padded by 10% on each side is 120x60, rescaled to a width of 220
+        self.assertEqual(crops[0].size, (220, 110))
+
+    def test_crop_strategy_clamps_boxes_to_image(self):
+        strategy = CropDecodeStrategy(padding=0.5, target_width=100)
+        crops = strategy.prepare(self.image_rgb, [(-10.0, -10.0, 50.0, 50.0), (500.0, 500.0, 600.0, 600.0)])
+
+        # The box outside the image is dropped
+        self.assertEqual(len(crops), 1)
+
+    def test_falls_back_to_full_frame(self):
+        stats = {}
+
+        def decode_fn(images):
+            # Only the full frame "decodes"
+            return [("EAN13", "4099100207149")] if images[0].size == (400, 300) else []
+
+        barcodes = decode_with_strategies(
+            [CropDecodeStrategy(), FullFrameDecodeStrategy()], stats, decode_fn, self.image_rgb, self.boxes
+        )
+
+        self.assertEqual(barcodes, [("EAN13", "4099100207149")])
+        self.assertEqual(stats["crop"].attempts, 1)
+        self.assertEqual(stats["crop"].hits, 0)
+        self.assertEqual(stats["full_frame"].hits, 1)
+
+    def test_full_frame_reuses_grayscale_buffer(self):
+        strategy = FullFrameDecodeStrategy()
+        self.image_rgb[:, :, 0] = 255  # red
+
+        first = strategy.prepare(self.image_rgb, self.boxes)[0]
+        buffer = strategy._gray
+        second = strategy.prepare(self.image_rgb, self.boxes)[0]
+
+        self.assertEqual((first.mode, first.size), ("L", (400, 300)))
+        self.assertEqual(second.getpixel((0, 0)), 76, "Red should convert to the luma of pure red")
+        self.assertIs(strategy._gray, buffer, "The grayscale buffer should be reused for same-size images")
+
+    def test_crop_hit_skips_full_frame(self):
+        stats = {}
+        barcodes = decode_with_strategies(
+            [CropDecodeStrategy(), FullFrameDecodeStrategy()], stats,
+            lambda images: [("EAN13", "4099100207149")], self.image_rgb, self.boxes
+        )
+
+        self.assertEqual(len(barcodes), 1)
+        self.assertEqual(stats["crop"].hit_rate, 1.0)
+        self.assertNotIn("full_frame", stats)
+
+    def test_stats_without_attempts(self):
+        stats = DecodeStats()
+        self.assertEqual(stats.hit_rate, 0.0)
+        self.assertEqual(stats.mean_latency_ms, 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,17 @@
 import unittest
 from shelfaware.barcode.detector import BarcodeDetector
+from shelfaware.barcode.stream import _iou
+import glob
 import os
+import shutil
+import tempfile
 from PIL import Image
 
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
 
 class TestBarcodeDetector(unittest.TestCase):
     
@@ -52,5 +61,59 @@ class TestBarcodeDetector(unittest.TestCase):
             self.assertIsInstance(barcode_type, str, "Barcode type is not a string")
             self.assertIsInstance(barcode_data, str, "Barcode data is not a string")
 
+    def test_extract_and_decode_batch(self):
+        image_paths = [self.image_path, "samples/upc/20240918_075731.jpg", self.image_path]
+
+        # Decode the images in batches smaller than the input to exercise chunking
+        batch_results = self.detector.extract_and_decode_batch(image_paths, batch_size=2)
+
+        # Results are returned per image, in input order, and match the single-image path
+        self.assertEqual(len(batch_results), len(image_paths))
+        for image_path, barcodes in zip(image_paths, batch_results):
+            self.assertEqual(barcodes, self.detector.extract_and_decode(image_path))
+
+    def test_warm_up(self):
+        # A blank image runs through the model and pyzbar without finding anything
+        self.assertGreater(self.detector.warm_up(), 0)
+        self.assertEqual(self.detector.decode_stats, {}, "Warm-up should not count as a decode")
+
+
+@unittest.skipIf(onnxruntime is None, "onnxruntime is not installed")
+class TestOnnxBackendParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from shelfaware.barcode.export import export_model
+
+        cls.model_path = "models/barcodes.pt"
+        cls.onnx_path = "models/barcodes.onnx"
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.tmpdir)
+        if not os.path.exists(cls.onnx_path):
+            # ultralytics exports next to the weights, so export a copy to keep models/ untouched
+            weights = shutil.copy(cls.model_path, cls.tmpdir)
+            cls.onnx_path = export_model(weights, format="onnx")
+        cls.image_paths = sorted(glob.glob("samples/upc/*.jpg"))
+
+    def test_same_boxes_and_barcodes(self):
+        torch_detector = BarcodeDetector(model_path=self.model_path)
+        onnx_detector = BarcodeDetector(model_path=self.onnx_path, backend="onnx")
+
+        for image_path in self.image_paths:
+            image_rgb = torch_detector.load_image(image_path)
+            torch_boxes = torch_detector.detect_boxes(image_rgb)
+            onnx_boxes = onnx_detector.detect_boxes(image_rgb)
+
+            # Letterboxing differs slightly, so boxes match closely rather than exactly
+            self.assertEqual(len(onnx_boxes), len(torch_boxes), image_path)
+            for onnx_box in onnx_boxes:
+                self.assertGreater(max(_iou(onnx_box, box) for box in torch_boxes), 0.9, image_path)
+
+            self.assertEqual(
+                sorted(onnx_detector.extract_and_decode(image_path)),
+                sorted(torch_detector.extract_and_decode(image_path)),
+                image_path,
+            )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from shelfaware.barcode.folder import find_images, read_manifest_hashes, scan_folder
+
+
+class FakeDetector:
+    # Stand-in for BarcodeDetector, built in the worker processes; the YOLO model and pyzbar are
+    # covered by test_detector. The last box coordinate records the size of the detection batch.
+
+    def detect_boxes_batch(self, images_rgb):
+        return [[[1.0, 2.0, 30.0, float(len(images_rgb))]] for _ in images_rgb]
+
+    def decode_image(self, image_rgb, boxes):
+        return [("EAN13", f"{image_rgb.shape[1]}")]
+
+
+class TestScanFolder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.photos = os.path.join(self.tmpdir, "photos")
+        os.makedirs(os.path.join(self.photos, "nested"))
+        self.manifest = os.path.join(self.tmpdir, "manifest.jsonl")
+        for name, width in (("a.jpg", 64), ("nested/b.png", 80), ("c.jpg", 96)):
+            cv2.imwrite(os.path.join(self.photos, name), np.full((48, width, 3), width, dtype=np.uint8))
+        # Same content as a.jpg under another name, a broken image and a file that isn't an image
+        shutil.copy(os.path.join(self.photos, "a.jpg"), os.path.join(self.photos, "copy.jpg"))
+        with open(os.path.join(self.photos, "broken.jpg"), "wb") as f:
+            f.write(b"not a jpeg")
+        with open(os.path.join(self.photos, "notes.txt"), "w") as f:
+            f.write("ignored")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def read_manifest(self):
+        with open(self.manifest) as f:
+            return [json.loads(line) for line in f]
+
+    def test_find_images(self):
+        names = [os.path.relpath(path, self.photos) for path in find_images(self.photos)]
+        self.assertEqual(names, ["a.jpg", "broken.jpg", "c.jpg", "copy.jpg", os.path.join("nested", "b.png")])
+
+    def test_scan_writes_manifest(self):
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                if os.path.exists(self.manifest):
+                    os.remove(self.manifest)
+                stats = scan_folder(self.photos, FakeDetector, self.manifest, workers=workers, batch_size=2)
+
+                self.assertEqual((stats.scanned, stats.skipped, stats.failed), (3, 1, 1))
+                records = {os.path.basename(record["path"]): record for record in self.read_manifest()}
+                self.assertEqual(len(records), 4)
+                self.assertEqual(records["b.png"]["barcodes"], [{"type": "EAN13", "data": "80"}])
+                self.assertEqual((records["c.jpg"]["width"], records["c.jpg"]["height"]), (96, 48))
+                self.assertIn("error", records["broken.jpg"])
+                self.assertEqual(records["b.png"]["boxes"][0][:3], [1.0, 2.0, 30.0])
+                # Detection ran in batches of at most two images
+                self.assertTrue(all(record["boxes"][0][3] <= 2 for record in records.values() if "boxes" in record))
+
+    def test_rerun_is_incremental(self):
+        scan_folder(self.photos, FakeDetector, self.manifest, workers=0)
+        cv2.imwrite(os.path.join(self.photos, "d.jpg"), np.full((48, 112, 3), 7, dtype=np.uint8))
+
+        stats = scan_folder(self.photos, FakeDetector, self.manifest, workers=0)
+
+        self.assertEqual((stats.scanned, stats.skipped, stats.failed), (1, 5, 0))
+        self.assertEqual(len(read_manifest_hashes(self.manifest)), 5)
+        self.assertEqual(self.read_manifest()[-1]["barcodes"], [{"type": "EAN13", "data": "112"}])
+        self.assertIn("images/sec", stats.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from shelfaware.barcode.gtin import gtin_check_digit, gtin_variants, normalize_gtin
+
+
+class TestGtin(unittest.TestCase):
+
+    def test_check_digit(self):
+        self.assertEqual(gtin_check_digit("400638133393"), "1")
+        self.assertEqual(gtin_check_digit("03600029145"), "2")
+        self.assertEqual(gtin_check_digit("9638507"), "4")
+
+    def test_spellings_share_a_key(self):
+        for code in ("036000291452", "0036000291452", "00036000291452", "036000-291452"):
+            with self.subTest(code=code):
+                self.assertEqual(normalize_gtin(code), "0036000291452")
+        self.assertEqual(normalize_gtin("4006381333931"), "4006381333931")
+        self.assertEqual(normalize_gtin("04006381333931"), "4006381333931")
+
+    def test_kept_as_is(self):
+        # EAN-8, and GTIN-14 with a packaging indicator, are different products
+        self.assertEqual(normalize_gtin("96385074"), "96385074")
+        self.assertEqual(normalize_gtin("14006381333938"), "14006381333938")
+
+    def test_invalid(self):
+        for code in ("4006381333932", "https://example.com", "12345", ""):
+            with self.subTest(code=code):
+                with self.assertRaises(ValueError):
+                    normalize_gtin(code)
+
+    def test_variants(self):
+        self.assertEqual(gtin_variants("0036000291452"), ["0036000291452", "00036000291452", "036000291452"])
+        self.assertEqual(gtin_variants("4006381333931"), ["4006381333931", "04006381333931"])
+        self.assertEqual(gtin_variants("96385074"), ["96385074"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ("torch", "ultralytics", "cv2", "pyzbar", "matplotlib")
+
+
+def imported_heavy_modules(module):
+    # A fresh interpreter, since this test process may already have imported them
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return [name for name in output.strip().split(",") if name]
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_barcode_modules(self):
+        for module in ("shelfaware.barcode.detector", "shelfaware.barcode.decoding",
+                       "shelfaware.barcode.pool", "shelfaware.barcode.utils"):
+            with self.subTest(module=module):
+                self.assertEqual(imported_heavy_modules(module), [])
+
+    def test_server(self):
+        self.assertEqual(imported_heavy_modules("shelfaware.server"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
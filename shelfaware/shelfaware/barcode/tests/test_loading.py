@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from PIL import Image
+from shelfaware.barcode.loading import load_image, reduction_factor
+
+
+class TestLoadImage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # A 1600x1200 BGR image that is blue on the left half and red on the right half
+        self.bgr = np.zeros((1200, 1600, 3), dtype=np.uint8)
+        self.bgr[:, :800, 0] = 255
+        self.bgr[:, 800:, 2] = 255
+        self.jpeg = cv2.imencode(".jpg", self.bgr)[1].tobytes()
+        self.path = os.path.join(self.tmpdir, "image.jpg")
+        with open(self.path, "wb") as f:
+            f.write(self.jpeg)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def assert_rgb(self, image, shape):
+        self.assertEqual(image.shape, shape)
+        # Left half blue, right half red, in RGB order
+        self.assertGreater(image[10, 10, 2], 200)
+        self.assertGreater(image[10, -10, 0], 200)
+
+    def test_reduction_factor(self):
+        self.assertEqual(reduction_factor(4000, 3000, 1600), 2)
+        self.assertEqual(reduction_factor(4000, 3000, 500), 8)
+        self.assertEqual(reduction_factor(4000, 3000, None), 1)
+        self.assertEqual(reduction_factor(1000, 800, 1600), 1)
+
+    def test_path_bytes_and_memoryview(self):
+        for source in (self.path, self.jpeg, bytearray(self.jpeg), memoryview(self.jpeg)):
+            with self.subTest(source=type(source).__name__):
+                self.assert_rgb(load_image(source), (1200, 1600, 3))
+
+    def test_reduced_decoding(self):
+        self.assert_rgb(load_image(self.path, load_size=400), (300, 400, 3))
+        self.assert_rgb(load_image(self.jpeg, load_size=800), (600, 800, 3))
+        self.assert_rgb(load_image(self.jpeg, load_size=1000), (1200, 1600, 3))
+
+    def test_arrays_are_not_modified_or_resized(self):
+        original = self.bgr.copy()
+        image = load_image(self.bgr, load_size=400)
+
+        self.assert_rgb(image, (1200, 1600, 3))
+        np.testing.assert_array_equal(self.bgr, original)
+
+    def test_pil_image(self):
+        self.assert_rgb(load_image(Image.open(self.path)), (1200, 1600, 3))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            load_image(b"not an image")
+        with self.assertRaises(ValueError):
+            load_image(os.path.join(self.tmpdir, "missing.jpg"))
+        with self.assertRaises(ValueError):
+            load_image(42)
+
+
+if __name__ == '__main__':
+    unittest.main()
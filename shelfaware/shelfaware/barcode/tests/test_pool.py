@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import patch
+import cv2
+import numpy as np
+from shelfaware.barcode import pool
+from shelfaware.barcode.pool import BarcodeWorkerPool, PoolUnavailableError
+
+
+class FakeDetector:
+    # Stand-in for BarcodeDetector in the worker processes; it must be picklable, so no Mock
+    def __init__(self, model_path, confidence_threshold=0.5):
+        self.pid = os.getpid()
+
+    def warm_up(self):
+        return 0.0
+
+    def extract_and_decode_batch(self, input_images, batch_size=8):
+        input_images = [cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) for data in input_images]
+        if any(image is None for image in input_images):
+            raise ValueError("Could not decode image data.")
+        time.sleep(0.05)
+        return [
+            [("EAN13", f"{image.shape[1]}x{image.shape[0]}"), ("BATCH", str(len(input_images))), ("PID", str(self.pid))]
+            for image in input_images
+        ]
+
+
+class CrashingDetector(FakeDetector):
+    # Kills its worker process on a "crash" upload, as a segfault or the OOM killer would
+    def extract_and_decode_batch(self, input_images, batch_size=8):
+        if b"crash" in input_images:
+            os._exit(1)
+        return super().extract_and_decode_batch(input_images, batch_size)
+
+
+class SlowStartDetector(FakeDetector):
+    # Takes a while to load, so callers can be cancelled while the workers start
+    def __init__(self, model_path, confidence_threshold=0.5):
+        time.sleep(0.5)
+        super().__init__(model_path, confidence_threshold)
+
+
+class MissingModelDetector:
+    def __init__(self, model_path, confidence_threshold=0.5):
+        raise FileNotFoundError(model_path)
+
+
+def encode_jpeg(width, height):
+    ok, data = cv2.imencode(".jpg", np.full((height, width, 3), 128, dtype=np.uint8))
+    return data.tobytes()
+
+
+class TestBarcodeWorkerPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pool = BarcodeWorkerPool(workers=2, max_batch=4, batch_window=0.01, detector_factory=FakeDetector)
+
+    async def asyncTearDown(self):
+        await self.pool.close()
+
+    async def test_scan_returns_results_per_image(self):
+        sizes = [(64 + i, 32) for i in range(6)]
+        results = await asyncio.gather(*(self.pool.scan(encode_jpeg(w, h)) for w, h in sizes))
+
+        for (width, height), barcodes in zip(sizes, results):
+            self.assertEqual(barcodes[0], ("EAN13", f"{width}x{height}"))
+
+    async def test_coalesces_queued_requests(self):
+        await self.pool.start()
+        results = await asyncio.gather(*(self.pool.scan(encode_jpeg(64, 32)) for _ in range(16)))
+
+        batch_sizes = [int(dict(barcodes)["BATCH"]) for barcodes in results]
+        self.assertEqual(self.pool.images_scanned, 16)
+        self.assertLess(self.pool.batches_run, 16)
+        self.assertLessEqual(max(batch_sizes), 4)
+        self.assertEqual(len({dict(barcodes)["PID"] for barcodes in results}), 2, "Both workers should be used")
+
+    async def test_invalid_image(self):
+        valid, invalid = await asyncio.gather(
+            self.pool.scan(encode_jpeg(64, 32)), self.pool.scan(b"not an image"), return_exceptions=True
+        )
+        self.assertEqual(valid[0], ("EAN13", "64x32"))
+        self.assertIsInstance(invalid, ValueError)
+
+
+class TestWorkerDetector(unittest.TestCase):
+
+    def test_workers_decode_on_one_thread(self):
+        self.addCleanup(setattr, pool, "_detector", None)
+        with patch("shelfaware.barcode.detector.BarcodeDetector") as detector_class:
+            pool._init_worker(None, "models/barcodes.pt", 0.5, "onnx", "zxing", ["EAN13"])
+
+        detector_class.assert_called_once_with("models/barcodes.pt", confidence_threshold=0.5, backend="onnx",
+                                               decoder="zxing", symbologies=["EAN13"], decode_threads=1)
+        detector_class.return_value.warm_up.assert_called_once()
+
+
+class TestBarcodeWorkerPoolFailures(unittest.IsolatedAsyncioTestCase):
+
+    async def test_workers_that_cannot_load_the_model(self):
+        pool = BarcodeWorkerPool(workers=1, detector_factory=MissingModelDetector)
+        try:
+            for _ in range(2):
+                # Every call tries again instead of hanging on the failed start
+                with self.assertRaises(PoolUnavailableError):
+                    await pool.scan(encode_jpeg(64, 32))
+        finally:
+            await pool.close()
+
+    async def test_cancelled_caller_does_not_cancel_the_start(self):
+        pool = BarcodeWorkerPool(workers=1, detector_factory=SlowStartDetector)
+        try:
+            cancelled = asyncio.create_task(pool.scan(encode_jpeg(64, 32)))
+            waiting = asyncio.create_task(pool.scan(encode_jpeg(32, 16)))
+            await asyncio.sleep(0.1)
+            cancelled.cancel()
+
+            barcodes = await waiting
+            self.assertEqual(barcodes[0], ("EAN13", "32x16"))
+            self.assertTrue(cancelled.cancelled())
+        finally:
+            await pool.close()
+
+    async def test_dead_worker_is_replaced(self):
+        pool = BarcodeWorkerPool(workers=1, batch_window=0, detector_factory=CrashingDetector)
+        try:
+            with self.assertRaises(PoolUnavailableError):
+                await pool.scan(b"crash")
+            barcodes = await pool.scan(encode_jpeg(64, 32))
+            self.assertEqual(barcodes[0], ("EAN13", "64x32"))
+        finally:
+            await pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
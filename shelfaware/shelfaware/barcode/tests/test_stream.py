@@ -0,0 +1,149 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+import cv2
+import numpy as np
+from shelfaware.barcode.stream import BarcodeStreamScanner
+
+
+def make_detector(boxes_per_call):
+    # Stand-in for BarcodeDetector; the YOLO model and pyzbar are covered by test_detector
+    detector = Mock()
+    detector.decode_stats = {}
+    detector.load_image.side_effect = lambda frame: frame
+    detector.detect_boxes.side_effect = boxes_per_call
+    detector.decode_barcodes.return_value = [("EAN13", "4099100207149")]
+    return detector
+
+
+class TestBarcodeStreamScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = np.full((240, 320, 3), 128, dtype=np.uint8)
+
+    def test_detects_every_n_frames(self):
+        detector = make_detector(lambda image: [])
+        scanner = BarcodeStreamScanner(detector, detect_every=5, motion_threshold=None)
+
+        events = list(scanner.scan([self.frame] * 20))
+
+        self.assertEqual(events, [])
+        self.assertEqual(scanner.frames_read, 20)
+        self.assertEqual(scanner.detections_run, 4)
+
+    def test_motion_triggers_detection(self):
+        detector = make_detector(lambda image: [])
+        scanner = BarcodeStreamScanner(detector, detect_every=100, motion_threshold=8.0)
+        bright = np.full_like(self.frame, 255)
+
+        list(scanner.scan([self.frame, self.frame, bright, bright]))
+
+        # The first frame and the change in brightness
+        self.assertEqual(scanner.detections_run, 2)
+
+    def test_barcode_in_view_is_decoded_once(self):
+        detector = make_detector(lambda image: [(100.0, 100.0, 200.0, 150.0)])
+        scanner = BarcodeStreamScanner(detector, detect_every=1, motion_threshold=None)
+
+        events = list(scanner.scan([self.frame] * 10))
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].barcode_data, "4099100207149")
+        self.assertEqual(events[0].frame_index, 0)
+        self.assertEqual(detector.decode_barcodes.call_count, 1)
+
+    def test_reappearing_barcode_is_deduplicated(self):
+        visible = [True, True, False, False, False, False, False, True, True]
+        calls = iter(visible)
+        detector = make_detector(lambda image: [(100.0, 100.0, 200.0, 150.0)] if next(calls) else [])
+        scanner = BarcodeStreamScanner(detector, detect_every=1, motion_threshold=None, max_missed=2, dedup_frames=100)
+
+        events = list(scanner.scan([self.frame] * len(visible)))
+
+        # The track expired while out of view, but the barcode is only reported once
+        self.assertEqual(len(events), 1)
+        self.assertEqual(detector.decode_barcodes.call_count, 2)
+
+    def test_realtime_drops_frames_instead_of_queueing(self):
+        def slow_detection(image):
+            time.sleep(0.005)
+            return []
+
+        detector = make_detector(slow_detection)
+        scanner = BarcodeStreamScanner(detector, detect_every=1, motion_threshold=None, queue_size=2)
+
+        list(scanner.scan(iter([self.frame] * 200), realtime=True))
+
+        # Every frame read was either processed or dropped, never queued without limit
+        self.assertEqual(scanner.frames_read, 200)
+        self.assertGreater(scanner.frames_dropped, 0)
+        self.assertEqual(scanner.frames_read, scanner.detections_run + scanner.frames_dropped)
+
+    def test_video_file_is_not_realtime_and_is_released(self):
+        captures = []
+        open_capture = cv2.VideoCapture
+
+        def recording_capture(source):
+            # Spies on a real capture; the native type itself cannot be subclassed safely
+            capture = Mock(wraps=open_capture(source))
+            captures.append(capture)
+            return capture
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "clip.avi")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240))
+            for _ in range(30):
+                writer.write(self.frame)
+            writer.release()
+
+            detector = make_detector(lambda image: [(100.0, 100.0, 200.0, 150.0)])
+            scanner = BarcodeStreamScanner(detector, detect_every=1, motion_threshold=None)
+            with patch.object(cv2, "VideoCapture", recording_capture):
+                list(scanner.scan(path))
+                # Stopping early also releases the capture
+                events = BarcodeStreamScanner(detector).scan(path)
+                next(events)
+                events.close()
+
+        # Offline files are read at the scanner's pace, so no frame is dropped
+        self.assertEqual(scanner.frames_read, 30)
+        self.assertEqual(scanner.frames_dropped, 0)
+        self.assertEqual(len(captures), 2)
+        for capture in captures:
+            capture.release.assert_called_once_with()
+
+    def test_realtime_capture_is_released_after_the_reader_stops(self):
+        reading = threading.Event()
+        calls = []
+
+        class SlowCapture:
+            # A live capture whose read() is still running when the scan is stopped
+            in_read = False
+
+            def get(self, prop):
+                return -1
+
+            def read(self):
+                self.in_read = True
+                reading.set()
+                time.sleep(0.05)
+                self.in_read = False
+                return True, np.full((240, 320, 3), 128, dtype=np.uint8)
+
+            def release(self):
+                calls.append("released during read" if self.in_read else "released")
+
+        detector = make_detector(lambda image: [(100.0, 100.0, 200.0, 150.0)])
+        with patch.object(cv2, "VideoCapture", lambda source: SlowCapture()):
+            events = BarcodeStreamScanner(detector, detect_every=1, motion_threshold=None).scan(0)
+            next(events)
+            reading.wait(timeout=5)
+            events.close()
+
+        self.assertEqual(calls, ["released"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,10 @@
 # barcode/utils.py
 
-import matplotlib.pyplot as plt
-import cv2
-
 def show_barcodes(image, boxes, barcodes):
+    # Plotting is only used interactively, so matplotlib is not imported with the package
+    import matplotlib.pyplot as plt
+    import cv2
+
     fig, ax = plt.subplots(1, 1, figsize=(12, 8))
     ax.imshow(image)
     for (box, barcode) in zip(boxes, barcodes):
@@ -0,0 +1,216 @@
+"""
+Consumption rates, run-out forecasts and shopping lists computed from the action log.
+
+A user's actions are loaded with one query into NumPy arrays, sorted by item and date, and every
+statistic is computed for all items at once with array operations (np.add.reduceat over each
+item's run of rows) instead of looping over actions in Python:
+
+    stock             net quantity: purchases minus consume and remove actions
+    daily_rate        quantity consumed or removed per day over the last window_days
+    days_until_empty  stock / daily_rate: 0 when out of stock, infinite when the item is not used
+
+NumPy is imported on first use, so importing this module (and the server) stays cheap.
+"""
+
+import time
+from itertools import chain
+
+from sqlalchemy import func, select
+
+from shelfaware.food_inventory.models import Action, User, stock_delta_expression
+
+SECONDS_PER_DAY = 86400.0
+
+# Julian day of the Unix epoch, to turn SQLite's julianday() into days since the epoch
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+
+def _days_since_epoch(dialect_name, column):
+    if dialect_name == "postgresql":
+        return func.extract("epoch", column) / SECONDS_PER_DAY
+    return func.julianday(column) - _UNIX_EPOCH_JULIAN_DAY
+
+
+def history_query(dialect_name, username=None):
+    """
+    Builds the query that loads the action history for ActionHistory.from_rows.
+
+    Signs and dates are computed by the database, so every row is four numbers.
+
+    Args:
+        dialect_name (str): "sqlite" or "postgresql".
+        username (str): Only load this user's actions. Defaults to every user.
+
+    Returns:
+        Select: Rows of (user_id, list_item_id, signed quantity, days since the Unix epoch),
+            ordered by user, item and date.
+    """
+    query = (
+        select(
+            Action.user_id, Action.list_item_id, stock_delta_expression(),
+            _days_since_epoch(dialect_name, Action.date),
+        )
+        .where(Action.list_item_id.is_not(None), Action.date.is_not(None))
+        .order_by(Action.user_id, Action.list_item_id, Action.date)
+    )
+    if username is not None:
+        query = query.join(User, User.id == Action.user_id).where(User.username == username)
+    return query
+
+
+class ActionHistory:
+    """
+    Actions as columns, sorted by user, item and date.
+
+    Attributes:
+        user_ids (np.ndarray): User of each action.
+        list_item_ids (np.ndarray): Item of each action.
+        deltas (np.ndarray): Signed quantity: positive for purchases, negative for consume and
+            remove actions, 0 for other action types.
+        days (np.ndarray): Date of each action, in days since the Unix epoch.
+    """
+
+    def __init__(self, user_ids, list_item_ids, deltas, days):
+        self.user_ids = user_ids
+        self.list_item_ids = list_item_ids
+        self.deltas = deltas
+        self.days = days
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Builds the columns from the rows of history_query.
+
+        Args:
+            rows (list): (user_id, list_item_id, signed quantity, days) tuples.
+
+        Returns:
+            ActionHistory: The history.
+        """
+        import numpy as np
+
+        # np.array() indexes each SQLAlchemy row as a sequence, which is ~100x slower than
+        # reading one flat stream of values
+        table = np.fromiter(chain.from_iterable(rows), dtype=np.float64, count=len(rows) * 4).reshape(-1, 4)
+        return cls(table[:, 0].astype(np.int64), table[:, 1].astype(np.int64), table[:, 2], table[:, 3])
+
+    def __len__(self):
+        return len(self.deltas)
+
+
+class Forecast:
+    """
+    Per-item stock, consumption rate and run-out forecast, one array entry per (user, item).
+
+    Attributes:
+        user_ids (np.ndarray): User of each item.
+        list_item_ids (np.ndarray): The items.
+        stock (np.ndarray): Net quantity from the action log.
+        daily_rate (np.ndarray): Quantity consumed or removed per day.
+        days_until_empty (np.ndarray): Days until the stock runs out at daily_rate: 0 when out of
+            stock, infinite when the item is not being used.
+        names (dict): Item names by list_item_id, filled in by the inventory managers.
+    """
+
+    def __init__(self, user_ids, list_item_ids, stock, daily_rate, days_until_empty):
+        self.user_ids = user_ids
+        self.list_item_ids = list_item_ids
+        self.stock = stock
+        self.daily_rate = daily_rate
+        self.days_until_empty = days_until_empty
+        self.names = {}
+
+    def __len__(self):
+        return len(self.list_item_ids)
+
+    def _row(self, index):
+        days = float(self.days_until_empty[index])
+        return {
+            "name": self.names.get(int(self.list_item_ids[index])),
+            "stock": float(self.stock[index]),
+            "daily_rate": float(self.daily_rate[index]),
+            # JSON has no infinity
+            "days_until_empty": days if days != float("inf") else None,
+        }
+
+    def items(self):
+        """
+        Returns the forecast of every item, soonest to run out first.
+
+        Returns:
+            list: Dicts with "name", "stock", "daily_rate" and "days_until_empty" (None when
+                the item is not being used).
+        """
+        import numpy as np
+
+        return [self._row(index) for index in np.argsort(self.days_until_empty, kind="stable")]
+
+    def shopping_list(self, horizon_days=7.0, cover_days=14.0):
+        """
+        Suggests what to buy: items that run out within horizon_days, with enough to last cover_days.
+
+        Args:
+            horizon_days (float): Items that run out sooner than this are listed. Defaults to 7.
+            cover_days (float): Days of use each suggested quantity should cover. Defaults to 14.
+
+        Returns:
+            list: Dicts with "name", "quantity" (whole units), "days_until_empty" and "daily_rate",
+                soonest to run out first.
+        """
+        import numpy as np
+
+        needed = (self.daily_rate > 0) & (self.days_until_empty <= horizon_days)
+        quantities = np.ceil(self.daily_rate * cover_days - np.maximum(self.stock, 0.0))
+        indices = np.flatnonzero(needed & (quantities > 0))
+        indices = indices[np.argsort(self.days_until_empty[indices], kind="stable")]
+        return [
+            {
+                "name": self.names.get(int(self.list_item_ids[index])),
+                "quantity": float(quantities[index]),
+                "days_until_empty": float(self.days_until_empty[index]),
+                "daily_rate": float(self.daily_rate[index]),
+            }
+            for index in indices
+        ]
+
+
+def forecast(history, now=None, window_days=90.0):
+    """
+    Computes stock, consumption rate and days until empty for every item in one vectorized pass.
+
+    The rate is the quantity consumed or removed in the last window_days, divided by the length
+    of that window, or by the time since the item's first action when that is shorter, so items
+    bought recently are not assumed to have been sitting unused.
+
+    Args:
+        history (ActionHistory): The actions, sorted by user, item and date.
+        now (float): Current time in seconds since the Unix epoch. Defaults to now.
+        window_days (float): Days of history the rate is computed over. Defaults to 90.
+
+    Returns:
+        Forecast: One entry per (user, item) with actions.
+    """
+    import numpy as np
+
+    now_days = (time.time() if now is None else now) / SECONDS_PER_DAY
+    if not len(history):
+        empty = np.empty(0)
+        return Forecast(empty.astype(np.int64), empty.astype(np.int64), empty, empty, empty)
+
+    # Rows are sorted, so each (user, item) is one run of rows starting where either id changes
+    changes = (np.diff(history.user_ids) != 0) | (np.diff(history.list_item_ids) != 0)
+    starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+
+    deltas = history.deltas
+    stock = np.add.reduceat(deltas, starts)
+
+    recent = history.days >= now_days - window_days
+    used = np.add.reduceat(np.where(recent & (deltas < 0), -deltas, 0.0), starts)
+    observed_days = np.clip(now_days - history.days[starts], 1.0, window_days)
+    daily_rate = used / observed_days
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_until_empty = np.where(daily_rate > 0, stock / daily_rate, np.inf)
+    days_until_empty[stock <= 0] = 0.0
+
+    return Forecast(history.user_ids[starts], history.list_item_ids[starts], stock, daily_rate, days_until_empty)
@@ -0,0 +1,280 @@
+import datetime
+from functools import lru_cache
+from sqlalchemy import event, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from shelfaware.food_inventory.analytics import ActionHistory, forecast, history_query
+from shelfaware.food_inventory.inventory import (
+    BATCH_SIZE, DEFAULT_ITEM_FIELDS, item_dicts, active_items_select, encode_cursor
+)
+from shelfaware.food_inventory.search import SEARCH_KINDS, search as search_items
+from shelfaware.food_inventory.models import (
+    User, List, Category, ListItem, Action, Stock, get_database_url, stock_delta, stock_upsert,
+    is_memory_sqlite, pool_options, set_sqlite_pragmas
+)
+
+# Async drivers used in place of the sync ones in SHELFAWARE_DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+@lru_cache(maxsize=None)
+def _create_async_engine(url):
+    url = make_url(url)
+    if url.get_backend_name() in ASYNC_DRIVERS:
+        url = url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+
+    engine = create_async_engine(url, **pool_options(url))
+    if url.get_backend_name() == "sqlite" and not is_memory_sqlite(url):
+        event.listen(engine.sync_engine, "connect", set_sqlite_pragmas)
+    return engine
+
+
+def get_async_engine(url=None):
+    """
+    Returns the shared async engine for a database URL, creating it on first use.
+
+    Sync URLs such as "sqlite:///food_inventory.db" are switched to the aiosqlite or asyncpg driver.
+    Pooling and SQLite pragmas are configured as for get_engine().
+
+    Args:
+        url (str): Database URL. Defaults to the SHELFAWARE_DATABASE_URL environment variable.
+
+    Returns:
+        AsyncEngine: The SQLAlchemy async engine.
+    """
+    return _create_async_engine(url or get_database_url())
+
+
+class AsyncInventoryManager:
+    """
+    Async counterpart of InventoryManager for the FastAPI server.
+
+    Every call runs in its own AsyncSession and transaction, so one manager can be shared by
+    all concurrent requests.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or get_async_engine()
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        # Users and categories rarely change, so their ids are cached by name
+        self._user_ids = {}
+        self._category_ids = {}
+
+    async def _get_user_id(self, session, username):
+        user_id = self._user_ids.get(username)
+        if user_id is None:
+            user_id = await session.scalar(select(User.id).where(User.username == username))
+            if user_id is not None:
+                self._user_ids[username] = user_id
+        return user_id
+
+    async def _get_category_id(self, session, category_name):
+        category_id = self._category_ids.get(category_name)
+        if category_id is None:
+            category_id = await session.scalar(select(Category.id).where(Category.name == category_name))
+            if category_id is not None:
+                self._category_ids[category_name] = category_id
+        return category_id
+
+    def _list_id_select(self, username, list_name):
+        return (
+            select(List.id)
+            .join(List.user)
+            .where(User.username == username, List.name == list_name)
+            .order_by(List.id)
+            .limit(1)
+        )
+
+    def _list_item_id_select(self, list_name, item_name):
+        return (
+            select(ListItem.id)
+            .join(ListItem.list)
+            .where(ListItem.name == item_name, List.name == list_name)
+            .order_by(ListItem.id)
+            .limit(1)
+        )
+
+    async def add_user(self, username):
+        async with self.Session.begin() as session:
+            user = User(username=username)
+            session.add(user)
+            await session.flush()
+        # Cached once the transaction has committed, so a failed commit leaves no id behind
+        self._user_ids[username] = user.id
+
+    async def add_list(self, username, list_name):
+        async with self.Session.begin() as session:
+            user_id = await self._get_user_id(session, username)
+            if not user_id:
+                raise ValueError(f"User {username} not found.")
+            session.add(List(name=list_name, user_id=user_id))
+
+    async def add_category(self, category_name):
+        async with self.Session.begin() as session:
+            if await self._get_category_id(session, category_name) is not None:
+                return
+            category = Category(name=category_name)
+            session.add(category)
+            await session.flush()
+        self._category_ids[category_name] = category.id
+
+    async def add_list_item(self, username, list_name, item_name, quantity, category_name):
+        async with self.Session.begin() as session:
+            list_id = await session.scalar(self._list_id_select(username, list_name))
+            category_id = await self._get_category_id(session, category_name)
+
+            if not list_id:
+                raise ValueError(f"List {list_name} not found for user {username}.")
+            if not category_id:
+                raise ValueError(f"Category {category_name} not found.")
+
+            session.add(ListItem(name=item_name, quantity=quantity, list_id=list_id, category_id=category_id))
+
+    async def get_user_lists(self, username):
+        async with self.Session() as session:
+            rows = await session.scalars(
+                select(List.name).join(List.user).where(User.username == username).order_by(List.id)
+            )
+            return list(rows)
+
+    async def get_list_items(self, username, list_name):
+        async with self.Session() as session:
+            list_id = self._list_id_select(username, list_name).scalar_subquery()
+            rows = await session.scalars(
+                select(ListItem.name).where(ListItem.list_id == list_id).order_by(ListItem.id)
+            )
+            return list(rows)
+
+    async def get_active_items(self, username, list_name):
+        """
+        Returns the name and quantity of the items still on a list (not removed).
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): Name of the list.
+
+        Returns:
+            list: Dicts with "name" and "quantity", oldest first.
+        """
+        async with self.Session() as session:
+            list_id = self._list_id_select(username, list_name).scalar_subquery()
+            rows = await session.execute(active_items_select(list_id))
+            return item_dicts(rows, DEFAULT_ITEM_FIELDS)
+
+    async def get_active_items_page(self, username, list_name, limit=100, cursor=None, fields=DEFAULT_ITEM_FIELDS):
+        """
+        Returns one page of the items still on a list. See InventoryManager.get_active_items_page.
+        """
+        async with self.Session() as session:
+            list_id = self._list_id_select(username, list_name).scalar_subquery()
+            statement = active_items_select(list_id, fields, cursor, None if limit is None else limit + 1)
+            rows = (await session.execute(statement)).all()
+        if limit is None or len(rows) <= limit:
+            return item_dicts(rows, fields), None
+        return item_dicts(rows[:limit], fields), encode_cursor(*rows[limit - 1][-2:])
+
+    async def iter_active_item_batches(self, username, list_name, fields=DEFAULT_ITEM_FIELDS, batch_size=1000):
+        """
+        Yields the items still on a list in batches, streamed from the database with constant memory.
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): Name of the list.
+            fields (tuple): Names from ITEM_FIELDS to return. Defaults to name and quantity.
+            batch_size (int): Rows fetched per round trip.
+
+        Yields:
+            list: Dicts of the requested fields for up to batch_size items, oldest first.
+        """
+        async with self.Session() as session:
+            list_id = self._list_id_select(username, list_name).scalar_subquery()
+            statement = active_items_select(list_id, fields).execution_options(yield_per=batch_size)
+            rows = await session.stream(statement)
+            async for partition in rows.partitions():
+                yield item_dicts(partition, fields)
+
+    async def get_forecast(self, username, now=None, window_days=90.0):
+        """
+        Forecasts when each of a user's items runs out. See InventoryManager.get_forecast.
+        """
+        async with self.Session() as session:
+            rows = (await session.execute(history_query(self.engine.dialect.name, username))).all()
+            result = forecast(ActionHistory.from_rows(rows), now=now, window_days=window_days)
+            item_ids = sorted(set(result.list_item_ids.tolist()))
+            for start in range(0, len(item_ids), BATCH_SIZE):
+                names = await session.execute(
+                    select(ListItem.id, ListItem.name).where(ListItem.id.in_(item_ids[start:start + BATCH_SIZE]))
+                )
+                result.names.update(names.all())
+            return result
+
+    async def search(self, query, username=None, kinds=SEARCH_KINDS, limit=20, offset=0):
+        """
+        Searches food items and list items. See InventoryManager.search.
+        """
+        async with self.Session() as session:
+            user_id = None
+            if username is not None:
+                user_id = await self._get_user_id(session, username)
+                if not user_id:
+                    raise ValueError(f"User {username} not found.")
+            return await session.run_sync(search_items, query, user_id, kinds, limit, offset)
+
+    async def update_quantity(self, list_name, item_name, quantity):
+        async with self.Session.begin() as session:
+            item_id = self._list_item_id_select(list_name, item_name).scalar_subquery()
+            await session.execute(
+                update(ListItem).where(ListItem.id == item_id).values(quantity=quantity),
+                execution_options={"synchronize_session": False},
+            )
+
+    async def remove_list_item(self, list_name, item_name):
+        async with self.Session.begin() as session:
+            item_id = self._list_item_id_select(list_name, item_name).scalar_subquery()
+            await session.execute(
+                update(ListItem).where(ListItem.id == item_id).values(date_removed=datetime.datetime.utcnow()),
+                execution_options={"synchronize_session": False},
+            )
+
+    async def add_action(self, username, item_name, action_type, quantity=1.0):
+        async with self.Session.begin() as session:
+            user_id = await self._get_user_id(session, username)
+            if not user_id:
+                raise ValueError(f"User {username} not found.")
+
+            list_item_id = await session.scalar(
+                select(ListItem.id)
+                .join(ListItem.list)
+                .where(List.user_id == user_id, ListItem.name == item_name)
+                .order_by(ListItem.id)
+                .limit(1)
+            )
+            if not list_item_id:
+                raise ValueError(f"ListItem {item_name} not found.")
+
+            session.add(Action(action_type=action_type, quantity=quantity, user_id=user_id, list_item_id=list_item_id))
+            await session.execute(stock_upsert(self.engine.dialect.name), {
+                "user_id": user_id,
+                "list_item_id": list_item_id,
+                "quantity": stock_delta(action_type, quantity),
+                "updated_at": datetime.datetime.utcnow(),
+            })
+
+    async def get_stock(self, username):
+        """
+        Returns the current stock of a user's items. See InventoryManager.get_stock.
+        """
+        async with self.Session() as session:
+            rows = await session.execute(
+                select(ListItem.name, Stock.quantity)
+                .join(Stock.list_item)
+                .join(ListItem.list)
+                .join(User, User.id == Stock.user_id)
+                .where(User.username == username, List.user_id == Stock.user_id, Stock.quantity > 0)
+                .order_by(ListItem.name, ListItem.id)
+            )
+            return [{"name": name, "quantity": quantity} for name, quantity in rows]
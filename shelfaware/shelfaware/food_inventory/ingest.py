@@ -0,0 +1,297 @@
+"""
+Ingestion of scanned barcodes into the inventory.
+
+Decoded barcodes are normalized to one canonical GTIN key (barcode.gtin), then resolved to a
+FoodItem through three tiers, each only asked about what the previous one missed:
+
+    memory    a barcode -> FoodItem map kept by the ingestor
+    database  FoodItem.barcode, matching every spelling of the key
+    api       Open Food Facts, whose products are written back as new FoodItems
+
+New FoodItems, the list items for a scan and their purchase actions are written in one
+transaction (InventoryManager.session_scope), so a failed write leaves none of them behind, and
+the stock table and forecasts see every scanned item. ScanIngestor.ingest runs detection of the
+next batch of images on a background thread while the current batch is resolved and written.
+"""
+
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import requests
+
+from shelfaware.barcode.gtin import gtin_variants, normalize_gtin
+from shelfaware.food_inventory.inventory import BulkInsertResult
+
+LOOKUP_TIERS = ("memory", "database", "api", "unknown")
+
+STAGES = ("detect", "resolve", "write")
+
+
+def product_description(product):
+    """
+    Describes an Open Food Facts product for FoodItem.description.
+
+    Args:
+        product (FoodProduct): The product.
+
+    Returns:
+        str: Its brands and categories, or None if it has neither.
+    """
+    parts = []
+    if product.brands:
+        parts.append("Brands: " + ", ".join(product.brands))
+    if product.categories:
+        parts.append("Categories: " + ", ".join(product.categories))
+    return "\n".join(parts) or None
+
+
+class IngestStats:
+    """
+    Counters and per-stage timing of scan ingestion.
+
+    Attributes:
+        images (int): Images run through the detector.
+        failed (int): Images that could not be decoded, e.g. corrupt or missing files.
+        scans (int): Barcodes decoded, including repeats.
+        added (int): List items created.
+        invalid (int): Barcodes that are not GTINs, e.g. QR codes.
+        lookups (dict): Distinct barcodes resolved by each tier of LOOKUP_TIERS.
+        stage_seconds (dict): Total seconds per stage. Detection overlaps the other stages in
+            ingest, so the stages can add up to more than the wall time.
+        wall_seconds (float): Wall time of ingest.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.failed = 0
+        self.scans = 0
+        self.added = 0
+        self.invalid = 0
+        self.lookups = dict.fromkeys(LOOKUP_TIERS, 0)
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.wall_seconds = 0.0
+
+    @property
+    def scans_per_second(self):
+        return self.scans / self.wall_seconds if self.wall_seconds else 0.0
+
+    def summary(self):
+        lookups = ", ".join(f"{tier} {count}" for tier, count in self.lookups.items())
+        lines = [
+            f"Ingested {self.scans} barcodes from {self.images} images ({self.failed} unreadable) into "
+            f"{self.added} list items in {self.wall_seconds:.2f}s: {self.scans_per_second:.1f} scans/sec",
+            f"  lookups: {lookups}, invalid {self.invalid}",
+        ]
+        for stage in STAGES:
+            lines.append(f"  {stage:<8} {self.stage_seconds[stage]:8.2f}s")
+        return "\n".join(lines)
+
+
+class ScanIngestor:
+    """
+    Turns scanned barcodes into list items linked to their FoodItem.
+
+    Attributes:
+        inventory (InventoryManager): The inventory written to.
+        detector (BarcodeDetector): Detects and decodes the barcodes in images, for ingest.
+        food_client (OpenFoodClient): Looks up barcodes missing from the database, or None to
+            only use FoodItems already in the database.
+        foods (dict): (FoodItem id, name) by canonical barcode key, for every barcode resolved so far.
+    """
+
+    def __init__(self, inventory, detector=None, food_client=None):
+        """
+        Initializes the ingestor.
+
+        Args:
+            inventory (InventoryManager): The inventory written to.
+            detector (BarcodeDetector): Needed by ingest only.
+            food_client (OpenFoodClient): Open Food Facts client. Defaults to None, which never
+                calls the API.
+        """
+        self.inventory = inventory
+        self.detector = detector
+        self.food_client = food_client
+        self.foods = {}
+
+    def _resolve(self, keys, stats):
+        # Returns {key: (food_id, name)} for the keys that resolve. Called inside the caller's
+        # session_scope, so new FoodItems are only flushed and commit with its list items.
+        found = {key: self.foods[key] for key in keys if key in self.foods}
+        stats.lookups["memory"] += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            spellings = {variant: key for key in missing for variant in gtin_variants(key)}
+            foods = self.inventory.get_foods_by_barcode(spellings)
+            # The lowest id over every spelling of a key
+            for barcode, food in sorted(foods.items(), key=lambda item: item[1][0]):
+                found.setdefault(spellings[barcode], food)
+            stats.lookups["database"] += len(missing) - sum(key not in found for key in missing)
+            missing = [key for key in missing if key not in found]
+
+        if missing and self.food_client is not None:
+            try:
+                products = self.food_client.fetch_products(missing)
+            except requests.RequestException:
+                # Left unresolved and not remembered, so the next scan asks again
+                products = [None] * len(missing)
+            new_foods = 0
+            for key, product in zip(missing, products):
+                if product is not None:
+                    name = product.product_name or key
+                    food_id = self.inventory.add_food_item(name, barcode=key, description=product_description(product))
+                    found[key] = (food_id, name)
+                    new_foods += 1
+            stats.lookups["api"] += new_foods
+            missing = [key for key in missing if key not in found]
+
+        stats.lookups["unknown"] += len(missing)
+        return found
+
+    def resolve(self, codes):
+        """
+        Resolves barcodes to FoodItems, writing products found on Open Food Facts to the database.
+
+        Args:
+            codes (list): Decoded barcodes, in any GTIN spelling.
+
+        Returns:
+            dict: FoodItem id by code, for the codes that resolve.
+        """
+        keys = {}
+        for code in codes:
+            try:
+                keys[code] = normalize_gtin(code)
+            except ValueError:
+                continue
+        with self.inventory.session_scope():
+            found = self._resolve(list(dict.fromkeys(keys.values())), IngestStats())
+        self.foods.update(found)
+        return {code: found[key][0] for code, key in keys.items() if key in found}
+
+    def add_scans(self, username, list_name, codes, category_name="Uncategorized", stats=None):
+        """
+        Adds one list item per distinct scanned product, with the number of scans as quantity.
+
+        Each item is recorded as a purchase of that quantity, so it counts towards the user's stock.
+        New FoodItems, the list items and their actions are written in one transaction.
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): The list the items go on.
+            codes (list): Decoded barcodes, in any GTIN spelling.
+            category_name (str): Category of the new items, created if missing. Defaults to
+                "Uncategorized".
+            stats (IngestStats): Counters to add to. Defaults to a new IngestStats.
+
+        Returns:
+            BulkInsertResult: The number of list items inserted, and (code index, message) errors
+                for barcodes that are invalid or that no tier could resolve.
+
+        Raises:
+            ValueError: If the list does not exist.
+        """
+        stats = stats or IngestStats()
+        result = BulkInsertResult()
+        inventory = self.inventory
+        stats.scans += len(codes)
+
+        start = time.perf_counter()
+        keys = []
+        for index, code in enumerate(codes):
+            try:
+                keys.append((index, normalize_gtin(code)))
+            except ValueError as e:
+                stats.invalid += 1
+                result.errors.append((index, str(e)))
+        if not keys:
+            return result
+
+        # Checked before any lookup, so a mistyped list name never reaches Open Food Facts
+        if list_name not in inventory.get_user_lists(username):
+            raise ValueError(f"List {list_name} not found for user {username}.")
+
+        counts = Counter(key for _, key in keys)
+        with inventory.session_scope():
+            found = self._resolve(list(counts), stats)
+            resolved = time.perf_counter()
+            stats.stage_seconds["resolve"] += resolved - start
+
+            items = [
+                {"item_name": found[key][1], "quantity": float(count), "food_id": found[key][0]}
+                for key, count in counts.items() if key in found
+            ]
+            inventory.add_purchased_items(username, list_name, items, category_name)
+        stats.stage_seconds["write"] += time.perf_counter() - resolved
+
+        # Only remembered once committed, so a rollback cannot leave ids of discarded rows behind
+        self.foods.update(found)
+        result.inserted = len(items)
+        stats.added += len(items)
+        result.errors.extend((index, f"No product found for barcode {codes[index]}.")
+                             for index, key in keys if key not in found)
+        return result
+
+    def _detect(self, images):
+        start = time.perf_counter()
+        try:
+            barcodes = self.detector.extract_and_decode_batch(images, batch_size=len(images))
+        except ValueError:
+            # One undecodable image fails the whole batch, so scan them one by one to find it
+            barcodes = [self._detect_one(image) for image in images]
+        return barcodes, time.perf_counter() - start
+
+    def _detect_one(self, image):
+        try:
+            return self.detector.extract_and_decode_batch([image], batch_size=1)[0]
+        except ValueError:
+            # None marks an image that could not be decoded
+            return None
+
+    def ingest(self, images, username, list_name, category_name="Uncategorized", batch_size=8):
+        """
+        Scans images and adds the products of their barcodes to a list.
+
+        Images are detected in batches on a background thread, one batch ahead of the batch
+        being resolved and written, so the model runs while the database and Open Food Facts are
+        being waited on. Each batch is written in its own transaction. Images that cannot be
+        decoded are counted in IngestStats.failed and skipped.
+
+        Args:
+            images (iterable): File paths, encoded image bytes, cv2 images or PIL Images.
+            username (str): Owner of the list.
+            list_name (str): The list the items go on.
+            category_name (str): Category of the new items. Defaults to "Uncategorized".
+            batch_size (int): Images per detection batch. Defaults to 8.
+
+        Returns:
+            IngestStats: Counters and per-stage timing.
+        """
+        if self.detector is None:
+            raise ValueError("No detector configured.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+
+        stats = IngestStats()
+        start = time.perf_counter()
+        images = iter(images)
+        with ThreadPoolExecutor(1, thread_name_prefix="ingest-detect") as executor:
+            batch = list(islice(images, batch_size))
+            pending = executor.submit(self._detect, batch) if batch else None
+            while pending is not None:
+                barcodes, detect_seconds = pending.result()
+                stats.images += len(barcodes)
+                stats.failed += sum(image_barcodes is None for image_barcodes in barcodes)
+                stats.stage_seconds["detect"] += detect_seconds
+
+                batch = list(islice(images, batch_size))
+                pending = executor.submit(self._detect, batch) if batch else None
+
+                codes = [data for image_barcodes in barcodes if image_barcodes for _, data in image_barcodes]
+                self.add_scans(username, list_name, codes, category_name, stats)
+
+        stats.wall_seconds = time.perf_counter() - start
+        return stats
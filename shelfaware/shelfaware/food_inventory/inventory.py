@@ -1,91 +1,826 @@
+import base64
 import datetime
-from sqlalchemy.orm import sessionmaker
-from shelfaware.food_inventory.models import User, List, Category, ListItem, FoodItem, Action, get_engine
+from contextlib import contextmanager
+from sqlalchemy import DateTime, delete, func, insert, literal, select, tuple_
+from sqlalchemy.orm import scoped_session, sessionmaker
+from shelfaware.food_inventory.analytics import ActionHistory, forecast, history_query
+from shelfaware.food_inventory.search import SEARCH_KINDS, search as search_items
+from shelfaware.food_inventory.models import (
+    User, List, Category, ListItem, FoodItem, Action, Stock, get_engine, stock_delta, stock_delta_expression, stock_upsert
+)
+
+# Keeps IN (...) lists and executemany batches well under SQLite's bound parameter limit
+BATCH_SIZE = 500
+
+
+def _chunks(values, size=BATCH_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+# Columns list item queries can return, by field name. Only the requested columns are selected,
+# so no ORM objects are built, and FoodItem.image is never loaded.
+ITEM_FIELDS = {
+    "id": ListItem.id,
+    "name": ListItem.name,
+    "quantity": ListItem.quantity,
+    "date_added": ListItem.date_added,
+    "category": Category.name,
+    "food_id": ListItem.food_id,
+    "food_name": FoodItem.name,
+    "barcode": FoodItem.barcode,
+}
+DEFAULT_ITEM_FIELDS = ("name", "quantity")
+
+
+def check_item_fields(fields):
+    """
+    Checks that fields is a non-empty list of ITEM_FIELDS names.
+
+    Args:
+        fields (tuple): The field names.
+
+    Raises:
+        ValueError: If it is empty or has an unknown name.
+    """
+    unknown = [field for field in fields if field not in ITEM_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields {unknown}, expected some of {', '.join(ITEM_FIELDS)}.")
+
+
+def encode_cursor(date_added, item_id):
+    """
+    Encodes the position after a list item as an opaque page cursor.
+
+    Args:
+        date_added (datetime): When the last item of the page was added.
+        item_id (int): Its id, which breaks ties between items added at the same time.
+
+    Returns:
+        str: A URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(f"{date_added.isoformat()}|{item_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor from encode_cursor.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        tuple: (date_added, item_id).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        date_added, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.datetime.fromisoformat(date_added), int(item_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}.") from e
+
+
+def active_items_select(list_id, fields=DEFAULT_ITEM_FIELDS, cursor=None, limit=None):
+    """
+    Builds the query for the items still on a list, in (date_added, id) order.
+
+    Pages are read with keyset pagination: the next page starts after the (date_added, id) of
+    the last row, which the ix_list_items_active index finds directly however deep the page is,
+    where OFFSET would read and discard every earlier row.
+
+    Args:
+        list_id: The list id, or a scalar subquery returning it.
+        fields (tuple): Names from ITEM_FIELDS to select. Categories and foods are only joined
+            when one of their fields is requested.
+        cursor (str): Start after this encode_cursor position. Defaults to the first item.
+        limit (int): Maximum number of rows. Defaults to all of them.
+
+    Returns:
+        Select: Rows of the requested fields, followed by date_added and id for the next cursor.
+
+    Raises:
+        ValueError: If a field is unknown or the cursor is malformed.
+    """
+    check_item_fields(fields)
+    statement = (
+        select(*[ITEM_FIELDS[field].label(field) for field in fields],
+               ListItem.date_added.label("_date_added"), ListItem.id.label("_id"))
+        .select_from(ListItem)
+        .where(ListItem.list_id == list_id, ListItem.date_removed.is_(None))
+        .order_by(ListItem.date_added, ListItem.id)
+    )
+    if "category" in fields:
+        statement = statement.outerjoin(Category, Category.id == ListItem.category_id)
+    if "food_name" in fields or "barcode" in fields:
+        statement = statement.outerjoin(FoodItem, FoodItem.id == ListItem.food_id)
+    if cursor is not None:
+        date_added, item_id = decode_cursor(cursor)
+        statement = statement.where(
+            tuple_(ListItem.date_added, ListItem.id) > tuple_(literal(date_added, DateTime()), literal(item_id))
+        )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def item_dicts(rows, fields):
+    """
+    Turns rows from active_items_select into dicts of the requested fields.
+
+    Args:
+        rows (iterable): The rows.
+        fields (tuple): The fields the query was built with.
+
+    Returns:
+        list: One dict per row, without the trailing cursor columns.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class BulkInsertResult:
+    """
+    Outcome of a bulk insert.
+
+    Attributes:
+        inserted (int): Number of rows inserted.
+        errors (list): (row index, error message) tuples for the rows that were skipped.
+    """
+
+    def __init__(self, inserted=0, errors=None):
+        self.inserted = inserted
+        self.errors = errors or []
+
+    def __repr__(self):
+        return f"<BulkInsertResult(inserted={self.inserted}, errors={len(self.errors)})>"
+
 
 class InventoryManager:
-    def __init__(self):
-        self.engine = get_engine()
+    def __init__(self, engine=None):
+        self.engine = engine or get_engine()
         self.Session = sessionmaker(bind=self.engine)
-        self.session = self.Session()
+        # Each thread gets its own session, so one manager can be shared by server worker threads
+        self.session = scoped_session(self.Session)
+
+        # Users and categories rarely change, so their ids are cached by name
+        self._user_ids = {}
+        self._category_ids = {}
+
+    @contextmanager
+    def session_scope(self):
+        """
+        Unit of work for one request: the manager calls made inside it share one transaction,
+        which commits when the scope exits and rolls back as a whole on error. The calling
+        thread's session and its connection are always released back to the pool.
+
+        Inside a scope, methods flush their changes instead of committing them. A nested scope
+        joins the outer one.
+        """
+        if self.session.info.get("in_scope"):
+            yield self.session
+            return
+
+        self.session.info["in_scope"] = True
+        try:
+            yield self.session
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            # Ids cached during the scope may belong to rows that were just rolled back
+            self._user_ids.clear()
+            self._category_ids.clear()
+            raise
+        finally:
+            self.session.remove()
+
+    def _commit(self):
+        # Inside session_scope the scope commits, so earlier calls can still be rolled back
+        if self.session.info.get("in_scope"):
+            self.session.flush()
+        else:
+            self.session.commit()
+
+    def _rollback(self):
+        # Inside session_scope the error propagates and the scope rolls back the whole unit
+        if not self.session.info.get("in_scope"):
+            self.session.rollback()
+
+    def _get_user_id(self, username):
+        user_id = self._user_ids.get(username)
+        if user_id is None:
+            user_id = self.session.query(User.id).filter_by(username=username).scalar()
+            if user_id is not None:
+                self._user_ids[username] = user_id
+        return user_id
+
+    def _get_category_id(self, category_name):
+        category_id = self._category_ids.get(category_name)
+        if category_id is None:
+            category_id = self.session.query(Category.id).filter_by(name=category_name).scalar()
+            if category_id is not None:
+                self._category_ids[category_name] = category_id
+        return category_id
+
+    def _list_id_query(self, username, list_name):
+        return (
+            self.session.query(List.id)
+            .join(List.user)
+            .filter(User.username == username, List.name == list_name)
+            .order_by(List.id)
+            .limit(1)
+        )
+
+    def _list_item_id_query(self, list_name, item_name):
+        return (
+            self.session.query(ListItem.id)
+            .join(ListItem.list)
+            .filter(ListItem.name == item_name, List.name == list_name)
+            .order_by(ListItem.id)
+            .limit(1)
+        )
+
+    def _resolve_user_ids(self, usernames):
+        missing = {username for username in usernames if username not in self._user_ids}
+        for chunk in _chunks(missing):
+            rows = self.session.query(User.id, User.username).filter(User.username.in_(chunk))
+            self._user_ids.update({username: user_id for user_id, username in rows})
+        return {username: self._user_ids[username] for username in usernames if username in self._user_ids}
+
+    def _resolve_category_ids(self, category_names):
+        missing = {name for name in category_names if name not in self._category_ids}
+        for chunk in _chunks(missing):
+            rows = self.session.query(Category.id, Category.name).filter(Category.name.in_(chunk))
+            self._category_ids.update({name: category_id for category_id, name in rows})
+        return {name: self._category_ids[name] for name in category_names if name in self._category_ids}
+
+    def _resolve_first_ids(self, column, names):
+        # Lowest id per name, matching the .first() lookups of the single-row methods
+        ids = {}
+        model = column.class_
+        for chunk in _chunks(set(names)):
+            for row_id, name in self.session.query(model.id, column).filter(column.in_(chunk)).order_by(model.id):
+                ids.setdefault(name, row_id)
+        return ids
+
+    def _resolve_user_item_ids(self, user_ids, names):
+        # Lowest id per (user id, item name) among the items on each user's own lists
+        ids = {}
+        for user_chunk in _chunks(set(user_ids)):
+            for name_chunk in _chunks(set(names)):
+                rows = (
+                    self.session.query(ListItem.id, List.user_id, ListItem.name)
+                    .join(ListItem.list)
+                    .filter(List.user_id.in_(user_chunk), ListItem.name.in_(name_chunk))
+                    .order_by(ListItem.id)
+                )
+                for row_id, user_id, name in rows:
+                    ids.setdefault((user_id, name), row_id)
+        return ids
 
     def add_user(self, username):
         user = User(username=username)
         self.session.add(user)
-        self.session.commit()
+        self.session.flush()
+        self._commit()
+        # Cached after the commit, so a failed commit leaves no id behind
+        self._user_ids[username] = user.id
 
     def add_list(self, username, list_name):
-        user = self.session.query(User).filter_by(username=username).first()
-        if not user:
+        user_id = self._get_user_id(username)
+        if not user_id:
             raise ValueError(f"User {username} not found.")
         
-        user_list = List(name=list_name, user=user)
+        user_list = List(name=list_name, user_id=user_id)
         self.session.add(user_list)
-        self.session.commit()
+        self._commit()
 
     def add_category(self, category_name):
         # Check if category already exists
-        existing_category = self.session.query(Category).filter_by(name=category_name).first()
-        if not existing_category:
+        if self._get_category_id(category_name) is None:
             category = Category(name=category_name)
             self.session.add(category)
-            self.session.commit()
+            self.session.flush()
+            self._commit()
+            self._category_ids[category_name] = category.id
+
+    def add_food_item(self, name, barcode=None, description=None, image_hash=None):
+        food = FoodItem(name=name, barcode=barcode, description=description, image_hash=image_hash)
+        self.session.add(food)
+        self.session.flush()
+        food_id = food.id
+        self._commit()
+        return food_id
+
+    def get_foods_by_barcode(self, barcodes):
+        """
+        Looks up food items by barcode.
 
+        Args:
+            barcodes (iterable): Barcodes, compared with FoodItem.barcode as stored.
+
+        Returns:
+            dict: (FoodItem id, name) by barcode, for the barcodes found. The lowest id wins when
+                several food items share a barcode.
+        """
+        foods = {}
+        for chunk in _chunks(set(barcodes)):
+            rows = (
+                self.session.query(FoodItem.id, FoodItem.name, FoodItem.barcode)
+                .filter(FoodItem.barcode.in_(chunk))
+                .order_by(FoodItem.id)
+            )
+            for food_id, name, barcode in rows:
+                foods.setdefault(barcode, (food_id, name))
+        return foods
 
     def add_list_item(self, username, list_name, item_name, quantity, category_name, food_name=None):
-        user = self.session.query(User).filter_by(username=username).first()
-        user_list = self.session.query(List).filter_by(name=list_name, user=user).first()
-        category = self.session.query(Category).filter_by(name=category_name).first()
-        food = self.session.query(FoodItem).filter_by(name=food_name).first() if food_name else None
+        list_id = self._list_id_query(username, list_name).scalar()
+        category_id = self._get_category_id(category_name)
+        food_id = self.session.query(FoodItem.id).filter_by(name=food_name).limit(1).scalar() if food_name else None
         
-        if not user_list:
+        if not list_id:
             raise ValueError(f"List {list_name} not found for user {username}.")
-        if not category:
+        if not category_id:
             raise ValueError(f"Category {category_name} not found.")
         
         list_item = ListItem(
             name=item_name,
             quantity=quantity,
-            list=user_list,
-            category=category,
-            food=food
+            list_id=list_id,
+            category_id=category_id,
+            food_id=food_id
         )
         self.session.add(list_item)
-        self.session.commit()
+        self._commit()
 
     def get_user_lists(self, username):
-        user = self.session.query(User).filter_by(username=username).first()
-        if user:
-            return [user_list.name for user_list in user.lists]
-        return []
+        rows = (
+            self.session.query(List.name)
+            .join(List.user)
+            .filter(User.username == username)
+            .order_by(List.id)
+        )
+        return [name for name, in rows]
 
     def get_list_items(self, username, list_name):
-        user = self.session.query(User).filter_by(username=username).first()
-        user_list = self.session.query(List).filter_by(name=list_name, user=user).first()
-        if user_list:
-            return [list_item.name for list_item in user_list.list_items]
-        return []
+        # One statement, reading only the names instead of hydrating every ListItem
+        list_id = self._list_id_query(username, list_name).scalar_subquery()
+        rows = self.session.query(ListItem.name).filter(ListItem.list_id == list_id).order_by(ListItem.id)
+        return [name for name, in rows]
+
+    def get_active_items(self, username, list_name):
+        """
+        Returns the name and quantity of the items still on a list (not removed).
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): Name of the list.
+
+        Returns:
+            list: Dicts with "name" and "quantity", oldest first.
+        """
+        list_id = self._list_id_query(username, list_name).scalar_subquery()
+        rows = self.session.execute(active_items_select(list_id))
+        return item_dicts(rows, DEFAULT_ITEM_FIELDS)
+
+    def get_active_items_page(self, username, list_name, limit=100, cursor=None, fields=DEFAULT_ITEM_FIELDS):
+        """
+        Returns one page of the items still on a list, with keyset pagination.
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): Name of the list.
+            limit (int): Items per page. Defaults to 100. None returns every item after the
+                cursor, with no next cursor.
+            cursor (str): The next_cursor of the previous page. Defaults to the first page.
+            fields (tuple): Names from ITEM_FIELDS to return. Defaults to name and quantity.
+
+        Returns:
+            tuple: (items, next_cursor): dicts of the requested fields, oldest first, and the
+                cursor of the next page, or None on the last page.
+
+        Raises:
+            ValueError: If a field is unknown or the cursor is malformed.
+        """
+        list_id = self._list_id_query(username, list_name).scalar_subquery()
+        statement = active_items_select(list_id, fields, cursor, None if limit is None else limit + 1)
+        rows = self.session.execute(statement).all()
+        self._commit()
+        if limit is None or len(rows) <= limit:
+            return item_dicts(rows, fields), None
+        return item_dicts(rows[:limit], fields), encode_cursor(*rows[limit - 1][-2:])
+
+    def iter_active_items(self, username, list_name, fields=DEFAULT_ITEM_FIELDS, batch_size=1000):
+        """
+        Yields the items still on a list, reading batch_size rows at a time from the database.
+
+        The rows are streamed with yield_per, so memory stays constant however long the list is.
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): Name of the list.
+            fields (tuple): Names from ITEM_FIELDS to return. Defaults to name and quantity.
+            batch_size (int): Rows fetched per round trip.
+
+        Yields:
+            dict: The requested fields of each item, oldest first.
+        """
+        list_id = self._list_id_query(username, list_name).scalar_subquery()
+        rows = self.session.execute(active_items_select(list_id, fields), execution_options={"yield_per": batch_size})
+        try:
+            for partition in rows.partitions():
+                yield from item_dicts(partition, fields)
+        finally:
+            rows.close()
+            self._commit()
 
     def update_quantity(self, list_name, item_name, quantity):
-        list_item = self.session.query(ListItem).filter_by(name=item_name).first()
-        if list_item and list_item.list.name == list_name:
-            list_item.quantity = quantity
-            self.session.commit()
+        item_id = self._list_item_id_query(list_name, item_name).scalar_subquery()
+        updated = (
+            self.session.query(ListItem)
+            .filter(ListItem.id == item_id)
+            .update({ListItem.quantity: quantity}, synchronize_session=False)
+        )
+        if updated:
+            self._commit()
     
     def remove_list_item(self, list_name, item_name):
-        list_item = self.session.query(ListItem).filter_by(name=item_name).first()
-        if list_item and list_item.list.name == list_name:
-            list_item.date_removed = datetime.datetime.utcnow()  # Mark as removed
-            self.session.commit()
+        item_id = self._list_item_id_query(list_name, item_name).scalar_subquery()
+        removed = (
+            self.session.query(ListItem)
+            .filter(ListItem.id == item_id)
+            .update({ListItem.date_removed: datetime.datetime.utcnow()}, synchronize_session=False)  # Mark as removed
+        )
+        if removed:
+            self._commit()
 
     def add_action(self, username, item_name, action_type, quantity=1.0):
-        user = self.session.query(User).filter_by(username=username).first()
-        list_item = self.session.query(ListItem).filter_by(name=item_name).first()
-
-        if not user:
+        user_id = self._get_user_id(username)
+        if not user_id:
             raise ValueError(f"User {username} not found.")
-        if not list_item:
+
+        # Only the user's own lists, so a same-named item of another user is never updated
+        list_item_id = (
+            self.session.query(ListItem.id)
+            .join(ListItem.list)
+            .filter(List.user_id == user_id, ListItem.name == item_name)
+            .order_by(ListItem.id)
+            .limit(1)
+            .scalar()
+        )
+        if not list_item_id:
             raise ValueError(f"ListItem {item_name} not found.")
 
-        action = Action(action_type=action_type, quantity=quantity, user=user, list_item=list_item)
+        action = Action(action_type=action_type, quantity=quantity, user_id=user_id, list_item_id=list_item_id)
         self.session.add(action)
-        self.session.commit()
+        try:
+            self._update_stock({(user_id, list_item_id): stock_delta(action_type, quantity)})
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+
+    def _update_stock(self, deltas):
+        # Applies {(user_id, list_item_id): delta} to the stock table in the current transaction
+        now = datetime.datetime.utcnow()
+        values = [
+            {"user_id": user_id, "list_item_id": list_item_id, "quantity": delta, "updated_at": now}
+            for (user_id, list_item_id), delta in deltas.items()
+        ]
+        statement = stock_upsert(self.engine.dialect.name)
+        for chunk in _chunks(values):
+            self.session.execute(statement, chunk)
+
+    def get_stock(self, username):
+        """
+        Returns the current stock of a user's items, read from the stock table.
+
+        Args:
+            username (str): The user.
+
+        Returns:
+            list: Dicts with "name" and "quantity" for the items with stock left, by name.
+        """
+        rows = (
+            self.session.query(ListItem.name, Stock.quantity)
+            .join(Stock.list_item)
+            .join(ListItem.list)
+            .join(User, User.id == Stock.user_id)
+            .filter(User.username == username, List.user_id == Stock.user_id, Stock.quantity > 0)
+            .order_by(ListItem.name, ListItem.id)
+        )
+        return [{"name": name, "quantity": quantity} for name, quantity in rows]
+
+    def get_forecast(self, username, now=None, window_days=90.0):
+        """
+        Forecasts when each of a user's items runs out, from their action log.
+
+        The actions are loaded with one query into arrays and analyzed in a single vectorized
+        pass, see analytics.forecast.
+
+        Args:
+            username (str): The user.
+            now (float): Current time in seconds since the Unix epoch. Defaults to now.
+            window_days (float): Days of history consumption rates are computed over.
+
+        Returns:
+            Forecast: Stock, daily rate and days until empty per item, with item names.
+        """
+        rows = self.session.execute(history_query(self.engine.dialect.name, username)).all()
+        result = forecast(ActionHistory.from_rows(rows), now=now, window_days=window_days)
+        for chunk in _chunks(set(result.list_item_ids.tolist())):
+            result.names.update(self.session.query(ListItem.id, ListItem.name).filter(ListItem.id.in_(chunk)))
+        self._commit()
+        return result
+
+    def search(self, query, username=None, kinds=SEARCH_KINDS, limit=20, offset=0):
+        """
+        Searches food items and list items by name, and foods by description, brands and categories.
+
+        Prefixes match, so partial words work as the user types, and queries with no match fall
+        back to names with similar spelling. See search.search.
+
+        Args:
+            query (str): What the user typed.
+            username (str): Only search this user's list items. Defaults to every list.
+            kinds (tuple): "food" and/or "list_item". Defaults to both.
+            limit (int): Results per page.
+            offset (int): Results to skip, for later pages.
+
+        Returns:
+            SearchPage: The page of results and the offset of the next one.
+        """
+        user_id = None
+        if username is not None:
+            user_id = self._get_user_id(username)
+            if not user_id:
+                raise ValueError(f"User {username} not found.")
+        page = search_items(self.session, query, user_id, kinds, limit, offset)
+        self._commit()
+        return page
+
+    def _stock_from_actions(self):
+        return (
+            select(Action.user_id, Action.list_item_id, func.sum(stock_delta_expression()).label("quantity"))
+            .where(Action.user_id.is_not(None), Action.list_item_id.is_not(None))
+            .group_by(Action.user_id, Action.list_item_id)
+        )
+
+    def rebuild_stock(self):
+        """
+        Recomputes the stock table from the action log, replacing its contents.
+
+        The log is aggregated by the database in a single INSERT ... SELECT, so no action rows
+        are loaded into Python.
+
+        Returns:
+            int: The number of stock rows written.
+        """
+        try:
+            self.session.execute(delete(Stock))
+            aggregate = self._stock_from_actions().add_columns(literal(datetime.datetime.utcnow(), DateTime()))
+            self.session.execute(
+                insert(Stock).from_select(["user_id", "list_item_id", "quantity", "updated_at"], aggregate)
+            )
+            count = self.session.query(func.count()).select_from(Stock).scalar()
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return count
+
+    def verify_stock(self, tolerance=1e-6):
+        """
+        Compares the stock table with the stock recomputed from the action log.
+
+        The recomputed stock is streamed from the database, so memory grows with the number of
+        stock rows rather than the number of actions.
+
+        Args:
+            tolerance (float): Largest difference accepted, for floating point sums.
+
+        Returns:
+            list: (user_id, list_item_id, expected, actual) tuples for every row that differs,
+                with actual None for missing rows. Empty when the table is consistent.
+        """
+        actual = {(user_id, item_id): quantity for user_id, item_id, quantity in
+                  self.session.query(Stock.user_id, Stock.list_item_id, Stock.quantity)}
+        mismatches = []
+        rows = self.session.execute(self._stock_from_actions(), execution_options={"yield_per": 10000})
+        for user_id, list_item_id, expected in rows:
+            quantity = actual.pop((user_id, list_item_id), None)
+            if quantity is None:
+                if abs(expected) > tolerance:
+                    mismatches.append((user_id, list_item_id, expected, None))
+            elif abs(quantity - expected) > tolerance:
+                mismatches.append((user_id, list_item_id, expected, quantity))
+        # Rows with no actions at all should not exist
+        mismatches.extend((user_id, item_id, 0.0, quantity) for (user_id, item_id), quantity in actual.items()
+                          if abs(quantity) > tolerance)
+        self._commit()
+        return mismatches
+
+    def add_list_items_bulk(self, items, batch_size=BATCH_SIZE):
+        """
+        Adds many list items in a single transaction.
+
+        All users, lists, categories and foods referenced by the rows are looked up once, then the
+        rows are inserted in executemany batches. Rows that reference something missing are skipped
+        and reported instead of aborting the whole import.
+
+        Args:
+            items (iterable): Dicts with the arguments of add_list_item: username, list_name, item_name,
+                quantity, category_name and optionally food_name.
+            batch_size (int): Rows per INSERT batch.
+
+        Returns:
+            BulkInsertResult: The number of rows inserted and the errors of the skipped rows.
+        """
+        items = list(items)
+        result = BulkInsertResult()
+
+        user_ids = self._resolve_user_ids({item.get("username") for item in items})
+        category_ids = self._resolve_category_ids({item.get("category_name") for item in items})
+        food_ids = self._resolve_first_ids(FoodItem.name, {item["food_name"] for item in items if item.get("food_name")})
+
+        list_ids = {}
+        list_names = {item.get("list_name") for item in items}
+        for chunk in _chunks(set(user_ids.values())):
+            rows = (
+                self.session.query(List.id, List.user_id, List.name)
+                .filter(List.user_id.in_(chunk), List.name.in_(list_names))
+                .order_by(List.id)
+            )
+            for list_id, user_id, name in rows:
+                list_ids.setdefault((user_id, name), list_id)
+
+        values = []
+        for index, item in enumerate(items):
+            username, list_name = item.get("username"), item.get("list_name")
+            list_id = list_ids.get((user_ids.get(username), list_name))
+            category_id = category_ids.get(item.get("category_name"))
+            food_name = item.get("food_name")
+
+            if not item.get("item_name"):
+                result.errors.append((index, "Missing item_name."))
+            elif not list_id:
+                result.errors.append((index, f"List {list_name} not found for user {username}."))
+            elif not category_id:
+                result.errors.append((index, f"Category {item.get('category_name')} not found."))
+            elif food_name and food_name not in food_ids:
+                result.errors.append((index, f"FoodItem {food_name} not found."))
+            else:
+                try:
+                    quantity = float(item.get("quantity", 1.0))
+                except (TypeError, ValueError):
+                    result.errors.append((index, f"Invalid quantity {item.get('quantity')!r}."))
+                    continue
+                values.append({
+                    "name": item["item_name"],
+                    "quantity": quantity,
+                    "list_id": list_id,
+                    "category_id": category_id,
+                    "food_id": food_ids.get(food_name),
+                })
+
+        self._insert_batches(ListItem, values, batch_size)
+        result.inserted = len(values)
+        return result
+
+    def add_actions_bulk(self, actions, batch_size=BATCH_SIZE):
+        """
+        Adds many actions in a single transaction, updating the stock table in the same transaction
+        with one upsert per affected item.
+
+        Args:
+            actions (iterable): Dicts with the arguments of add_action: username, item_name,
+                action_type and optionally quantity.
+            batch_size (int): Rows per INSERT batch.
+
+        Returns:
+            BulkInsertResult: The number of rows inserted and the errors of the skipped rows.
+        """
+        actions = list(actions)
+        result = BulkInsertResult()
+
+        user_ids = self._resolve_user_ids({action.get("username") for action in actions})
+        list_item_ids = self._resolve_user_item_ids(
+            user_ids.values(), {action.get("item_name") for action in actions}
+        )
+
+        values = []
+        for index, action in enumerate(actions):
+            user_id = user_ids.get(action.get("username"))
+            list_item_id = list_item_ids.get((user_id, action.get("item_name")))
+
+            if not user_id:
+                result.errors.append((index, f"User {action.get('username')} not found."))
+            elif not list_item_id:
+                result.errors.append((index, f"ListItem {action.get('item_name')} not found."))
+            elif not action.get("action_type"):
+                result.errors.append((index, "Missing action_type."))
+            else:
+                try:
+                    quantity = float(action.get("quantity", 1.0))
+                except (TypeError, ValueError):
+                    result.errors.append((index, f"Invalid quantity {action.get('quantity')!r}."))
+                    continue
+                values.append({
+                    "action_type": action["action_type"],
+                    "quantity": quantity,
+                    "user_id": user_id,
+                    "list_item_id": list_item_id,
+                })
+
+        deltas = {}
+        for value in values:
+            key = (value["user_id"], value["list_item_id"])
+            deltas[key] = deltas.get(key, 0.0) + stock_delta(value["action_type"], value["quantity"])
+
+        try:
+            for chunk in _chunks(values, batch_size):
+                self.session.execute(insert(Action), chunk)
+            self._update_stock(deltas)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        result.inserted = len(values)
+        return result
+
+    def add_purchased_items(self, username, list_name, items, category_name="Uncategorized",
+                            batch_size=BATCH_SIZE):
+        """
+        Adds purchased products to a list in a single transaction: one list item per product, a
+        purchase action for its quantity, and the matching stock update.
+
+        Changes already flushed in the session, such as new FoodItems the items link to, are
+        committed in the same transaction.
+
+        Args:
+            username (str): Owner of the list.
+            list_name (str): The list the items go on.
+            items (iterable): Dicts with item_name, quantity and optionally food_id.
+            category_name (str): Category of the items, created if missing. Defaults to
+                "Uncategorized".
+            batch_size (int): Rows per INSERT batch.
+
+        Returns:
+            list: Ids of the new list items, in input order.
+
+        Raises:
+            ValueError: If the list does not exist.
+        """
+        items = list(items)
+        user_id = self._get_user_id(username)
+        list_id = self._list_id_query(username, list_name).scalar()
+        if not list_id:
+            raise ValueError(f"List {list_name} not found for user {username}.")
+
+        try:
+            category_id = self._get_category_id(category_name)
+            if category_id is None:
+                category = Category(name=category_name)
+                self.session.add(category)
+                self.session.flush()
+                category_id = category.id
+
+            list_item_ids = []
+            for chunk in _chunks(items, batch_size):
+                list_item_ids.extend(self.session.scalars(
+                    insert(ListItem).returning(ListItem.id, sort_by_parameter_order=True),
+                    [
+                        {"name": item["item_name"], "quantity": float(item["quantity"]), "list_id": list_id,
+                         "category_id": category_id, "food_id": item.get("food_id")}
+                        for item in chunk
+                    ],
+                ))
+
+            actions = [
+                {"action_type": "purchase", "quantity": float(item["quantity"]), "user_id": user_id,
+                 "list_item_id": list_item_id}
+                for item, list_item_id in zip(items, list_item_ids)
+            ]
+            for chunk in _chunks(actions, batch_size):
+                self.session.execute(insert(Action), chunk)
+            self._update_stock({
+                (user_id, action["list_item_id"]): stock_delta("purchase", action["quantity"]) for action in actions
+            })
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        # Only cached once written, so a rollback cannot leave the id of a discarded row behind
+        self._category_ids[category_name] = category_id
+        return list_item_ids
+
+    def _insert_batches(self, model, values, batch_size):
+        try:
+            for chunk in _chunks(values, batch_size):
+                self.session.execute(insert(model), chunk)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
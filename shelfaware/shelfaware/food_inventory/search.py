@@ -0,0 +1,204 @@
+"""
+Search over food items and list items, for search-as-you-type.
+
+On SQLite, queries run against the FTS5 tables created with SEARCH_INDEX_DDL (models.py), which
+triggers keep in sync with food_items and list_items:
+
+    full_text  every word of the query must start a word of the name or description ("banana"
+               finds "Bananas"), ranked by bm25 with name matches weighted above descriptions
+    fuzzy      when nothing matches, names sharing most of the query's trigrams, for typos
+
+Other databases fall back to a case-insensitive substring scan of the names.
+"""
+
+import re
+
+from sqlalchemy import and_, func, select, text, union_all
+
+from shelfaware.food_inventory.models import FoodItem, List, ListItem
+
+SEARCH_KINDS = ("food", "list_item")
+
+# bm25 weight of a name match, relative to a description match
+NAME_WEIGHT = 10.0
+
+# Trigram matches re-ranked in Python, and the share of the query's trigrams a name must contain
+FUZZY_CANDIDATES = 200
+FUZZY_MIN_SIMILARITY = 0.5
+
+# Shorter words are ignored: a one letter prefix matches a large share of the index and is not
+# covered by the 2 and 3 character prefix indexes
+MIN_WORD_LENGTH = 2
+
+_WORD = re.compile(r"\w+")
+
+
+def match_expression(query):
+    """
+    Builds the FTS5 MATCH expression for a search box query.
+
+    Args:
+        query (str): What the user typed.
+
+    Returns:
+        str: Every word of at least MIN_WORD_LENGTH characters quoted as a prefix, or None if
+            there are none.
+    """
+    words = [word for word in _WORD.findall(query.lower()) if len(word) >= MIN_WORD_LENGTH]
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def trigrams(value):
+    """
+    Returns the lowercase trigrams of the words of a string, as the trigram tokenizer sees them.
+
+    Args:
+        value (str): The string.
+
+    Returns:
+        set: Three-character substrings of each word of three or more characters.
+    """
+    return {word[i:i + 3] for word in _WORD.findall(value.lower()) for i in range(len(word) - 2)}
+
+
+class SearchPage:
+    """
+    One page of search results.
+
+    Attributes:
+        results (list): Dicts with "kind" ("food" or "list_item"), "id" and "name", best first.
+        mode (str): "full_text", "fuzzy" or "substring", or None when nothing matched.
+        next_offset (int): Offset of the next page, or None on the last page.
+    """
+
+    def __init__(self, results, mode, next_offset=None):
+        self.results = results
+        self.mode = mode
+        self.next_offset = next_offset
+
+    def as_dict(self):
+        return {"results": self.results, "mode": self.mode, "next_offset": self.next_offset}
+
+    def __repr__(self):
+        return f"<SearchPage(mode={self.mode}, results={len(self.results)}, next_offset={self.next_offset})>"
+
+
+def _page(rows, mode, limit, offset):
+    # rows of (rowid, name), one more than the page size when there is a next page
+    results = [
+        {"kind": "list_item" if rowid % 2 else "food", "id": rowid // 2, "name": name}
+        for rowid, name in rows[:limit]
+    ]
+    return SearchPage(results, mode if results else None, offset + limit if len(rows) > limit else None)
+
+
+def _filters(table, kinds, user_id):
+    clauses = []
+    if set(kinds) == {"food"}:
+        clauses.append(f"{table}.rowid % 2 = 0")
+    elif set(kinds) == {"list_item"}:
+        clauses.append(f"{table}.rowid % 2 = 1")
+    if user_id is not None and "list_item" in kinds:
+        clauses.append(
+            f"({table}.rowid % 2 = 0 OR EXISTS (SELECT 1 FROM list_items JOIN lists ON lists.id = list_items.list_id "
+            f"WHERE list_items.id = {table}.rowid / 2 AND lists.user_id = :user_id))"
+        )
+    return "".join(f" AND {clause}" for clause in clauses)
+
+
+def _full_text(session, match, kinds, user_id, limit, offset):
+    statement = text(
+        "SELECT search_index.rowid, search_index.name FROM search_index "
+        f"WHERE search_index MATCH :match{_filters('search_index', kinds, user_id)} "
+        f"ORDER BY bm25(search_index, {NAME_WEIGHT}, 1.0), search_index.rowid LIMIT :limit OFFSET :offset"
+    )
+    return session.execute(statement, {"match": match, "user_id": user_id, "limit": limit, "offset": offset}).all()
+
+
+def _fuzzy(session, query, kinds, user_id, limit, offset):
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return []
+    statement = text(
+        "SELECT search_trigram.rowid, search_trigram.name FROM search_trigram "
+        f"WHERE search_trigram MATCH :match{_filters('search_trigram', kinds, user_id)} "
+        "ORDER BY bm25(search_trigram) LIMIT :candidates"
+    )
+    match = " OR ".join(f'"{trigram}"' for trigram in sorted(query_trigrams))
+    candidates = session.execute(
+        statement, {"match": match, "user_id": user_id, "candidates": FUZZY_CANDIDATES}
+    ).all()
+
+    scored = []
+    for rowid, name in candidates:
+        similarity = len(query_trigrams & trigrams(name)) / len(query_trigrams)
+        if similarity >= FUZZY_MIN_SIMILARITY:
+            scored.append((-similarity, len(name), rowid, name))
+    scored.sort()
+    return [(rowid, name) for _, _, rowid, name in scored[offset:offset + limit]]
+
+
+def _substring(session, words, kinds, user_id, limit, offset):
+    selects = []
+    if "food" in kinds:
+        selects.append(
+            select((FoodItem.id * 2).label("rowid"), FoodItem.name.label("name"))
+            .where(and_(*[FoodItem.name.icontains(word, autoescape=True) for word in words]))
+        )
+    if "list_item" in kinds:
+        list_items = (
+            select((ListItem.id * 2 + 1).label("rowid"), ListItem.name.label("name"))
+            .where(ListItem.date_removed.is_(None), *[ListItem.name.icontains(word, autoescape=True) for word in words])
+        )
+        if user_id is not None:
+            list_items = list_items.join(List, List.id == ListItem.list_id).where(List.user_id == user_id)
+        selects.append(list_items)
+    matches = union_all(*selects).subquery()
+    statement = (
+        select(matches.c.rowid, matches.c.name)
+        .order_by(func.length(matches.c.name), matches.c.name, matches.c.rowid)
+        .limit(limit)
+        .offset(offset)
+    )
+    return session.execute(statement).all()
+
+
+def search(session, query, user_id=None, kinds=SEARCH_KINDS, limit=20, offset=0):
+    """
+    Searches food items and list items still on a list.
+
+    Args:
+        session (Session): A synchronous session (AsyncSession.run_sync passes one).
+        query (str): What the user typed.
+        user_id (int): Only search list items on this user's lists. Defaults to every list.
+        kinds (tuple): "food" and/or "list_item". Defaults to both.
+        limit (int): Results per page. Defaults to 20.
+        offset (int): Results to skip, for later pages. Defaults to 0.
+
+    Returns:
+        SearchPage: The page of results.
+
+    Raises:
+        ValueError: If kinds, limit or offset are invalid.
+    """
+    kinds = tuple(kinds)
+    if not kinds or not set(kinds) <= set(SEARCH_KINDS):
+        raise ValueError(f"kinds must be a non-empty subset of {SEARCH_KINDS}.")
+    if limit < 1 or offset < 0:
+        raise ValueError("limit must be at least 1 and offset at least 0.")
+
+    match = match_expression(query)
+    if match is None:
+        return SearchPage([], None)
+
+    if session.get_bind().dialect.name != "sqlite":
+        words = [word for word in _WORD.findall(query.lower()) if len(word) >= MIN_WORD_LENGTH]
+        return _page(_substring(session, words, kinds, user_id, limit + 1, offset), "substring", limit, offset)
+
+    rows = _full_text(session, match, kinds, user_id, limit + 1, offset)
+    # An empty later page is the end of the full-text results, unless there were none at all
+    if rows or (offset and _full_text(session, match, kinds, user_id, 1, 0)):
+        return _page(rows, "full_text", limit, offset)
+    return _page(_fuzzy(session, query, kinds, user_id, limit + 1, offset), "fuzzy", limit, offset)
@@ -0,0 +1,107 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from shelfaware.food_inventory.analytics import ActionHistory, forecast
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Action, Base, ListItem, User, get_engine
+
+NOW = 1_700_000_000.0
+TODAY = NOW / 86400
+
+
+def history(rows):
+    # rows of (user_id, list_item_id, signed quantity, days before NOW), already sorted
+    return ActionHistory.from_rows([(user, item, delta, TODAY - days_ago) for user, item, delta, days_ago in rows])
+
+
+class TestForecast(unittest.TestCase):
+
+    def test_forecast(self):
+        result = forecast(history([
+            # Milk: bought 10, used 1 a day for the last 6 days
+            (1, 10, 10.0, 30), *[(1, 10, -1.0, day) for day in range(6, 0, -1)],
+            # Rice: bought long ago, never used
+            (1, 11, 5.0, 200),
+            # Eggs: all used up
+            (1, 12, 6.0, 20), (1, 12, -6.0, 10),
+            # Another user's milk is a separate item, and old consumption is outside the window
+            (2, 10, 4.0, 300), (2, 10, -2.0, 200), (2, 10, -1.0, 45),
+        ]), now=NOW, window_days=90)
+
+        self.assertEqual(result.list_item_ids.tolist(), [10, 11, 12, 10])
+        self.assertEqual(result.user_ids.tolist(), [1, 1, 1, 2])
+        np.testing.assert_allclose(result.stock, [4.0, 5.0, 0.0, 1.0])
+        np.testing.assert_allclose(result.daily_rate, [6 / 30, 0.0, 6 / 20, 1 / 90])
+        np.testing.assert_allclose(result.days_until_empty, [20.0, np.inf, 0.0, 90.0])
+
+    def test_shopping_list(self):
+        result = forecast(history([
+            (1, 1, 3.0, 10), (1, 1, -2.0, 5), (1, 1, -1.0, 0.5),  # out of stock
+            (1, 2, 20.0, 10), (1, 2, -5.0, 5),  # 30 days left
+            (1, 3, 6.0, 10), (1, 3, -4.0, 2),  # 5 days left
+        ]), now=NOW)
+        result.names = {1: "Bread", 2: "Flour", 3: "Milk"}
+
+        self.assertEqual(result.shopping_list(horizon_days=7, cover_days=14), [
+            {"name": "Bread", "quantity": 5.0, "days_until_empty": 0.0, "daily_rate": 0.3},
+            {"name": "Milk", "quantity": 4.0, "days_until_empty": 5.0, "daily_rate": 0.4},
+        ])
+        self.assertEqual([item["name"] for item in result.items()], ["Bread", "Milk", "Flour"])
+
+    def test_empty_history(self):
+        result = forecast(ActionHistory.from_rows([]), now=NOW)
+        self.assertEqual(len(result), 0)
+        self.assertEqual(result.items(), [])
+        self.assertEqual(result.shopping_list(), [])
+
+
+class TestGetForecast(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        engine = get_engine(f"sqlite:///{os.path.join(self.tmpdir, 'analytics.db')}")
+        Base.metadata.create_all(engine)
+        self.manager = InventoryManager(engine)
+
+    def tearDown(self):
+        self.manager.session.remove()
+        self.manager.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_forecast(self):
+        self.manager.add_user("cook")
+        self.manager.add_user("other")
+        self.manager.add_list("cook", "Pantry")
+        self.manager.add_category("Dairy")
+        self.manager.add_list_item("cook", "Pantry", "Yogurt", 1, "Dairy")
+
+        now = datetime.datetime(2026, 10, 18, 12, 0)
+        session = self.manager.Session()
+        user_id = session.query(User.id).filter_by(username="cook").scalar()
+        other_id = session.query(User.id).filter_by(username="other").scalar()
+        item_id = session.query(ListItem.id).filter_by(name="Yogurt").scalar()
+        session.add_all([
+            Action(action_type="purchase", quantity=8, user_id=user_id, list_item_id=item_id,
+                   date=now - datetime.timedelta(days=10)),
+            Action(action_type="consume", quantity=2, user_id=user_id, list_item_id=item_id,
+                   date=now - datetime.timedelta(days=4, hours=12)),
+            Action(action_type="consume", quantity=3, user_id=user_id, list_item_id=item_id,
+                   date=now - datetime.timedelta(days=1)),
+            Action(action_type="purchase", quantity=50, user_id=other_id, list_item_id=item_id, date=now),
+        ])
+        session.commit()
+        session.close()
+
+        timestamp = now.replace(tzinfo=datetime.timezone.utc).timestamp()
+        result = self.manager.get_forecast("cook", now=timestamp)
+        self.assertEqual(result.items(), [{"name": "Yogurt", "stock": 3.0, "daily_rate": 0.5, "days_until_empty": 6.0}])
+        self.assertEqual(result.shopping_list(), [
+            {"name": "Yogurt", "quantity": 4.0, "days_until_empty": 6.0, "daily_rate": 0.5},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from shelfaware.food_inventory.async_inventory import AsyncInventoryManager, get_async_engine
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+
+class TestAsyncInventoryManager(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(self.tmpdir, 'async.db')}"
+        Base.metadata.create_all(get_engine(url))
+        self.engine = get_async_engine(url)
+        self.manager = AsyncInventoryManager(self.engine)
+
+        await self.manager.add_user("testuser")
+        await self.manager.add_list("testuser", "Groceries")
+        await self.manager.add_category("Fruits")
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def test_async_driver(self):
+        self.assertEqual(self.engine.url.drivername, "sqlite+aiosqlite")
+
+    async def test_add_and_get_items(self):
+        await self.manager.add_list_item("testuser", "Groceries", "Apple", 5, "Fruits")
+        await self.manager.add_list_item("testuser", "Groceries", "Banana", 2, "Fruits")
+
+        self.assertEqual(await self.manager.get_user_lists("testuser"), ["Groceries"])
+        self.assertEqual(await self.manager.get_list_items("testuser", "Groceries"), ["Apple", "Banana"])
+
+        await self.manager.update_quantity("Groceries", "Apple", 3)
+        await self.manager.remove_list_item("Groceries", "Banana")
+        self.assertEqual(
+            await self.manager.get_active_items("testuser", "Groceries"),
+            [{"name": "Apple", "quantity": 3.0}],
+        )
+
+    async def test_missing_list_or_user(self):
+        with self.assertRaises(ValueError):
+            await self.manager.add_list_item("testuser", "Nope", "Apple", 1, "Fruits")
+        with self.assertRaises(ValueError):
+            await self.manager.add_list("nobody", "Groceries")
+
+    async def test_failed_commit_caches_no_ids(self):
+        def fail_commit(session):
+            raise RuntimeError("Commit failed.")
+
+        event.listen(Session, "before_commit", fail_commit)
+        try:
+            with self.assertRaises(RuntimeError):
+                await self.manager.add_user("ghost")
+            with self.assertRaises(RuntimeError):
+                await self.manager.add_category("Vegetables")
+        finally:
+            event.remove(Session, "before_commit", fail_commit)
+
+        # Neither row was committed, so neither name resolves
+        with self.assertRaises(ValueError):
+            await self.manager.add_list("ghost", "Groceries")
+        with self.assertRaises(ValueError):
+            await self.manager.add_list_item("testuser", "Groceries", "Carrot", 1, "Vegetables")
+
+    async def test_concurrent_writes(self):
+        await asyncio.gather(*(
+            self.manager.add_list_item("testuser", "Groceries", f"Item {i}", i, "Fruits") for i in range(20)
+        ))
+        self.assertEqual(len(await self.manager.get_active_items("testuser", "Groceries")), 20)
+
+        # The sync manager sees the same rows
+        sync_manager = InventoryManager(get_engine(str(self.engine.url).replace("+aiosqlite", "")))
+        self.assertEqual(len(sync_manager.get_list_items("testuser", "Groceries")), 20)
+
+    async def test_add_action_updates_stock(self):
+        await self.manager.add_list_item("testuser", "Groceries", "Pear", 1, "Fruits")
+        await self.manager.add_action("testuser", "Pear", "purchase", 2)
+        await self.manager.add_action("testuser", "Pear", "consume", 0.5)
+
+        self.assertEqual(await self.manager.get_stock("testuser"), [{"name": "Pear", "quantity": 1.5}])
+        sync_manager = InventoryManager(get_engine(str(self.engine.url).replace("+aiosqlite", "")))
+        self.assertEqual(sync_manager.verify_stock(), [])
+
+    async def test_add_action_uses_the_users_own_item(self):
+        await self.manager.add_user("otheruser")
+        await self.manager.add_list("otheruser", "Groceries")
+        await self.manager.add_list_item("otheruser", "Groceries", "Plum", 1, "Fruits")
+        await self.manager.add_list_item("testuser", "Groceries", "Plum", 1, "Fruits")
+        await self.manager.add_list_item("testuser", "Groceries", "Fig", 1, "Fruits")
+
+        await self.manager.add_action("testuser", "Plum", "purchase", 3)
+
+        self.assertEqual(await self.manager.get_stock("testuser"), [{"name": "Plum", "quantity": 3.0}])
+        self.assertEqual(await self.manager.get_stock("otheruser"), [])
+        with self.assertRaises(ValueError):
+            await self.manager.add_action("otheruser", "Fig", "purchase")
+
+    async def test_active_item_pages_and_batches(self):
+        for i in range(5):
+            await self.manager.add_list_item("testuser", "Groceries", f"Item {i}", i, "Fruits")
+
+        names, cursor = [], None
+        while True:
+            items, cursor = await self.manager.get_active_items_page("testuser", "Groceries", 2, cursor)
+            names.extend(item["name"] for item in items)
+            if cursor is None:
+                break
+        self.assertEqual(names, [f"Item {i}" for i in range(5)])
+
+        batches = [
+            batch async for batch in
+            self.manager.iter_active_item_batches("testuser", "Groceries", ("name", "category"), batch_size=2)
+        ]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(batches[0][0], {"name": "Item 0", "category": "Fruits"})
+
+
+if __name__ == '__main__':
+    unittest.main()
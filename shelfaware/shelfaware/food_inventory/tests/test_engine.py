@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from sqlalchemy import text
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+
+class TestEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.url = f"sqlite:///{os.path.join(self.tmpdir, 'engine.db')}"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_url_and_pool_from_environment(self):
+        with patch.dict(os.environ, {
+            "SHELFAWARE_DATABASE_URL": self.url,
+            "SHELFAWARE_DB_POOL_SIZE": "3",
+            "SHELFAWARE_DB_MAX_OVERFLOW": "2",
+        }):
+            engine = get_engine()
+
+        self.assertEqual(str(engine.url), self.url)
+        self.assertEqual(engine.pool.size(), 3)
+        self.assertIs(get_engine(self.url), engine, "Engines should be shared per URL")
+        engine.dispose()
+
+    def test_sqlite_pragmas(self):
+        engine = get_engine(self.url)
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+            self.assertEqual(connection.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+        engine.dispose()
+
+    def test_in_memory_database(self):
+        engine = get_engine("sqlite://")
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT 1")).scalar(), 1)
+
+    def test_manager_shared_across_threads(self):
+        engine = get_engine(self.url)
+        Base.metadata.create_all(engine)
+        manager = InventoryManager(engine=engine)
+        manager.add_user("thread_user")
+        manager.add_list("thread_user", "Pantry")
+        manager.add_category("Produce")
+
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    with manager.session_scope():
+                        manager.add_list_item("thread_user", "Pantry", f"Item {n}-{i}", 1, "Produce")
+                        manager.get_list_items("thread_user", "Pantry")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(manager.get_list_items("thread_user", "Pantry")), 80)
+        engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from shelfaware.food_inventory.ingest import ScanIngestor
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, FoodItem, ListItem, get_engine
+from shelfaware.openfoods.food import FoodProduct
+
+MILK = "036000291452"  # UPC-A
+MILK_KEY = "0036000291452"
+CHOCOLATE = "4006381333931"
+
+
+class FakeDetector:
+
+    def __init__(self, barcodes_by_image):
+        self.barcodes_by_image = barcodes_by_image
+
+    def extract_and_decode_batch(self, images, batch_size=8):
+        if any(image not in self.barcodes_by_image for image in images):
+            raise ValueError("Could not decode image data.")
+        return [[("EAN13", code) for code in self.barcodes_by_image[image]] for image in images]
+
+
+class TestScanIngestor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        engine = get_engine(f"sqlite:///{os.path.join(self.tmpdir, 'ingest.db')}")
+        Base.metadata.create_all(engine)
+        self.manager = InventoryManager(engine)
+        self.manager.add_user("cook")
+        self.manager.add_list("cook", "Pantry")
+
+        self.client = Mock()
+        self.client.fetch_products.side_effect = lambda codes: [
+            FoodProduct("Chocolate", ["ritter-sport"], ["snacks"], None) if code == CHOCOLATE else None
+            for code in codes
+        ]
+
+    def tearDown(self):
+        self.manager.session.remove()
+        self.manager.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def list_items(self):
+        session = self.manager.Session()
+        try:
+            return sorted(session.query(ListItem.name, ListItem.quantity, ListItem.food_id))
+        finally:
+            session.close()
+
+    def test_add_scans(self):
+        # Stored under its 14 digit spelling by an older import
+        self.manager.add_food_item("Milk", barcode="0" + MILK_KEY)
+        ingestor = ScanIngestor(self.manager, food_client=self.client)
+
+        result = ingestor.add_scans("cook", "Pantry", [MILK, CHOCOLATE, MILK_KEY, "not-a-barcode", "96385074"])
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual([index for index, _ in result.errors], [3, 4])
+        # Only the barcode missing from the database went to the API
+        self.client.fetch_products.assert_called_once_with([CHOCOLATE, "96385074"])
+
+        chocolate_id, name, description = (
+            self.manager.session.query(FoodItem.id, FoodItem.name, FoodItem.description).filter_by(barcode=CHOCOLATE).one()
+        )
+        self.assertEqual(name, "Chocolate")
+        self.assertEqual(description, "Brands: ritter-sport\nCategories: snacks")
+        milk_id = self.manager.session.query(FoodItem.id).filter_by(name="Milk").scalar()
+        self.assertEqual(self.list_items(), [("Chocolate", 1.0, chocolate_id), ("Milk", 2.0, milk_id)])
+        # Recorded as purchases, so the items are in stock
+        self.assertEqual(self.manager.get_stock("cook"), [{"name": "Chocolate", "quantity": 1.0},
+                                                         {"name": "Milk", "quantity": 2.0}])
+        self.assertEqual(self.manager.verify_stock(), [])
+
+        # Resolved from memory the second time
+        self.client.fetch_products.reset_mock()
+        self.assertEqual(ingestor.resolve([MILK, CHOCOLATE]), {MILK: milk_id, CHOCOLATE: chocolate_id})
+        self.client.fetch_products.assert_not_called()
+
+    def test_rollback_forgets_new_foods(self):
+        ingestor = ScanIngestor(self.manager, food_client=self.client)
+        with self.assertRaises(ValueError):
+            ingestor.add_scans("cook", "Missing list", [CHOCOLATE])
+
+        with patch.object(InventoryManager, "_update_stock", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                ingestor.add_scans("cook", "Pantry", [CHOCOLATE])
+
+        # The new FoodItem was rolled back with the list items, and is not remembered
+        self.assertEqual(ingestor.foods, {})
+        self.assertEqual(self.manager.session.query(FoodItem).count(), 0)
+        self.assertEqual(self.list_items(), [])
+        # The list was checked before Open Food Facts was asked about the first scan
+        self.client.fetch_products.assert_called_once_with([CHOCOLATE])
+
+    def test_ingest(self):
+        detector = FakeDetector({"a.jpg": [CHOCOLATE], "b.jpg": [], "c.jpg": [CHOCOLATE, MILK]})
+        ingestor = ScanIngestor(self.manager, detector, food_client=self.client)
+
+        stats = ingestor.ingest(["a.jpg", "b.jpg", "c.jpg"], "cook", "Pantry", batch_size=2)
+
+        self.assertEqual((stats.images, stats.scans, stats.added), (3, 3, 2))
+        self.assertEqual(stats.lookups, {"memory": 1, "database": 0, "api": 1, "unknown": 1})
+        self.assertEqual([name for name, _, _ in self.list_items()], ["Chocolate", "Chocolate"])
+        self.assertIn("scans/sec", stats.summary())
+
+    def test_ingest_skips_unreadable_images(self):
+        detector = FakeDetector({"a.jpg": [CHOCOLATE], "c.jpg": [CHOCOLATE]})
+        ingestor = ScanIngestor(self.manager, detector, food_client=self.client)
+
+        stats = ingestor.ingest(["a.jpg", "corrupt.jpg", "c.jpg"], "cook", "Pantry", batch_size=3)
+
+        # The rest of the batch is still scanned and written
+        self.assertEqual((stats.images, stats.failed, stats.scans, stats.added), (3, 1, 2, 1))
+        self.assertEqual(self.list_items()[0][:2], ("Chocolate", 2.0))
+        self.assertIn("1 unreadable", stats.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,23 @@
+import datetime
+import os
+import shutil
+import tempfile
 import unittest
-from shelfaware.food_inventory.models import get_engine, Base, User, List, Category, ListItem, FoodItem
-from shelfaware.food_inventory.inventory import InventoryManager
-from sqlalchemy.orm import sessionmaker
+from shelfaware.food_inventory.models import get_engine, Base, User, List, Category, ListItem, FoodItem, Stock, Action
+from shelfaware.food_inventory.inventory import InventoryManager, decode_cursor, encode_cursor
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
 
 class TestInventoryManager(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        # Setup an in-memory SQLite database for testing
-        cls.engine = get_engine()
+        # Setup a SQLite database in a temporary directory for testing
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.engine = get_engine(f"sqlite:///{os.path.join(cls.tmpdir, 'inventory.db')}")
         Base.metadata.create_all(cls.engine)
         cls.Session = sessionmaker(bind=cls.engine)
-        cls.manager = InventoryManager()
+        cls.manager = InventoryManager(cls.engine)
 
     def setUp(self):
         # Start a new session before each test
@@ -25,6 +31,8 @@ class TestInventoryManager(unittest.TestCase):
     def tearDownClass(cls):
         # Drop the tables after all tests are completed
         Base.metadata.drop_all(cls.engine)
+        cls.engine.dispose()
+        shutil.rmtree(cls.tmpdir)
 
     def test_add_user(self):
         self.manager.add_user("test_user")
@@ -45,6 +53,15 @@ class TestInventoryManager(unittest.TestCase):
         category = self.session.query(Category).filter_by(name="Produce").first()
         self.assertIsNotNone(category, "Category should be added")
 
+    def test_add_food_item(self):
+        image_hash = "ab" * 32
+        self.manager.add_food_item("Rolled Oats", barcode="4099100207149", image_hash=image_hash)
+        food = self.session.query(FoodItem).filter_by(name="Rolled Oats").first()
+
+        self.assertIsNotNone(food, "FoodItem should be added")
+        self.assertEqual(food.image_hash, image_hash, "Only the image hash should be stored")
+        self.assertNotIn("image", food.__dict__, "The image BLOB should not be loaded with the row")
+
     def test_add_list_item(self):
         self.manager.add_user("test_user3")
         self.manager.add_list("test_user3", "Shopping List")
@@ -80,6 +97,24 @@ class TestInventoryManager(unittest.TestCase):
 
         self.assertEqual(list_item.quantity, 5, "Item quantity should be updated")
 
+    def test_update_quantity_same_name_in_other_list(self):
+        self.manager.add_user("test_user8")
+        self.manager.add_list("test_user8", "Fridge")
+        self.manager.add_list("test_user8", "Freezer")
+        self.manager.add_category("Dairy")
+        self.manager.add_list_item("test_user8", "Fridge", "Butter", 1, "Dairy")
+        self.manager.add_list_item("test_user8", "Freezer", "Butter", 4, "Dairy")
+
+        # Only the item in the named list is updated
+        self.manager.update_quantity("Freezer", "Butter", 3)
+        quantities = {
+            item.list.name: item.quantity
+            for item in self.session.query(ListItem).filter_by(name="Butter")
+        }
+
+        self.assertEqual(quantities, {"Fridge": 1, "Freezer": 3}, "Only the Freezer item should be updated")
+        self.assertEqual(self.manager.get_list_items("test_user8", "Freezer"), ["Butter"])
+
     def test_remove_list_item(self):
         self.manager.add_user("test_user6")
         self.manager.add_list("test_user6", "Shopping List")
@@ -92,6 +127,121 @@ class TestInventoryManager(unittest.TestCase):
 
         self.assertIsNotNone(list_item.date_removed, "ListItem should be marked as removed")
 
+    def test_get_active_items(self):
+        self.manager.add_user("test_user11")
+        self.manager.add_list("test_user11", "Fridge")
+        self.manager.add_category("Dairy")
+        self.manager.add_list_item("test_user11", "Fridge", "Milk", 1, "Dairy")
+        self.manager.add_list_item("test_user11", "Fridge", "Yogurt", 4, "Dairy")
+
+        # Removed items are left out
+        self.manager.remove_list_item("Fridge", "Milk")
+        self.assertEqual(self.manager.get_active_items("test_user11", "Fridge"), [{"name": "Yogurt", "quantity": 4.0}])
+
+    def test_get_active_items_page(self):
+        self.manager.add_user("test_user14")
+        self.manager.add_list("test_user14", "Chest freezer")
+        self.manager.add_category("Frozen")
+        self.manager.add_food_item("Frozen peas", barcode="0123456789012")
+        self.manager.add_list_items_bulk([
+            {"username": "test_user14", "list_name": "Chest freezer", "item_name": f"Item {i}", "quantity": i,
+             "category_name": "Frozen", "food_name": "Frozen peas" if i == 0 else None}
+            for i in range(7)
+        ])
+        # Items added at the same time are ordered by id, including across page boundaries
+        list_id = self.session.query(List.id).filter_by(name="Chest freezer").scalar()
+        same_time = self.session.query(ListItem.date_added).filter_by(list_id=list_id).order_by(ListItem.id).first()[0]
+        self.session.query(ListItem).filter(ListItem.list_id == list_id, ListItem.name.in_(["Item 2", "Item 3", "Item 4"])) \
+            .update({"date_added": same_time}, synchronize_session=False)
+        self.session.commit()
+        self.manager.remove_list_item("Chest freezer", "Item 5")
+
+        names, cursor = [], None
+        while True:
+            items, cursor = self.manager.get_active_items_page("test_user14", "Chest freezer", limit=2, cursor=cursor)
+            names.extend(item["name"] for item in items)
+            if cursor is None:
+                break
+        self.assertEqual(names, ["Item 0", "Item 2", "Item 3", "Item 4", "Item 1", "Item 6"])
+
+        items, cursor = self.manager.get_active_items_page(
+            "test_user14", "Chest freezer", limit=1, fields=("id", "name", "category", "food_name", "barcode")
+        )
+        self.assertEqual(set(items[0]), {"id", "name", "category", "food_name", "barcode"})
+        self.assertEqual(
+            (items[0]["category"], items[0]["food_name"], items[0]["barcode"]), ("Frozen", "Frozen peas", "0123456789012")
+        )
+        self.assertEqual(decode_cursor(cursor)[1], items[0]["id"])
+
+        with self.assertRaises(ValueError):
+            self.manager.get_active_items_page("test_user14", "Chest freezer", fields=("name", "image"))
+        with self.assertRaises(ValueError):
+            self.manager.get_active_items_page("test_user14", "Chest freezer", cursor="not a cursor")
+
+    def test_iter_active_items(self):
+        self.manager.add_user("test_user15")
+        self.manager.add_list("test_user15", "Cellar")
+        self.manager.add_category("Drinks")
+        self.manager.add_list_items_bulk([
+            {"username": "test_user15", "list_name": "Cellar", "item_name": f"Bottle {i}", "quantity": 1,
+             "category_name": "Drinks"}
+            for i in range(25)
+        ])
+
+        items = list(self.manager.iter_active_items("test_user15", "Cellar", fields=("name",), batch_size=10))
+        self.assertEqual(items, [{"name": f"Bottle {i}"} for i in range(25)])
+
+        # Stopping early releases the rows, and the session can be used again
+        first = next(iter(self.manager.iter_active_items("test_user15", "Cellar", batch_size=10)))
+        self.assertEqual(first, {"name": "Bottle 0", "quantity": 1.0})
+        self.assertEqual(len(self.manager.get_active_items("test_user15", "Cellar")), 25)
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(datetime.datetime(2024, 5, 1, 12, 30, 0, 250), 42)
+        self.assertEqual(decode_cursor(cursor), (datetime.datetime(2024, 5, 1, 12, 30, 0, 250), 42))
+        for bad in ("", "abc", encode_cursor(datetime.datetime(2024, 5, 1), 1)[:-4]):
+            with self.assertRaises(ValueError):
+                decode_cursor(bad)
+
+    def test_session_scope_is_one_unit_of_work(self):
+        self.manager.add_user("test_user16")
+        with self.assertRaises(RuntimeError):
+            with self.manager.session_scope():
+                self.manager.add_list("test_user16", "Garage")
+                self.manager.add_category("Tools")
+                raise RuntimeError("Request failed")
+
+        # Neither call was committed
+        self.assertEqual(self.manager.get_user_lists("test_user16"), [])
+        self.assertIsNone(self.session.query(Category.id).filter_by(name="Tools").scalar())
+
+        with self.manager.session_scope():
+            self.manager.add_list("test_user16", "Garage")
+            self.manager.add_category("Tools")
+            self.manager.add_list_item("test_user16", "Garage", "Hammer", 1, "Tools")
+        self.assertEqual(self.manager.get_list_items("test_user16", "Garage"), ["Hammer"])
+
+    def test_failed_commit_caches_no_ids(self):
+        def fail_commit(session):
+            raise RuntimeError("Commit failed")
+
+        event.listen(Session, "before_commit", fail_commit)
+        try:
+            with self.assertRaises(RuntimeError):
+                self.manager.add_user("test_user20")
+            self.manager.session.rollback()
+            with self.assertRaises(RuntimeError):
+                self.manager.add_category("Spices")
+            self.manager.session.rollback()
+        finally:
+            event.remove(Session, "before_commit", fail_commit)
+
+        # Neither row was committed, so the user is unknown and the category is added again
+        with self.assertRaises(ValueError):
+            self.manager.add_list("test_user20", "Rack")
+        self.manager.add_category("Spices")
+        self.assertIsNotNone(self.session.query(Category.id).filter_by(name="Spices").scalar())
+
     def test_add_action(self):
         self.manager.add_user("test_user7")
         self.manager.add_list("test_user7", "Inventory")
@@ -107,5 +257,125 @@ class TestInventoryManager(unittest.TestCase):
         self.assertIsNotNone(user, "User should exist for the action")
         self.assertIsNotNone(list_item, "ListItem should exist for the action")
 
+    def test_add_list_items_bulk(self):
+        self.manager.add_user("test_user9")
+        self.manager.add_list("test_user9", "Pantry")
+        self.manager.add_category("Grains")
+        self.manager.add_food_item("Rolled Oats")
+
+        result = self.manager.add_list_items_bulk([
+            {"username": "test_user9", "list_name": "Pantry", "item_name": "Oats", "quantity": 2,
+             "category_name": "Grains", "food_name": "Rolled Oats"},
+            {"username": "test_user9", "list_name": "Pantry", "item_name": "Rice", "quantity": "1.5",
+             "category_name": "Grains"},
+            {"username": "test_user9", "list_name": "Missing", "item_name": "Flour", "quantity": 1,
+             "category_name": "Grains"},
+            {"username": "test_user9", "list_name": "Pantry", "item_name": "Pasta", "quantity": 1,
+             "category_name": "Missing"},
+            {"username": "test_user9", "list_name": "Pantry", "item_name": "Barley", "quantity": "lots",
+             "category_name": "Grains"},
+        ])
+
+        # Bad rows are reported without aborting the rest of the batch
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual([index for index, _ in result.errors], [2, 3, 4])
+        self.assertEqual(self.manager.get_list_items("test_user9", "Pantry"), ["Oats", "Rice"])
+
+        oats = self.session.query(ListItem).filter_by(name="Oats").first()
+        self.assertEqual(oats.food.name, "Rolled Oats")
+        self.assertEqual(oats.quantity, 2)
+        self.assertIsNotNone(oats.date_added)
+
+    def test_add_actions_bulk(self):
+        self.manager.add_user("test_user10")
+        self.manager.add_list("test_user10", "Inventory")
+        self.manager.add_category("Meat")
+        self.manager.add_list_item("test_user10", "Inventory", "Steak", 2, "Meat")
+
+        result = self.manager.add_actions_bulk([
+            {"username": "test_user10", "item_name": "Steak", "action_type": "purchase", "quantity": 2},
+            {"username": "test_user10", "item_name": "Steak", "action_type": "consume"},
+            {"username": "nobody", "item_name": "Steak", "action_type": "consume"},
+            {"username": "test_user10", "item_name": "Tofu", "action_type": "consume"},
+        ])
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual([index for index, _ in result.errors], [2, 3])
+
+        user = self.session.query(User).filter_by(username="test_user10").first()
+        self.assertEqual(sorted(action.action_type for action in user.actions), ["consume", "purchase"])
+        self.assertTrue(all(action.date is not None for action in user.actions))
+
+    def test_stock(self):
+        self.manager.add_user("test_user12")
+        self.manager.add_list("test_user12", "Cupboard")
+        self.manager.add_category("Canned")
+        self.manager.add_list_item("test_user12", "Cupboard", "Stock Beans", 1, "Canned")
+        self.manager.add_list_item("test_user12", "Cupboard", "Stock Soup", 1, "Canned")
+
+        self.manager.add_action("test_user12", "Stock Beans", "purchase", 3)
+        self.manager.add_action("test_user12", "Stock Beans", "consume")
+        self.manager.add_actions_bulk([
+            {"username": "test_user12", "item_name": "Stock Soup", "action_type": "purchase", "quantity": 2},
+            {"username": "test_user12", "item_name": "Stock Soup", "action_type": "remove", "quantity": 2},
+            {"username": "test_user12", "item_name": "Stock Beans", "action_type": "purchase"},
+            {"username": "test_user12", "item_name": "Stock Beans", "action_type": "inspect", "quantity": 5},
+        ])
+
+        # Items with nothing left are not in stock
+        self.assertEqual(self.manager.get_stock("test_user12"), [{"name": "Stock Beans", "quantity": 3.0}])
+        self.assertEqual(self.manager.verify_stock(), [])
+
+    def test_actions_resolve_items_on_the_users_own_lists(self):
+        for username in ("test_user17", "test_user18", "test_user19"):
+            self.manager.add_user(username)
+            self.manager.add_list(username, "Fridge")
+        self.manager.add_category("Dairy")
+        # The other user's item has the lower id, so a lookup by name alone would pick it
+        self.manager.add_list_item("test_user17", "Fridge", "Shared Milk", 1, "Dairy")
+        self.manager.add_list_item("test_user18", "Fridge", "Shared Milk", 1, "Dairy")
+
+        self.manager.add_action("test_user18", "Shared Milk", "purchase", 2)
+        result = self.manager.add_actions_bulk([
+            {"username": "test_user18", "item_name": "Shared Milk", "action_type": "purchase", "quantity": 1},
+            {"username": "test_user17", "item_name": "Shared Milk", "action_type": "purchase", "quantity": 5},
+        ])
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(self.manager.get_stock("test_user17"), [{"name": "Shared Milk", "quantity": 5.0}])
+        self.assertEqual(self.manager.get_stock("test_user18"), [{"name": "Shared Milk", "quantity": 3.0}])
+        self.assertEqual(self.manager.verify_stock(), [])
+        # Every action points at an item on its own user's list
+        actions = (
+            self.session.query(Action.user_id, List.user_id)
+            .join(Action.list_item)
+            .join(ListItem.list)
+            .filter(ListItem.name == "Shared Milk")
+            .all()
+        )
+        self.assertEqual(len(actions), 3)
+        self.assertTrue(all(action_user == list_user for action_user, list_user in actions))
+
+        # A user without the item on their lists gets an error instead of someone else's item
+        with self.assertRaisesRegex(ValueError, "Shared Milk"):
+            self.manager.add_action("test_user19", "Shared Milk", "purchase")
+
+    def test_rebuild_stock(self):
+        self.manager.add_user("test_user13")
+        self.manager.add_list("test_user13", "Freezer")
+        self.manager.add_category("Frozen")
+        self.manager.add_list_item("test_user13", "Freezer", "Stock Peas", 1, "Frozen")
+        self.manager.add_action("test_user13", "Stock Peas", "purchase", 4)
+
+        user_id = self.session.query(User.id).filter_by(username="test_user13").scalar()
+        item_id = self.session.query(ListItem.id).filter_by(name="Stock Peas").scalar()
+        self.session.query(Stock).filter_by(user_id=user_id).update({Stock.quantity: 99})
+        self.session.commit()
+
+        self.assertEqual(self.manager.verify_stock(), [(user_id, item_id, 4.0, 99.0)])
+        self.assertGreaterEqual(self.manager.rebuild_stock(), 1)
+        self.assertEqual(self.manager.verify_stock(), [])
+        self.assertEqual(self.manager.get_stock("test_user13"), [{"name": "Stock Peas", "quantity": 4.0}])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine, include_name
+
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "..", "alembic.ini")
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.url = f"sqlite:///{os.path.join(self.tmpdir, 'migrations.db')}"
+        self.config = Config(ALEMBIC_INI)
+        self.config.set_main_option("sqlalchemy.url", self.url)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_migrations_match_models(self):
+        command.upgrade(self.config, "head")
+
+        engine = create_engine(self.url)
+        with engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={"include_name": include_name})
+            diff = compare_metadata(context, Base.metadata)
+        engine.dispose()
+
+        self.assertEqual(diff, [], "Models have changes that are not in a migration")
+
+    def test_search_index_matches_models(self):
+        # Migration 0006 has its own copy of the search DDL, which must match what create_all builds
+        command.upgrade(self.config, "head")
+        models_url = f"sqlite:///{os.path.join(self.tmpdir, 'models.db')}"
+        engine = create_engine(models_url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+        schemas = []
+        for url in (self.url, models_url):
+            engine = create_engine(url)
+            with engine.connect() as connection:
+                schemas.append(connection.exec_driver_sql(
+                    "SELECT type, name, sql FROM sqlite_master WHERE type = 'trigger' OR name LIKE 'search_%' "
+                    "ORDER BY name"
+                ).all())
+            engine.dispose()
+
+        self.assertEqual(schemas[0], schemas[1])
+        self.assertEqual(sum(row_type == "trigger" for row_type, _, _ in schemas[0]), 6)
+
+    def test_indexes_created_and_dropped(self):
+        command.upgrade(self.config, "head")
+        engine = create_engine(self.url)
+        indexes = {index["name"] for index in inspect(engine).get_indexes("list_items")}
+        self.assertIn("ix_list_items_active", indexes)
+        self.assertIn("ix_list_items_name_list_id", indexes)
+        engine.dispose()
+
+        command.downgrade(self.config, "0002")
+        engine = create_engine(self.url)
+        self.assertEqual(inspect(engine).get_indexes("list_items"), [])
+        engine.dispose()
+
+    def test_search_index_backfilled(self):
+        command.upgrade(self.config, "0005")
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO food_items (id, name) VALUES (7, 'Peanut butter')")
+        engine.dispose()
+
+        command.upgrade(self.config, "head")
+        engine = create_engine(self.url)
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql("SELECT rowid FROM search_index WHERE search_index MATCH 'peanut'").all()
+        self.assertEqual(rows, [(14,)])
+        engine.dispose()
+
+        command.downgrade(self.config, "0005")
+        engine = create_engine(self.url)
+        self.assertNotIn("search_index", inspect(engine).get_table_names())
+        engine.dispose()
+
+    def test_missing_date_added_backfilled(self):
+        command.upgrade(self.config, "0006")
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO list_items (id, name, quantity) VALUES (3, 'Rice', 1)")
+        engine.dispose()
+
+        command.upgrade(self.config, "head")
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            self.assertIsNotNone(connection.exec_driver_sql("SELECT date_added FROM list_items").scalar())
+            # The batch copy of list_items kept its search triggers
+            connection.exec_driver_sql(
+                "INSERT INTO list_items (id, name, quantity, date_added) VALUES (4, 'Risotto', 1, CURRENT_TIMESTAMP)"
+            )
+            rows = connection.exec_driver_sql("SELECT rowid FROM search_index WHERE search_index MATCH 'ri*' ORDER BY rowid").all()
+        self.assertEqual(rows, [(7,), (9,)])
+        engine.dispose()
+
+    def test_backfilled_items_page(self):
+        command.upgrade(self.config, "0006")
+        engine = create_engine(self.url)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO users (id, username) VALUES (1, 'cook')")
+            connection.exec_driver_sql("INSERT INTO lists (id, name, user_id) VALUES (1, 'Pantry', 1)")
+            for i in range(1, 6):
+                connection.exec_driver_sql(
+                    f"INSERT INTO list_items (id, name, quantity, list_id) VALUES ({i}, 'item{i}', 1, 1)"
+                )
+        engine.dispose()
+
+        command.upgrade(self.config, "head")
+        engine = get_engine(self.url)
+        manager = InventoryManager(engine)
+        # Every backfilled row shares one date, so the pages are told apart by id alone
+        names, cursor = [], None
+        while True:
+            items, cursor = manager.get_active_items_page("cook", "Pantry", limit=2, cursor=cursor)
+            names.extend(item["name"] for item in items)
+            if cursor is None:
+                break
+        manager.session.remove()
+        engine.dispose()
+        self.assertEqual(names, [f"item{i}" for i in range(1, 6)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+import unittest
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, FoodItem, get_engine
+from shelfaware.food_inventory.search import match_expression, trigrams
+
+
+class TestSearchHelpers(unittest.TestCase):
+
+    def test_match_expression(self):
+        self.assertEqual(match_expression("Banana  org"), '"banana"* "org"*')
+        self.assertEqual(match_expression('say "hi" OR'), '"say"* "hi"* "or"*')
+        self.assertEqual(match_expression("2 l milk"), '"milk"*')
+        self.assertIsNone(match_expression(" ,. b"))
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("Milk, 2%"), {"mil", "ilk"})
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        engine = get_engine(f"sqlite:///{os.path.join(self.tmpdir, 'search.db')}")
+        Base.metadata.create_all(engine)
+        self.manager = InventoryManager(engine)
+        for username in ("alice", "bob"):
+            self.manager.add_user(username)
+            self.manager.add_list(username, "Pantry")
+        self.manager.add_category("Produce")
+        self.manager.add_food_item("Bananas, organic", description="Brands: dole\nCategories: fruits")
+        self.manager.add_food_item("Banana bread")
+        self.manager.add_food_item("Oat milk", description="Brands: oatly")
+        self.manager.add_list_item("alice", "Pantry", "Bananas", 3, "Produce")
+        self.manager.add_list_item("bob", "Pantry", "Green bananas", 1, "Produce")
+
+    def tearDown(self):
+        self.manager.session.remove()
+        self.manager.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def names(self, query, **kwargs):
+        return [result["name"] for result in self.manager.search(query, **kwargs).results]
+
+    def test_prefix_and_description(self):
+        self.assertEqual(self.names("banan", kinds=("food",)), ["Banana bread", "Bananas, organic"])
+        self.assertEqual(self.names("banana org"), ["Bananas, organic"])
+        # Brands are in the description, a name match ranks above a description match
+        self.assertEqual(self.names("oatly"), ["Oat milk"])
+        self.assertEqual(self.names("oat"), ["Oat milk"])
+
+    def test_list_items_of_user(self):
+        page = self.manager.search("bananas", username="alice", kinds=("list_item",))
+        self.assertEqual([(result["kind"], result["name"]) for result in page.results], [("list_item", "Bananas")])
+        self.assertEqual(page.mode, "full_text")
+        self.assertEqual(len(self.names("bananas", kinds=("list_item",))), 2)
+        with self.assertRaises(ValueError):
+            self.manager.search("bananas", username="nobody")
+
+    def test_triggers(self):
+        self.manager.remove_list_item("Pantry", "Bananas")
+        self.assertEqual(self.names("bananas", username="alice", kinds=("list_item",)), [])
+
+        food = self.manager.session.query(FoodItem).filter_by(name="Oat milk").one()
+        food.name = "Almond milk"
+        self.manager.session.commit()
+        self.assertEqual(self.names("milk"), ["Almond milk"])
+        self.manager.session.delete(food)
+        self.manager.session.commit()
+        self.assertEqual(self.names("milk"), [])
+
+    def test_fuzzy(self):
+        page = self.manager.search("bananna", kinds=("food",))
+        self.assertEqual(page.mode, "fuzzy")
+        self.assertEqual([result["name"] for result in page.results], ["Banana bread", "Bananas, organic"])
+        self.assertIsNone(self.manager.search("xyzzy").mode)
+
+    def test_pagination(self):
+        first = self.manager.search("banana", limit=2)
+        self.assertEqual(len(first.results), 2)
+        self.assertEqual(first.next_offset, 2)
+        second = self.manager.search("banana", limit=2, offset=2)
+        self.assertEqual(len(second.results), 2)
+        self.assertIsNone(second.next_offset)
+        self.assertEqual(self.manager.search("banana", limit=2, offset=4).results, [])
+        ids = [(result["kind"], result["id"]) for result in first.results + second.results]
+        self.assertEqual(len(set(ids)), 4)
+
+        fuzzy = self.manager.search("bananna", limit=1, offset=1, kinds=("food",))
+        self.assertEqual((fuzzy.mode, len(fuzzy.results)), ("fuzzy", 1))
+
+        with self.assertRaises(ValueError):
+            self.manager.search("banana", limit=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Command line entry point for shelfaware.
+
+Usage:
+    shelfaware scan ../samples --manifest scan_manifest.jsonl --workers 4 --batch-size 8
+    shelfaware ingest ../samples/upc --username default --list Inventory
+    shelfaware stock verify
+    shelfaware stock rebuild
+"""
+
+import argparse
+import os
+from functools import partial
+
+
+def scan(args):
+    from shelfaware.barcode.detector import BarcodeDetector
+    from shelfaware.barcode.folder import scan_folder
+
+    if not os.path.isdir(args.directory):
+        raise SystemExit(f"{args.directory} is not a directory")
+
+    # Each worker process builds its own detector, and decodes on one thread since the
+    # processes already share the cores
+    detector_factory = partial(BarcodeDetector, model_path=args.model, backend=args.backend,
+                               load_size=args.load_size, decoder=args.decoder, symbologies=args.symbologies,
+                               decode_threads=1 if args.workers != 0 else None)
+    stats = scan_folder(
+        args.directory, detector_factory, args.manifest,
+        workers=args.workers, batch_size=args.batch_size, load_size=args.load_size,
+    )
+    print(stats.summary())
+
+
+def ingest(args):
+    from shelfaware.barcode.decoders import GROCERY_SYMBOLOGIES
+    from shelfaware.barcode.detector import BarcodeDetector
+    from shelfaware.barcode.folder import find_images
+    from shelfaware.food_inventory.ingest import ScanIngestor
+    from shelfaware.food_inventory.inventory import InventoryManager
+    from shelfaware.food_inventory.models import get_engine
+    from shelfaware.openfoods.client import OpenFoodClient, PRODUCT_FIELDS
+
+    if not os.path.isdir(args.directory):
+        raise SystemExit(f"{args.directory} is not a directory")
+
+    detector = BarcodeDetector(model_path=args.model, backend=args.backend, decoder=args.decoder,
+                               symbologies=GROCERY_SYMBOLOGIES)
+    detector.warm_up()
+    ingestor = ScanIngestor(InventoryManager(get_engine(args.database)), detector,
+                            OpenFoodClient(fields=PRODUCT_FIELDS))
+    try:
+        stats = ingestor.ingest(find_images(args.directory), args.username, args.list_name, args.category,
+                                batch_size=args.batch_size)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    finally:
+        detector.close()
+    print(stats.summary())
+
+
+def stock(args):
+    from shelfaware.food_inventory.inventory import InventoryManager
+    from shelfaware.food_inventory.models import get_engine
+
+    manager = InventoryManager(get_engine(args.database))
+    if args.action == "rebuild":
+        print(f"Rebuilt {manager.rebuild_stock()} stock rows from the action log")
+        return
+
+    mismatches = manager.verify_stock()
+    for user_id, list_item_id, expected, actual in mismatches:
+        print(f"user {user_id} item {list_item_id}: expected {expected}, found {actual}")
+    if mismatches:
+        raise SystemExit(f"{len(mismatches)} stock rows differ from the action log, run `shelfaware stock rebuild`")
+    print("Stock matches the action log")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="shelfaware", description="Shelfaware command line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser(
+        "scan", help="Decode the barcodes in a directory of photos into a JSONL manifest",
+        description="Scan a directory of photos for barcodes. Files whose content is already in the "
+                    "manifest are skipped, so re-runs only process new photos.",
+    )
+    scan_parser.add_argument("directory", help="Directory of photos, searched recursively")
+    scan_parser.add_argument("--manifest", default="scan_manifest.jsonl", help="JSONL manifest to append to")
+    scan_parser.add_argument("--model", default=os.getenv("SHELFAWARE_BARCODE_MODEL", "models/barcodes.pt"))
+    scan_parser.add_argument("--backend", default=os.getenv("SHELFAWARE_BARCODE_BACKEND", "ultralytics"),
+                             choices=("ultralytics", "onnx"))
+    scan_parser.add_argument("--decoder", default=os.getenv("SHELFAWARE_BARCODE_DECODER", "pyzbar"),
+                             choices=("pyzbar", "opencv", "zxing"))
+    scan_parser.add_argument("--symbologies", nargs="+", help="Barcode types to decode, e.g. EAN13 UPCA")
+    scan_parser.add_argument("--workers", type=int, help="Processes scanning images. Defaults to the CPU count")
+    scan_parser.add_argument("--batch-size", type=int, default=8, help="Images per detection batch")
+    scan_parser.add_argument("--load-size", type=int, default=1600,
+                             help="Minimum longest side large photos are decoded at")
+    scan_parser.set_defaults(func=scan)
+
+    ingest_parser = subparsers.add_parser(
+        "ingest", help="Add the products of the barcodes in a directory of photos to a list",
+        description="Scan a directory of photos for EAN-13/UPC-A barcodes, look each product up in the "
+                    "database or on Open Food Facts, and add it to a list.",
+    )
+    ingest_parser.add_argument("directory", help="Directory of photos, searched recursively")
+    ingest_parser.add_argument("--username", default=os.getenv("SHELFAWARE_DEFAULT_USER", "default"))
+    ingest_parser.add_argument("--list", dest="list_name", default=os.getenv("SHELFAWARE_DEFAULT_LIST", "Inventory"))
+    ingest_parser.add_argument("--category", default="Uncategorized", help="Category of the new list items")
+    ingest_parser.add_argument("--database", help="Database URL. Defaults to SHELFAWARE_DATABASE_URL")
+    ingest_parser.add_argument("--model", default=os.getenv("SHELFAWARE_BARCODE_MODEL", "models/barcodes.pt"))
+    ingest_parser.add_argument("--backend", default=os.getenv("SHELFAWARE_BARCODE_BACKEND", "ultralytics"),
+                               choices=("ultralytics", "onnx"))
+    ingest_parser.add_argument("--decoder", default=os.getenv("SHELFAWARE_BARCODE_DECODER", "pyzbar"),
+                               choices=("pyzbar", "opencv", "zxing"))
+    ingest_parser.add_argument("--batch-size", type=int, default=8, help="Images per detection batch")
+    ingest_parser.set_defaults(func=ingest)
+
+    stock_parser = subparsers.add_parser(
+        "stock", help="Verify or rebuild the stock table from the action log",
+        description="verify recomputes the stock of every item from the action log and reports rows that "
+                    "differ from the stock table. rebuild replaces the table with the recomputed stock.",
+    )
+    stock_parser.add_argument("action", choices=("verify", "rebuild"))
+    stock_parser.add_argument("--database", help="Database URL. Defaults to SHELFAWARE_DATABASE_URL")
+    stock_parser.set_defaults(func=stock)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+JSON decoding for Open Food Facts documents, using orjson when it is installed.
+"""
+
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    DECODER = "orjson"
+except ImportError:
+    import json
+
+    def loads(data):
+        return json.loads(data)
+
+    DECODER = "json"
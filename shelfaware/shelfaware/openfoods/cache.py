@@ -0,0 +1,169 @@
+"""
+In-process cache of parsed FoodProduct objects, kept in front of the requests_cache HTTP cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache whose entries expire after a time-to-live.
+
+    Attributes:
+        max_size (int): Maximum number of entries. The least recently used entry is evicted beyond it.
+        ttl (float): Seconds an entry stays valid, or None to keep entries until evicted.
+        evictions (int): Number of entries evicted because the cache was full.
+        expirations (int): Number of entries dropped because their TTL had passed.
+    """
+
+    def __init__(self, max_size=1024, ttl=None, clock=time.monotonic):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_NOT_FOUND = object()
+
+
+class ProductCache:
+    """
+    Caches FoodProduct lookups by barcode, with separate limits for products that were not found.
+
+    Negative entries (barcodes the API reported with status != 1) usually get a shorter TTL so
+    products added to Open Food Facts later are picked up.
+
+    Attributes:
+        products (LRUCache): Cache of found products.
+        not_found (LRUCache): Cache of barcodes that were not found.
+        hits (int): Lookups answered with a cached product.
+        negative_hits (int): Lookups answered with a cached "not found".
+        misses (int): Lookups that had to go to the HTTP cache or network.
+    """
+
+    def __init__(self, max_size=1024, ttl=24 * 60 * 60, negative_max_size=1024, negative_ttl=60 * 60,
+                 clock=time.monotonic):
+        """
+        Initializes the ProductCache.
+
+        Args:
+            max_size (int): Maximum number of products kept. Defaults to 1024.
+            ttl (float): Seconds a product stays cached. Defaults to one day.
+            negative_max_size (int): Maximum number of "not found" barcodes kept. Defaults to 1024.
+            negative_ttl (float): Seconds a "not found" barcode stays cached. Defaults to one hour.
+            clock (callable): Time source, in seconds. Defaults to time.monotonic.
+        """
+        self.products = LRUCache(max_size, ttl, clock)
+        self.not_found = LRUCache(negative_max_size, negative_ttl, clock)
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def lookup(self, code):
+        """
+        Looks up a barcode.
+
+        Args:
+            code (str): The barcode of the product.
+
+        Returns:
+            tuple: (found, product). found is False on a cache miss, otherwise product is the
+                cached FoodProduct, or None if the barcode is cached as not found.
+        """
+        product = self.products.get(code)
+        if product is not None:
+            with self._counter_lock:
+                self.hits += 1
+            return True, product
+
+        if self.not_found.get(code, _NOT_FOUND) is not _NOT_FOUND:
+            with self._counter_lock:
+                self.negative_hits += 1
+            return True, None
+
+        with self._counter_lock:
+            self.misses += 1
+        return False, None
+
+    def store(self, code, product):
+        """
+        Stores the result of a lookup, negative results included.
+
+        Args:
+            code (str): The barcode of the product.
+            product (FoodProduct): The product, or None if it was not found.
+        """
+        if product is None:
+            self.not_found.put(code, True)
+        else:
+            self.products.put(code, product)
+
+    def clear(self):
+        self.products.clear()
+        self.not_found.clear()
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Returns the cache counters, to size the cache for the working set.
+
+        Returns:
+            dict: Sizes, hit and miss counts, evictions, expirations and the hit ratio.
+        """
+        return {
+            "size": len(self.products),
+            "negative_size": len(self.not_found),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.products.evictions,
+            "negative_evictions": self.not_found.evictions,
+            "expirations": self.products.expirations + self.not_found.expirations,
+            "hit_ratio": self.hit_ratio,
+        }
+
+    def __repr__(self):
+        return f"<ProductCache(size={len(self.products)}, negative_size={len(self.not_found)}, hit_ratio={self.hit_ratio:.2f})>"
@@ -2,11 +2,55 @@
 Client to interact with the Open Food Facts API using a session with optional caching.
 """
 
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from ._json import loads
+from .cache import ProductCache
 from .food import FoodProduct
 from PIL import Image
 from io import BytesIO
 
+# The only product fields FoodProduct reads, for requesting a slim payload from the API
+PRODUCT_FIELDS = ("product_name", "brands_tags", "categories_tags", "image_front_url")
+
+
+class FetchStats:
+    """
+    Bandwidth and parse time counters for product lookups that reached the API.
+
+    Attributes:
+        requests (int): Number of product responses parsed.
+        bytes_downloaded (int): Response body bytes received over the network (cached responses excluded).
+        parse_seconds (float): Time spent decoding response bodies.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes_downloaded = 0
+        self.parse_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, bytes_downloaded, parse_seconds):
+        with self._lock:
+            self.requests += 1
+            self.bytes_downloaded += bytes_downloaded
+            self.parse_seconds += parse_seconds
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "bytes_downloaded": self.bytes_downloaded,
+            "mean_bytes": self.bytes_downloaded / self.requests if self.requests else 0.0,
+            "mean_parse_ms": 1000 * self.parse_seconds / self.requests if self.requests else 0.0,
+        }
+
+    def __repr__(self):
+        return f"<FetchStats({self.as_dict()})>"
+
 
 class OpenFoodClient:
     """
@@ -16,9 +60,11 @@ class OpenFoodClient:
     
     Methods:
         fetch_product: Fetches product details by barcode.
+        fetch_products: Fetches product details for many barcodes concurrently.
     """
     
-    def __init__(self, cache=True, cache_name="openfoods_cache", api_url="https://world.openfoodfacts.org/api/v0/product/"):
+    def __init__(self, cache=True, cache_name="openfoods_cache", api_url="https://world.openfoodfacts.org/api/v0/product/",
+                 max_workers=8, timeout=10, product_cache=None, mirror=None, fields=None, image_store=None):
         """
         Initializes the OpenFoodClient with an optional cache and custom API URL.
         
@@ -26,14 +72,42 @@ class OpenFoodClient:
             cache (bool): Whether to enable caching. Defaults to True.
             cache_name (str): Name of the cache file if caching is enabled. Defaults to "openfoods_cache".
             api_url (str): The base URL for the Open Food Facts API. Defaults to "https://world.openfoodfacts.org/api/v0/product/".
+            max_workers (int): Maximum number of concurrent requests made by fetch_products. Defaults to 8.
+            timeout (float): Timeout in seconds for each request. Defaults to 10.
+            product_cache (ProductCache): In-memory cache of parsed products checked before the HTTP cache.
+                Defaults to a ProductCache with default limits when caching is enabled.
+            mirror (ProductMirror): Local Open Food Facts mirror checked before the API. The API is only
+                called for barcodes missing from the mirror. Defaults to None.
+            fields (tuple): Product fields to request from the API instead of the whole product document.
+                Pass PRODUCT_FIELDS to download only the fields FoodProduct needs. Defaults to None.
+            image_store (ImageStore): Content-addressed store that product images are downloaded into once.
+                Defaults to None, which downloads the image on every fetch_image call.
         """
         self.session = requests.Session()
 
         if cache:
             import requests_cache
             self.session = requests_cache.CachedSession(cache_name)
+            if product_cache is None:
+                product_cache = ProductCache()
+        self.product_cache = product_cache
+        self.mirror = mirror
+        self.fields = fields
+        self.fetch_stats = FetchStats()
+        self.image_store = image_store
+
+        # Keep one pooled connection per worker so concurrent lookups reuse their connections
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
         self.api_url = api_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # Lookups currently in progress, so concurrent requests for the same barcode are merged
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
 
     def fetch_product(self, code):
         """
@@ -44,20 +118,88 @@ class OpenFoodClient:
             
         Returns:
             FoodProduct: Instance of FoodProduct with product details, or None if not found.
+
+        Raises:
+            requests.RequestException: If the request fails, the API answers with an error status,
+                or the response body is not JSON.
+        """
+        if self.product_cache is not None:
+            found, product = self.product_cache.lookup(code)
+            if found:
+                return product
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(code)
+            is_owner = future is None
+            if is_owner:
+                future = self._in_flight[code] = Future()
+
+        if not is_owner:
+            return future.result()
+
+        try:
+            product = self._request_product(code)
+            if self.product_cache is not None:
+                self.product_cache.store(code, product)
+            future.set_result(product)
+            return product
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[code]
+
+    def fetch_products(self, codes):
         """
-        response = self.session.get(self.api_url + f"{code}.json")
-        food_info = response.json()
+        Fetches product information for many barcodes concurrently.
+
+        Requests run on a thread pool of at most max_workers threads sharing the pooled session.
+        Duplicate barcodes are only requested once.
+
+        Args:
+            codes (list): Barcodes of the products.
+
+        Returns:
+            list: FoodProduct instances (or None if not found) in the same order as codes.
+        """
+        unique_codes = list(dict.fromkeys(codes))
+        if not unique_codes:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_codes))) as executor:
+            products = dict(zip(unique_codes, executor.map(self.fetch_product, unique_codes)))
+        return [products[code] for code in codes]
+
+    def _request_product(self, code):
+        if self.mirror is not None:
+            product = self.mirror.get(code)
+            if product is not None:
+                return product
+
+        params = {"fields": ",".join(self.fields)} if self.fields else None
+        response = self.session.get(self.api_url + f"{code}.json", params=params, timeout=self.timeout)
+        # Unknown barcodes may come back as a 404 whose body still reports "status": 0
+        if response.status_code != 404:
+            response.raise_for_status()
+
+        start = time.perf_counter()
+        try:
+            food_info = loads(response.content)
+        except ValueError as e:
+            # Raised as a RequestException, like response.json(), so callers treat it as a failed lookup
+            raise requests.exceptions.JSONDecodeError(
+                getattr(e, "msg", str(e)), getattr(e, "doc", ""), getattr(e, "pos", 0), response=response
+            ) from e
+        parse_seconds = time.perf_counter() - start
+
+        from_cache = getattr(response, "from_cache", False)
+        self.fetch_stats.record(0 if from_cache else len(response.content), parse_seconds)
 
         if food_info.get("status") != 1:
             return None
 
-        product = food_info["product"]
-        return FoodProduct(
-            product_name=product.get("product_name"),
-            brands=[tag.replace('en:', '') for tag in product.get('brands_tags', [])],
-            categories=[tag.replace('en:', '') for tag in product.get('categories_tags', [])],
-            image_url=product.get('image_front_url')
-        )
+        return FoodProduct.from_api(food_info["product"])
 
     def fetch_image(self, product):
         """
@@ -70,6 +212,31 @@ class OpenFoodClient:
             Image: A PIL Image object of the product's image.
         """
         if product.image_url:
-            response = self.session.get(product.image_url)
+            if self.image_store is not None:
+                return self.image_store.open(self.store_image(product))
+
+            response = self.session.get(product.image_url, timeout=self.timeout)
             img = Image.open(BytesIO(response.content))
             return img
+
+    def store_image(self, product):
+        """
+        Downloads the product image into the image store, unless it was downloaded before.
+
+        Args:
+            product (FoodProduct): The product object with an image URL.
+
+        Returns:
+            str: The content hash of the image in the image store, or None if the product has no image.
+        """
+        if self.image_store is None:
+            raise ValueError("No image store configured.")
+        if not product.image_url:
+            return None
+
+        image_hash = self.image_store.get_url(product.image_url)
+        if image_hash is None:
+            response = self.session.get(product.image_url, timeout=self.timeout)
+            response.raise_for_status()
+            image_hash = self.image_store.put_url(product.image_url, response.content)
+        return image_hash
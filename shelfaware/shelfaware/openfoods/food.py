@@ -18,5 +18,23 @@ class FoodProduct:
         self.categories = categories
         self.image_url = image_url
 
+    @classmethod
+    def from_api(cls, product):
+        """
+        Builds a FoodProduct from the "product" object of an Open Food Facts API response or data dump.
+
+        Args:
+            product (dict): The product document.
+
+        Returns:
+            FoodProduct: The product with language prefixes removed from its tags.
+        """
+        return cls(
+            product_name=product.get("product_name"),
+            brands=[tag.replace('en:', '') for tag in product.get('brands_tags') or []],
+            categories=[tag.replace('en:', '') for tag in product.get('categories_tags') or []],
+            image_url=product.get('image_front_url')
+        )
+
     def __repr__(self):
         return f"<FoodProduct(name={self.product_name}, brands={self.brands}, categories={self.categories})>"
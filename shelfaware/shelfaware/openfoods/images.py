@@ -0,0 +1,149 @@
+"""
+Content-addressed on-disk store for product images and their thumbnails.
+
+Images are stored under the SHA-256 of their bytes, so each image is kept once however many
+products or URLs point to it, and only the hash needs to be stored in the database.
+"""
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+
+
+class ImageStore:
+    """
+    Stores original images and fixed-size thumbnails by content hash.
+
+    Attributes:
+        root (str): Directory holding the images.
+        thumbnail_size (tuple): Maximum (width, height) of thumbnails.
+        thumbnail_format (str): PIL format of thumbnails, "WEBP" or "JPEG".
+    """
+
+    def __init__(self, root="openfoods_images", thumbnail_size=(256, 256), thumbnail_format="WEBP", quality=80):
+        """
+        Initializes the ImageStore.
+
+        Args:
+            root (str): Directory holding the images. Created if it does not exist.
+            thumbnail_size (tuple): Maximum (width, height) of thumbnails. Defaults to (256, 256).
+            thumbnail_format (str): "WEBP" or "JPEG". Defaults to "WEBP".
+            quality (int): Encoder quality of thumbnails. Defaults to 80.
+        """
+        if thumbnail_format not in ("WEBP", "JPEG"):
+            raise ValueError(f"Unsupported thumbnail format {thumbnail_format}.")
+        self.root = root
+        self.thumbnail_size = tuple(thumbnail_size)
+        self.thumbnail_format = thumbnail_format
+        self.quality = quality
+        os.makedirs(os.path.join(root, "urls"), exist_ok=True)
+
+    def _dir(self, image_hash):
+        return os.path.join(self.root, image_hash[:2])
+
+    def path(self, image_hash):
+        return os.path.join(self._dir(image_hash), image_hash)
+
+    def thumbnail_path(self, image_hash):
+        width, height = self.thumbnail_size
+        extension = "webp" if self.thumbnail_format == "WEBP" else "jpg"
+        return os.path.join(self._dir(image_hash), f"{image_hash}_{width}x{height}.{extension}")
+
+    def __contains__(self, image_hash):
+        return os.path.exists(self.path(image_hash))
+
+    def put(self, data):
+        """
+        Stores image bytes and their thumbnail, unless an identical image is already stored.
+
+        Args:
+            data (bytes): The encoded image.
+
+        Returns:
+            str: The SHA-256 hex digest identifying the image.
+        """
+        image_hash = hashlib.sha256(data).hexdigest()
+        if image_hash not in self:
+            os.makedirs(self._dir(image_hash), exist_ok=True)
+            self._write(self.thumbnail_path(image_hash), self.make_thumbnail(data))
+            # The original is written last, so a stored hash always has its thumbnail
+            self._write(self.path(image_hash), data)
+        return image_hash
+
+    def make_thumbnail(self, data):
+        """
+        Builds a thumbnail that fits in thumbnail_size.
+
+        JPEGs are decoded in draft mode, which lets libjpeg scale them down by up to 8x while
+        decoding instead of decoding the full-size image first.
+
+        Args:
+            data (bytes): The encoded image.
+
+        Returns:
+            bytes: The encoded thumbnail.
+        """
+        with Image.open(BytesIO(data)) as img:
+            if img.format == "JPEG":
+                img.draft("RGB", self.thumbnail_size)
+            img = img.convert("RGB")
+            img.thumbnail(self.thumbnail_size)
+
+            output = BytesIO()
+            img.save(output, format=self.thumbnail_format, quality=self.quality)
+            return output.getvalue()
+
+    def open(self, image_hash):
+        return Image.open(self.path(image_hash))
+
+    def open_thumbnail(self, image_hash):
+        return Image.open(self.thumbnail_path(image_hash))
+
+    def _url_path(self, url):
+        return os.path.join(self.root, "urls", hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def get_url(self, url):
+        """
+        Returns the hash of an image previously stored from a URL.
+
+        Args:
+            url (str): The URL the image was downloaded from.
+
+        Returns:
+            str: The image hash, or None if the URL has not been downloaded.
+        """
+        try:
+            with open(self._url_path(url)) as f:
+                image_hash = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return image_hash if image_hash in self else None
+
+    def put_url(self, url, data):
+        """
+        Stores image bytes downloaded from a URL and remembers the URL.
+
+        Args:
+            url (str): The URL the image was downloaded from.
+            data (bytes): The encoded image.
+
+        Returns:
+            str: The SHA-256 hex digest identifying the image.
+        """
+        image_hash = self.put(data)
+        self._write(self._url_path(url), image_hash.encode("ascii"))
+        return image_hash
+
+    def _write(self, path, data):
+        # Write to a temporary file and rename it, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
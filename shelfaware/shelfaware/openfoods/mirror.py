@@ -0,0 +1,206 @@
+"""
+Local mirror of the Open Food Facts database, for resolving barcodes without calling the API.
+
+The mirror is a SQLite file holding only the fields FoodProduct needs, keyed by barcode. It is
+built by streaming the Open Food Facts JSONL or CSV data dump, which can be imported in pieces:
+progress is committed with every batch, so an interrupted import resumes where it stopped.
+
+Usage:
+    python -m shelfaware.openfoods.mirror openfoodfacts-products.jsonl.gz --db openfoods_mirror.db
+"""
+
+import argparse
+import csv
+import gzip
+import os
+import sqlite3
+import sys
+import threading
+from itertools import islice
+
+from ._json import loads
+from .food import FoodProduct
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    code TEXT PRIMARY KEY,
+    product_name TEXT,
+    brands TEXT,
+    categories TEXT,
+    image_url TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    records_done INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, "r", encoding="utf-8", errors="replace", newline="")
+
+
+def _iter_jsonl(f, skip):
+    # Skipped lines are never parsed, which keeps resuming a large import cheap
+    for line in islice(f, skip, None):
+        line = line.strip()
+        if not line:
+            yield None
+            continue
+        try:
+            product = loads(line)
+        except ValueError:
+            yield None
+            continue
+        yield product.get("code"), FoodProduct.from_api(product)
+
+
+def _iter_csv(f, skip):
+    csv.field_size_limit(sys.maxsize)
+    for row in islice(csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE), skip, None):
+        # The CSV dump stores tags comma separated and names the front image "image_url"
+        yield row.get("code"), FoodProduct.from_api({
+            "product_name": row.get("product_name") or None,
+            "brands_tags": [tag for tag in (row.get("brands_tags") or "").split(",") if tag],
+            "categories_tags": [tag for tag in (row.get("categories_tags") or "").split(",") if tag],
+            "image_front_url": row.get("image_url") or None,
+        })
+
+
+class ProductMirror:
+    """
+    Barcode-indexed local store of Open Food Facts products.
+
+    Attributes:
+        path (str): Path of the SQLite file.
+    """
+
+    def __init__(self, path="openfoods_mirror.db"):
+        """
+        Opens (and creates if needed) the mirror.
+
+        Args:
+            path (str): Path of the SQLite file. Defaults to "openfoods_mirror.db".
+        """
+        self.path = path
+        # Lookups are short, so one connection shared under a lock is enough for the client's thread pool
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def get(self, code):
+        """
+        Looks up a product by barcode.
+
+        Args:
+            code (str): The barcode of the product.
+
+        Returns:
+            FoodProduct: The product, or None if the barcode is not in the mirror.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT product_name, brands, categories, image_url FROM products WHERE code = ?", (code,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        product_name, brands, categories, image_url = row
+        return FoodProduct(
+            product_name=product_name,
+            brands=brands.split(",") if brands else [],
+            categories=categories.split(",") if categories else [],
+            image_url=image_url,
+        )
+
+    def import_dump(self, dump_path, batch_size=10000, limit=None):
+        """
+        Streams an Open Food Facts JSONL or tab-separated CSV dump (optionally gzipped) into the mirror.
+
+        Records are written in batches, each committed together with the number of records done, so
+        re-running the import of the same dump skips what was already imported.
+
+        Args:
+            dump_path (str): Path of the dump. Files ending in .csv or .csv.gz are read as CSV.
+            batch_size (int): Records written per transaction. Defaults to 10000.
+            limit (int): Stop after this many records in this run. Defaults to no limit.
+
+        Returns:
+            int: Number of products written in this run.
+        """
+        source = os.path.abspath(dump_path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT records_done, completed FROM imports WHERE source = ?", (source,)
+            ).fetchone()
+        records_done, completed = row if row else (0, 0)
+        if completed:
+            return 0
+
+        is_csv = dump_path.endswith((".csv", ".csv.gz"))
+        written = 0
+        processed = 0
+        batch = []
+
+        with _open_text(dump_path) as f:
+            records = _iter_csv(f, records_done) if is_csv else _iter_jsonl(f, records_done)
+            for record in records:
+                if limit is not None and processed >= limit:
+                    break
+
+                processed += 1
+                if record is not None and record[0]:
+                    code, product = record
+                    batch.append((
+                        code,
+                        product.product_name,
+                        ",".join(product.brands),
+                        ",".join(product.categories),
+                        product.image_url,
+                    ))
+
+                if processed % batch_size == 0:
+                    written += self._write_batch(source, batch, records_done + processed, completed=False)
+                    batch = []
+            else:
+                written += self._write_batch(source, batch, records_done + processed, completed=True)
+                return written
+
+        written += self._write_batch(source, batch, records_done + processed, completed=False)
+        return written
+
+    def _write_batch(self, source, batch, records_done, completed):
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)", batch)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO imports (source, records_done, completed) VALUES (?, ?, ?)",
+                (source, records_done, int(completed)),
+            )
+        return len(batch)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import an Open Food Facts data dump into a local mirror.")
+    parser.add_argument("dump", help="Path of the JSONL or CSV dump, optionally gzipped")
+    parser.add_argument("--db", default="openfoods_mirror.db", help="Path of the mirror database")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    mirror = ProductMirror(args.db)
+    written = mirror.import_dump(args.dump, batch_size=args.batch_size)
+    print(f"Imported {written} products, {len(mirror)} in {args.db}")
+    mirror.close()
@@ -0,0 +1,109 @@
+import json
+import unittest
+from unittest.mock import Mock
+from shelfaware.openfoods.cache import LRUCache, ProductCache
+from shelfaware.openfoods.client import OpenFoodClient
+from shelfaware.openfoods.food import FoodProduct
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(max_size=10, ttl=5, clock=clock)
+        cache.put("a", 1)
+
+        clock.now = 4
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 5
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+
+class TestProductCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ProductCache(max_size=2, ttl=100, negative_max_size=2, negative_ttl=10, clock=self.clock)
+        self.product = FoodProduct("Rolled Oats", ["aldi"], [], None)
+
+    def test_positive_and_negative_entries(self):
+        self.assertEqual(self.cache.lookup("111"), (False, None))
+
+        self.cache.store("111", self.product)
+        self.cache.store("222", None)
+
+        self.assertEqual(self.cache.lookup("111"), (True, self.product))
+        self.assertEqual(self.cache.lookup("222"), (True, None))
+
+        # Negative entries expire sooner than products
+        self.clock.now = 10
+        self.assertEqual(self.cache.lookup("222"), (False, None))
+        self.assertEqual(self.cache.lookup("111"), (True, self.product))
+
+    def test_stats(self):
+        self.cache.lookup("111")
+        self.cache.store("111", self.product)
+        self.cache.lookup("111")
+        self.cache.store("222", None)
+        self.cache.lookup("222")
+        for code in ("333", "444"):
+            self.cache.store(code, self.product)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["negative_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3)
+
+
+class TestClientProductCache(unittest.TestCase):
+
+    def setUp(self):
+        self.client = OpenFoodClient(cache=False, product_cache=ProductCache())
+        self.client.session = Mock()
+
+    def test_repeated_lookups_skip_the_session(self):
+        self.client.session.get.return_value.content = json.dumps({
+            "status": 1, "product": {"product_name": "Rolled Oats"}
+        }).encode()
+
+        first = self.client.fetch_product("4099100207149")
+        second = self.client.fetch_product("4099100207149")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.client.session.get.call_count, 1)
+
+    def test_not_found_is_cached(self):
+        self.client.session.get.return_value.content = b'{"status": 0}'
+
+        self.assertIsNone(self.client.fetch_product("invalid_code"))
+        self.assertIsNone(self.client.fetch_product("invalid_code"))
+        self.assertEqual(self.client.session.get.call_count, 1)
+        self.assertEqual(self.client.product_cache.negative_hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import requests
+from shelfaware.openfoods.client import PRODUCT_FIELDS, OpenFoodClient
+from shelfaware.openfoods.food import FoodProduct
+
+RESPONSE_DELAY = 0.05
+
+
+class FakeOpenFoodsHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Open Food Facts product API with a fixed response delay."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        code = url.path.rsplit("/", 1)[-1].removesuffix(".json")
+        self.server.requests[code] += 1
+        time.sleep(RESPONSE_DELAY)
+
+        if code.startswith("missing"):
+            body = {"status": 0}
+        else:
+            product = {
+                "product_name": f"Product {code}",
+                "brands_tags": ["aldi"],
+                "nutriments": {f"nutrient-{i}_100g": i for i in range(200)},
+            }
+            fields = parse_qs(url.query).get("fields")
+            if fields:
+                product = {key: value for key, value in product.items() if key in fields[0].split(",")}
+            body = {"code": code, "status": 1, "product": product}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestFetchProducts(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenFoodsHandler)
+        cls.server.requests = Counter()
+        # Clients that time out close the connection before the response is written
+        cls.server.handle_error = lambda request, client_address: None
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_port}/api/v0/product/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.client = OpenFoodClient(cache=False, api_url=self.api_url, max_workers=8)
+
+    def test_results_in_input_order(self):
+        codes = ["111", "missing1", "222"]
+        products = self.client.fetch_products(codes)
+
+        self.assertEqual(len(products), 3)
+        self.assertIsInstance(products[0], FoodProduct)
+        self.assertEqual(products[0].product_name, "Product 111")
+        self.assertIsNone(products[1])
+        self.assertEqual(products[2].product_name, "Product 222")
+
+    def test_duplicate_codes_are_requested_once(self):
+        products = self.client.fetch_products(["111", "222", "111", "111"])
+
+        self.assertEqual(self.server.requests, Counter({"111": 1, "222": 1}))
+        self.assertIs(products[0], products[2])
+
+    def test_concurrent_callers_share_in_flight_request(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.client.fetch_product("333"))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(self.server.requests["333"], 1)
+
+    def test_faster_than_sequential_loop(self):
+        codes = [str(code) for code in range(1000, 1024)]
+
+        start = time.perf_counter()
+        sequential = [self.client.fetch_product(code) for code in codes]
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        concurrent = self.client.fetch_products(codes)
+        concurrent_time = time.perf_counter() - start
+
+        print(f"\nsequential: {sequential_time:.3f}s, fetch_products: {concurrent_time:.3f}s "
+              f"({sequential_time / concurrent_time:.1f}x speedup)")
+        self.assertEqual([p.product_name for p in sequential], [p.product_name for p in concurrent])
+        self.assertLess(concurrent_time, sequential_time / 3)
+
+    def test_slim_payload(self):
+        slim_client = OpenFoodClient(cache=False, api_url=self.api_url, fields=PRODUCT_FIELDS)
+
+        full = self.client.fetch_product("555")
+        slim = slim_client.fetch_product("555")
+
+        self.assertEqual((slim.product_name, slim.brands), (full.product_name, full.brands))
+        self.assertEqual(slim_client.fetch_stats.requests, 1)
+        self.assertLess(slim_client.fetch_stats.bytes_downloaded, self.client.fetch_stats.bytes_downloaded / 10)
+
+    def test_request_timeout(self):
+        client = OpenFoodClient(cache=False, api_url=self.api_url, timeout=RESPONSE_DELAY / 5)
+        with self.assertRaises(requests.exceptions.Timeout):
+            client.fetch_product("444")
+
+if __name__ == "__main__":
+    unittest.main()
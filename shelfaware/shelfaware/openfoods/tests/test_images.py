@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+from unittest.mock import Mock
+from PIL import Image
+from shelfaware.openfoods.client import OpenFoodClient
+from shelfaware.openfoods.food import FoodProduct
+from shelfaware.openfoods.images import ImageStore
+
+
+def make_jpeg(size=(2000, 1500), color=(200, 120, 40)):
+    output = BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+
+class TestImageStore(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = ImageStore(self.root, thumbnail_size=(256, 256))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_put_is_content_addressed(self):
+        data = make_jpeg()
+        image_hash = self.store.put(data)
+
+        self.assertEqual(len(image_hash), 64)
+        self.assertIn(image_hash, self.store)
+        self.assertEqual(self.store.put(data), image_hash)
+        self.assertNotEqual(self.store.put(make_jpeg(color=(0, 0, 0))), image_hash)
+
+        with open(self.store.path(image_hash), "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_thumbnail_fits_size(self):
+        image_hash = self.store.put(make_jpeg())
+
+        with self.store.open_thumbnail(image_hash) as thumbnail:
+            self.assertEqual(thumbnail.format, "WEBP")
+            self.assertEqual(thumbnail.size, (256, 192))
+
+    def test_jpeg_thumbnails(self):
+        store = ImageStore(self.root, thumbnail_size=(100, 100), thumbnail_format="JPEG")
+        image_hash = store.put(make_jpeg(size=(300, 600)))
+
+        with store.open_thumbnail(image_hash) as thumbnail:
+            self.assertEqual(thumbnail.format, "JPEG")
+            self.assertEqual(thumbnail.size, (50, 100))
+
+    def test_client_downloads_image_once(self):
+        client = OpenFoodClient(cache=False, image_store=self.store)
+        client.session = Mock()
+        client.session.get.return_value.content = make_jpeg()
+        product = FoodProduct("Rolled Oats", [], [], "https://images.openfoodfacts.org/front_en.jpg")
+
+        image_hash = client.store_image(product)
+        self.assertEqual(client.store_image(product), image_hash)
+        with client.fetch_image(product) as img:
+            self.assertEqual(img.size, (2000, 1500))
+
+        self.assertEqual(client.session.get.call_count, 1)
+        self.assertTrue(os.path.exists(self.store.thumbnail_path(image_hash)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+from shelfaware.openfoods.client import OpenFoodClient
+from shelfaware.openfoods.mirror import ProductMirror
+
+DUMP_PATH = os.path.join(os.path.dirname(__file__), "products_dump.jsonl")
+
+CSV_DUMP = (
+    "code\tproduct_name\tbrands_tags\tcategories_tags\timage_url\n"
+    "4099100207149\tRolled Oats\tmillville,aldi\ten:breakfasts,en:rolled-oats\thttps://example.com/oats.jpg\n"
+    "0041196910759\tTomato Soup\tprogresso\ten:soups\t\n"
+)
+
+
+class TestProductMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.mirror = ProductMirror(os.path.join(self.tmpdir, "mirror.db"))
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_import_jsonl(self):
+        written = self.mirror.import_dump(DUMP_PATH)
+
+        # Blank lines, invalid JSON and products without a barcode are skipped
+        self.assertEqual(written, 4)
+        self.assertEqual(len(self.mirror), 4)
+
+        product = self.mirror.get("4099100207149")
+        self.assertEqual(product.product_name, "Rolled Oats")
+        self.assertEqual(product.brands, ["millville", "aldi"])
+        self.assertEqual(product.categories, ["breakfasts", "rolled-oats"])
+        self.assertTrue(product.image_url.endswith("front_en.3.400.jpg"))
+
+        self.assertIsNone(self.mirror.get("0000000000000"))
+
+    def test_import_gzipped_csv(self):
+        dump_path = os.path.join(self.tmpdir, "products.csv.gz")
+        with gzip.open(dump_path, "wt", encoding="utf-8") as f:
+            f.write(CSV_DUMP)
+
+        self.assertEqual(self.mirror.import_dump(dump_path), 2)
+
+        product = self.mirror.get("0041196910759")
+        self.assertEqual(product.brands, ["progresso"])
+        self.assertEqual(product.categories, ["soups"])
+        self.assertIsNone(product.image_url)
+
+    def test_import_resumes(self):
+        # Interrupt the import after three records, then run it again
+        first_run = self.mirror.import_dump(DUMP_PATH, batch_size=2, limit=3)
+        self.assertEqual(first_run, 2)
+        self.assertIsNone(self.mirror.get("3017620422003"))
+
+        second_run = self.mirror.import_dump(DUMP_PATH, batch_size=2)
+        self.assertEqual(second_run, 2)
+        self.assertEqual(len(self.mirror), 4)
+
+        # A completed import is not repeated
+        self.assertEqual(self.mirror.import_dump(DUMP_PATH), 0)
+
+    def test_client_uses_mirror_before_network(self):
+        self.mirror.import_dump(DUMP_PATH)
+        client = OpenFoodClient(cache=False, mirror=self.mirror)
+        client.session = Mock()
+        client.session.get.return_value.content = b'{"status": 0}'
+
+        self.assertEqual(client.fetch_product("3017620422003").product_name, "Nutella")
+        client.session.get.assert_not_called()
+
+        # Barcodes missing from the mirror still go to the API
+        self.assertIsNone(client.fetch_product("0000000000000"))
+        self.assertEqual(client.session.get.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import json
 import unittest
 from unittest.mock import patch, Mock
+
+import requests
 from shelfaware.openfoods.client import OpenFoodClient
 from shelfaware.openfoods.food import FoodProduct
 
@@ -28,11 +31,11 @@ MOCK_PRODUCT_RESPONSE = {
 
 class TestOpenFoodClient(unittest.TestCase):
     
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_product_success(self, mock_get):
         # Mock the response with your mock data
         mock_response = Mock()
-        mock_response.json.return_value = MOCK_PRODUCT_RESPONSE
+        mock_response.content = json.dumps(MOCK_PRODUCT_RESPONSE).encode()
         mock_get.return_value = mock_response
 
         client = OpenFoodClient(cache=False)
@@ -58,18 +61,43 @@ class TestOpenFoodClient(unittest.TestCase):
         ])
         self.assertEqual(product.image_url, "https://images.openfoodfacts.org/images/products/409/910/020/7149/front_en.3.400.jpg")
     
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_product_not_found(self, mock_get):
         # Mock response for product not found
         mock_response = Mock()
-        mock_response.json.return_value = {"status": 0}
+        mock_response.content = json.dumps({"status": 0}).encode()
         mock_get.return_value = mock_response
 
-        client = OpenFoodClient()
+        client = OpenFoodClient(cache=False)
         product = client.fetch_product("invalid_code")
 
         # Ensure that None is returned when the product is not found
         self.assertIsNone(product)
 
+    @patch('requests.Session.request')
+    def test_fetch_product_server_error(self, mock_get):
+        # Mock a gateway error page
+        mock_response = Mock()
+        mock_response.status_code = 502
+        mock_response.content = b"<html><body>Bad Gateway</body></html>"
+        mock_response.raise_for_status.side_effect = requests.HTTPError("502 Server Error")
+        mock_get.return_value = mock_response
+
+        client = OpenFoodClient(cache=False)
+        with self.assertRaises(requests.RequestException):
+            client.fetch_product("4099100207149")
+
+    @patch('requests.Session.request')
+    def test_fetch_product_invalid_json(self, mock_get):
+        # Mock a successful response whose body is not JSON
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b"<html><body>Maintenance</body></html>"
+        mock_get.return_value = mock_response
+
+        client = OpenFoodClient(cache=False)
+        with self.assertRaises(requests.RequestException):
+            client.fetch_product("4099100207149")
+
 if __name__ == "__main__":
     unittest.main()
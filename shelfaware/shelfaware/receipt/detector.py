@@ -0,0 +1,167 @@
+"""
+Receipt detection with a YOLO model and line-item extraction with local OCR.
+
+An image goes through these stages, each timed:
+    load        decode the image (at reduced scale for large photos)
+    detect      find the receipt with the YOLO model
+    preprocess  crop, scale, deskew and binarize only the receipt region
+    ocr         read the text of the prepared region
+    parse       turn the text into line items
+
+OCR is by far the most expensive stage, so it only ever sees the detected region, and images
+without a receipt stop after detection. The model is trained on the ReceiptExtractorIS dataset
+(dev_notebooks/ReceiptExtractorIS-1.yaml) and runs through the same inference backends as
+BarcodeDetector.
+"""
+
+import time
+
+from shelfaware.barcode.backends import make_backend
+from shelfaware.barcode.loading import load_image
+
+from .parsing import parse_line_items
+from .preprocess import prepare_receipt
+
+STAGES = ("load", "detect", "preprocess", "ocr", "parse")
+
+
+class ReceiptScan:
+    """
+    Result of reading one receipt image.
+
+    Attributes:
+        box (list): The receipt's (x1, y1, x2, y2) box, or None if no receipt was found.
+        text (str): The OCR'd text of the receipt region.
+        items (list): ReceiptLineItem objects parsed from the text.
+        timings (dict): Seconds spent in each stage that ran.
+    """
+
+    def __init__(self, box=None, text="", items=None, timings=None):
+        self.box = box
+        self.text = text
+        self.items = items or []
+        self.timings = timings or {}
+
+    @property
+    def total_seconds(self):
+        return sum(self.timings.values())
+
+    def __repr__(self):
+        stages = ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in self.timings.items())
+        return f"<ReceiptScan(items={len(self.items)}, {stages})>"
+
+
+class ReceiptDetector:
+    """
+    A class to find receipts in images and read their line items.
+
+    Attributes:
+        backend (UltralyticsBackend or OnnxBackend): Runs the YOLO model used for detecting receipts.
+        confidence_threshold (float): The confidence threshold for receipt detection.
+        ocr (callable): OCR engine taking a binarized image and returning its text.
+        load_size (int): Minimum longest side encoded images are decoded at, or None for full size.
+        target_width (int): Width the receipt crop is scaled to before OCR.
+        stage_seconds (dict): Total seconds per stage over every scan.
+    """
+
+    def __init__(self, model_path="models/receipts.pt", confidence_threshold=0.5, ocr=None, backend="ultralytics",
+                 load_size=1600, target_width=1000):
+        """
+        Initializes the ReceiptDetector.
+
+        Args:
+            model_path (str): Path to the receipt YOLO model weights.
+            confidence_threshold (float): The confidence threshold for receipt detection.
+            ocr (callable): OCR engine. Defaults to TesseractOcr.
+            backend (str): "ultralytics" or "onnx", as for BarcodeDetector.
+            load_size (int): Passed to load_image. Defaults to 1600.
+            target_width (int): Width the receipt crop is scaled to before OCR. Defaults to 1000.
+        """
+        if ocr is None:
+            from .ocr import TesseractOcr
+            ocr = TesseractOcr()
+        self.backend = make_backend(backend, model_path)
+        self.confidence_threshold = confidence_threshold
+        self.ocr = ocr
+        self.load_size = load_size
+        self.target_width = target_width
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+
+    def find_receipt(self, image_rgb):
+        """
+        Finds the receipt in an image.
+
+        Args:
+            image_rgb (np.ndarray): The image in RGB format.
+
+        Returns:
+            list: The most confident receipt box as (x1, y1, x2, y2), or None.
+        """
+        # Both backends return boxes sorted by confidence
+        boxes = self.backend.detect([image_rgb], self.confidence_threshold)[0]
+        return boxes[0] if boxes else None
+
+    def scan(self, input_image):
+        """
+        Finds the receipt in an image and reads its line items.
+
+        Args:
+            input_image (str or bytes or np.ndarray or PIL.Image): The input image which can be a file path,
+            encoded image bytes, a cv2 image (numpy array), or a PIL Image.
+
+        Returns:
+            ReceiptScan: The receipt box, text, line items and per-stage timings.
+        """
+        result = ReceiptScan()
+
+        start = time.perf_counter()
+        image_rgb = load_image(input_image, self.load_size)
+        start = self._timed(result, "load", start)
+
+        result.box = self.find_receipt(image_rgb)
+        start = self._timed(result, "detect", start)
+        if result.box is None:
+            return result
+
+        prepared = prepare_receipt(image_rgb, result.box, target_width=self.target_width)
+        start = self._timed(result, "preprocess", start)
+
+        result.text = self.ocr(prepared)
+        start = self._timed(result, "ocr", start)
+
+        result.items = parse_line_items(result.text)
+        self._timed(result, "parse", start)
+        return result
+
+    def _timed(self, result, stage, start):
+        now = time.perf_counter()
+        result.timings[stage] = now - start
+        self.stage_seconds[stage] += now - start
+        return now
+
+
+def add_line_items(inventory, username, list_name, items, category_name="Uncategorized"):
+    """
+    Adds receipt line items to a user's list in one bulk insert.
+
+    Args:
+        inventory (InventoryManager): The inventory to add to.
+        username (str): Owner of the list.
+        list_name (str): The list the items go on.
+        items (list): ReceiptLineItem objects, e.g. ReceiptScan.items.
+        category_name (str): Category of every item, created if missing. Defaults to "Uncategorized".
+
+    Returns:
+        BulkInsertResult: The number of rows inserted and the errors of the skipped rows.
+    """
+    inventory.add_category(category_name)
+    return inventory.add_list_items_bulk(
+        {
+            "username": username,
+            "list_name": list_name,
+            "item_name": item.name,
+            "quantity": item.quantity,
+            "category_name": category_name,
+        }
+        for item in items
+    )
@@ -0,0 +1,45 @@
+"""
+Local OCR engines for receipt text.
+
+An OCR engine is any callable that takes a binarized image (numpy array) and returns its text
+with one receipt line per line. Tesseract is the default; it runs locally, so receipts never
+leave the machine. pytesseract and the tesseract binary are optional dependencies, installed
+with `pip install shelfaware[ocr]` and the system tesseract package.
+"""
+
+
+class TesseractOcr:
+    """
+    Reads text with Tesseract through pytesseract.
+
+    Attributes:
+        lang (str): Tesseract language code.
+        config (str): Extra Tesseract options.
+    """
+
+    def __init__(self, lang="eng", page_segmentation_mode=6, config=""):
+        """
+        Initializes the TesseractOcr.
+
+        Args:
+            lang (str): Tesseract language code. Defaults to "eng".
+            page_segmentation_mode (int): Tesseract --psm. Defaults to 6, a single uniform block
+                of text, which suits a cropped receipt and skips Tesseract's page layout analysis.
+            config (str): Extra Tesseract options.
+        """
+        self.lang = lang
+        self.config = f"--psm {page_segmentation_mode} {config}".strip()
+
+    def __call__(self, image):
+        """
+        Reads the text of an image.
+
+        Args:
+            image (np.ndarray): The binarized receipt, black text on white.
+
+        Returns:
+            str: The text, one line per receipt line.
+        """
+        import pytesseract
+
+        return pytesseract.image_to_string(image, lang=self.lang, config=self.config)
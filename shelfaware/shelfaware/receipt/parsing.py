@@ -0,0 +1,115 @@
+"""
+Parsing of OCR'd receipt text into line items.
+
+Receipts differ between stores, so the parser only relies on what most grocery receipts share:
+one item per line with its price at the end, an optional quantity ("2 @ 1.99", "2 AT 1.99",
+"2 x MILK", "1.25 lb @ 0.59 /lb"), item codes before the name, and totals, taxes and payments that are not
+items.
+"""
+
+import re
+
+PRICE = re.compile(r"(-?)\$?\s?(\d{1,5}[.,]\d{2})\s*-?(?:[A-Z*]{1,2})?$")
+QUANTITY_AT = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*(?:lbs?|kg|oz|ea)?\s*(?:@|x|\bat\b)\s*\$?\d+[.,]\d{2}\s*(?:/\s*(?:lbs?|kg|oz|ea))?",
+    re.IGNORECASE,
+)
+QUANTITY_PREFIX = re.compile(r"^(\d{1,2})\s*[xX@]?\s+(?=[A-Za-z])")
+ITEM_CODE = re.compile(r"^\d{4,14}\s+")
+
+# Lines with these words are totals, taxes, payments or store details rather than items
+NON_ITEM_WORDS = (
+    "TOTAL", "SUBTOTAL", "SUB TOTAL", "TAX", "BALANCE", "CHANGE", "CASH", "VISA", "MASTERCARD", "AMEX",
+    "DEBIT", "CREDIT", "TEND", "PAYMENT", "AMOUNT", "SAVINGS", "YOU SAVED", "DISCOUNT", "COUPON",
+    "ITEMS SOLD", "AUTH", "APPROVED", "REFUND", "TOTAL DUE",
+)
+NON_ITEM = re.compile(r"\b(?:" + "|".join(re.escape(word) for word in NON_ITEM_WORDS) + r")\b", re.IGNORECASE)
+
+
+class ReceiptLineItem:
+    """
+    An item read from a receipt.
+
+    Attributes:
+        name (str): The item name as printed, without item codes.
+        quantity (float): Number of units, or the weight for items sold by weight.
+        price (float): The line total.
+        line (str): The OCR'd line the price was read from.
+    """
+
+    def __init__(self, name, quantity=1.0, price=None, line=None):
+        self.name = name
+        self.quantity = quantity
+        self.price = price
+        self.line = line
+
+    def as_dict(self):
+        return {"name": self.name, "quantity": self.quantity, "price": self.price}
+
+    def __repr__(self):
+        return f"<ReceiptLineItem(name={self.name!r}, quantity={self.quantity}, price={self.price})>"
+
+
+def _number(text):
+    return float(text.replace(",", "."))
+
+
+def _clean_name(text):
+    text = ITEM_CODE.sub("", text.strip())
+    text = re.sub(r"\s+", " ", text).strip(" .:-*")
+    return text if sum(char.isalpha() for char in text) >= 2 else ""
+
+
+def parse_line_items(text):
+    """
+    Parses the line items out of OCR'd receipt text.
+
+    A line without a price is kept as the name of the next priced line that has none of its
+    own, which covers items whose quantity and price are printed on the following line.
+
+    Args:
+        text (str): The receipt text, one receipt line per line.
+
+    Returns:
+        list: ReceiptLineItem objects in receipt order.
+    """
+    items = []
+    pending_name = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if NON_ITEM.search(line):
+            pending_name = ""
+            continue
+
+        quantity = 1.0
+        rest = line
+        match = QUANTITY_AT.search(rest)
+        if match:
+            quantity = _number(match.group(1))
+            rest = rest[:match.start()] + " " + rest[match.end():]
+
+        price_match = PRICE.search(rest.strip())
+        if not price_match:
+            if match and items and not pending_name:
+                # A quantity line printed under an item that already has its price
+                items[-1].quantity = quantity
+            else:
+                pending_name = _clean_name(rest) or pending_name
+            continue
+
+        rest = rest.strip()[:price_match.start()]
+        if not match:
+            prefix = QUANTITY_PREFIX.match(rest)
+            if prefix:
+                quantity = float(prefix.group(1))
+                rest = rest[prefix.end():]
+
+        name = _clean_name(rest) or pending_name
+        pending_name = ""
+        if not name or price_match.group(1) == "-":
+            # Nameless amounts and negative lines are discounts, deposits or fragments
+            continue
+        items.append(ReceiptLineItem(name, quantity, _number(price_match.group(2)), line))
+    return items
@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+import cv2
+import numpy as np
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+from shelfaware.receipt.detector import STAGES, ReceiptDetector, add_line_items
+from shelfaware.receipt.parsing import ReceiptLineItem
+
+
+class TestReceiptDetector(unittest.TestCase):
+
+    def setUp(self):
+        # Stand-ins for the YOLO model and Tesseract, which are not needed to test the pipeline
+        self.backend = Mock()
+        self.backend.detect.return_value = [[[100.0, 50.0, 300.0, 450.0], [0.0, 0.0, 20.0, 20.0]]]
+        self.ocr = Mock(return_value="MILK 3.48\nEGGS 4.49\nTOTAL 7.97\n")
+        with patch("shelfaware.receipt.detector.make_backend", return_value=self.backend):
+            self.detector = ReceiptDetector(ocr=self.ocr, target_width=400)
+
+        image = np.full((480, 640, 3), 60, dtype=np.uint8)
+        image[50:450, 100:300] = 230
+        self.image_bytes = cv2.imencode(".jpg", image)[1].tobytes()
+
+    def test_scan(self):
+        result = self.detector.scan(self.image_bytes)
+
+        self.assertEqual(result.box, [100.0, 50.0, 300.0, 450.0])
+        self.assertEqual([(item.name, item.price) for item in result.items], [("MILK", 3.48), ("EGGS", 4.49)])
+        self.assertEqual(tuple(result.timings), STAGES)
+        self.assertEqual(self.detector.stage_seconds["ocr"], result.timings["ocr"])
+
+        # OCR only sees the binarized receipt region, scaled to target_width
+        prepared, = self.ocr.call_args.args
+        self.assertEqual(prepared.ndim, 2)
+        self.assertEqual(prepared.shape[1], 400)
+        self.assertAlmostEqual(prepared.shape[0], 400 * 408 / 204, delta=4)
+
+    def test_no_receipt_skips_ocr(self):
+        self.backend.detect.return_value = [[]]
+        result = self.detector.scan(self.image_bytes)
+
+        self.assertIsNone(result.box)
+        self.assertEqual(result.items, [])
+        self.assertEqual(tuple(result.timings), ("load", "detect"))
+        self.ocr.assert_not_called()
+
+
+class TestAddLineItems(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        engine = get_engine(f"sqlite:///{os.path.join(self.tmpdir, 'receipt.db')}")
+        Base.metadata.create_all(engine)
+        self.manager = InventoryManager(engine)
+        self.manager.add_user("shopper")
+        self.manager.add_list("shopper", "Inventory")
+
+    def tearDown(self):
+        self.manager.session.remove()
+        self.manager.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def test_add_line_items(self):
+        items = [ReceiptLineItem("MILK", 1.0, 3.48), ReceiptLineItem("BANANAS", 2.13, 1.26)]
+        result = add_line_items(self.manager, "shopper", "Inventory", items, category_name="Groceries")
+
+        self.assertEqual(result.inserted, 2)
+        self.assertEqual(self.manager.get_active_items("shopper", "Inventory"), [
+            {"name": "MILK", "quantity": 1.0},
+            {"name": "BANANAS", "quantity": 2.13},
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
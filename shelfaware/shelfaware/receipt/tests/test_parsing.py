@@ -0,0 +1,45 @@
+import unittest
+from shelfaware.receipt.parsing import parse_line_items
+
+RECEIPT = """WHOLE FOODS MARKET
+123 MAIN ST
+4011 BANANAS
+2.13 lb @ 0.59 /lb      1.26 F
+007874235186 GV MILK 2%   3.98 N
+2 AT 1.99
+GREEK YOGURT
+2 @ 1.99   3.98 F
+2 x AVOCADO   $2.50
+BREAD 2,99
+COUPON BREAD  -0.50
+SUBTOTAL  14.71
+TAX 0.32
+TOTAL 15.03
+VISA  15.03
+CHANGE 0.00
+"""
+
+
+class TestParseLineItems(unittest.TestCase):
+
+    def test_line_items(self):
+        items = [(item.name, item.quantity, item.price) for item in parse_line_items(RECEIPT)]
+        self.assertEqual(items, [
+            ("BANANAS", 2.13, 1.26),
+            ("GV MILK 2%", 2.0, 3.98),
+            ("GREEK YOGURT", 2.0, 3.98),
+            ("AVOCADO", 2.0, 2.50),
+            ("BREAD", 1.0, 2.99),
+        ])
+
+    def test_skips_totals_and_noise(self):
+        self.assertEqual(parse_line_items("SUBTOTAL 4.00\n\n12.00\n-- 3.00\nThank you!"), [])
+
+    def test_keeps_source_line(self):
+        item, = parse_line_items("EGGS LARGE 12CT  4.49 F")
+        self.assertEqual(item.line, "EGGS LARGE 12CT  4.49 F")
+        self.assertEqual(item.as_dict(), {"name": "EGGS LARGE 12CT", "quantity": 1.0, "price": 4.49})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import cv2
+import numpy as np
+from shelfaware.receipt.preprocess import crop_box, estimate_skew, prepare_receipt
+
+
+def make_receipt(angle=0.0):
+    # A white receipt with lines of black text on a dark table, optionally rotated
+    receipt = np.full((520, 300, 3), 235, dtype=np.uint8)
+    for row in range(14):
+        cv2.putText(receipt, f"ITEM {row:02d} ....  {row + 1}.99", (15, 40 + row * 34),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 2)
+    if angle:
+        matrix = cv2.getRotationMatrix2D((150, 260), angle, 1.0)
+        receipt = cv2.warpAffine(receipt, matrix, (300, 520), borderValue=(235, 235, 235))
+    image = np.full((700, 600, 3), 60, dtype=np.uint8)
+    image[90:610, 150:450] = receipt
+    return image, [150, 90, 450, 610]
+
+
+class TestPreprocess(unittest.TestCase):
+
+    def test_crop_box_clips_to_image(self):
+        image = np.zeros((100, 200, 3), dtype=np.uint8)
+        self.assertEqual(crop_box(image, [0, 0, 200, 100]).shape, (100, 200, 3))
+        self.assertEqual(crop_box(image, [50, 20, 150, 80], padding=0.1).shape, (72, 120, 3))
+
+    def test_estimate_skew(self):
+        for angle in (-6.0, 0.0, 4.0):
+            with self.subTest(angle=angle):
+                image, box = make_receipt(angle)
+                gray = cv2.cvtColor(crop_box(image, box, padding=0), cv2.COLOR_RGB2GRAY)
+                self.assertAlmostEqual(estimate_skew(gray), -angle, delta=0.5)
+
+    def test_prepare_receipt(self):
+        image, box = make_receipt(5.0)
+        prepared = prepare_receipt(image, box, target_width=600)
+
+        self.assertEqual(prepared.shape[1], 600)
+        self.assertEqual(prepared.ndim, 2)
+        self.assertEqual(set(np.unique(prepared)), {0, 255})
+        # Mostly white paper with some black text
+        self.assertGreater((prepared == 255).mean(), 0.7)
+
+    def test_prepare_empty_box(self):
+        image, _ = make_receipt()
+        with self.assertRaises(ValueError):
+            prepare_receipt(image, [10, 10, 10, 50])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,79 @@
+import datetime
+import json
+import logging
 import os
-from fastapi import FastAPI
+import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional
+import requests
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.engine import make_url
+from shelfaware.barcode.pool import BarcodeWorkerPool, PoolUnavailableError
+from shelfaware.food_inventory.async_inventory import AsyncInventoryManager
+from shelfaware.food_inventory.inventory import DEFAULT_ITEM_FIELDS, InventoryManager, check_item_fields
+from shelfaware.food_inventory.models import get_database_url
+from shelfaware.food_inventory.search import SEARCH_KINDS
+from shelfaware.openfoods.client import OpenFoodClient
+from shelfaware.openfoods.images import ImageStore
 
 # Allow environment variables for dynamic configuration
 HOST = os.getenv("SHELFWARE_HOST", "localhost")
 PORT = int(os.getenv("SHELFAWARE_PORT", 8000))
 FRONTEND_URL = os.getenv("SHELFAWARE_FRONTEND_URL", "http://localhost:3000")
+IMAGE_DIR = os.getenv("SHELFAWARE_IMAGE_DIR", "openfoods_images")
+DEFAULT_USERNAME = os.getenv("SHELFAWARE_DEFAULT_USER", "default")
+DEFAULT_LIST = os.getenv("SHELFAWARE_DEFAULT_LIST", "Inventory")
+BARCODE_MODEL = os.getenv("SHELFAWARE_BARCODE_MODEL", "models/barcodes.pt")
+BARCODE_BACKEND = os.getenv("SHELFAWARE_BARCODE_BACKEND", "ultralytics")
+BARCODE_DECODER = os.getenv("SHELFAWARE_BARCODE_DECODER", "pyzbar")
+# Comma separated, e.g. EAN13,UPCA to only decode grocery barcodes. Empty decodes every type.
+BARCODE_SYMBOLOGIES = [name for name in os.getenv("SHELFAWARE_BARCODE_SYMBOLOGIES", "").split(",") if name]
+SCAN_WORKERS = int(os.getenv("SHELFAWARE_SCAN_WORKERS", 2))
+SCAN_MAX_BATCH = int(os.getenv("SHELFAWARE_SCAN_MAX_BATCH", 8))
+SCAN_BATCH_WINDOW_MS = float(os.getenv("SHELFAWARE_SCAN_BATCH_WINDOW_MS", 5))
+# Load the detector at startup instead of on the first POST /scan
+SCAN_PRELOAD = os.getenv("SHELFAWARE_SCAN_PRELOAD", "false").lower() in ("1", "true", "yes")
+MAX_ITEMS_PAGE_SIZE = int(os.getenv("SHELFAWARE_MAX_ITEMS_PAGE_SIZE", 5000))
+EXPORT_BATCH_SIZE = int(os.getenv("SHELFAWARE_EXPORT_BATCH_SIZE", 1000))
+MAX_SEARCH_RESULTS = int(os.getenv("SHELFAWARE_MAX_SEARCH_RESULTS", 100))
+MAX_UPLOAD_BYTES = int(os.getenv("SHELFAWARE_MAX_UPLOAD_BYTES", 20 * 1024 * 1024))
 
-app = FastAPI()
+IMAGE_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_scan_pool():
+    return BarcodeWorkerPool(
+        BARCODE_MODEL, workers=SCAN_WORKERS, max_batch=SCAN_MAX_BATCH, batch_window=SCAN_BATCH_WINDOW_MS / 1000,
+        backend=BARCODE_BACKEND, decoder=BARCODE_DECODER, symbologies=BARCODE_SYMBOLOGIES or None,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_food_client():
+    return OpenFoodClient()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # The workers start on the first scan, so the rest of the API runs without the model or torch
+    if SCAN_PRELOAD:
+        try:
+            await get_scan_pool().start()
+        except PoolUnavailableError as e:
+            logger.warning("Barcode scanning is unavailable: %s", e)
+    yield
+    await get_scan_pool().close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow CORS for React app running on the same server
 app.add_middleware(
@@ -22,21 +87,231 @@ app.add_middleware(
 
 class Item(BaseModel):
     name: str
-    quantity: int
+    quantity: float
+    category: str = "Uncategorized"
+
+
+@lru_cache(maxsize=None)
+def get_inventory():
+    return AsyncInventoryManager()
+
 
+@lru_cache(maxsize=None)
+def get_sync_inventory():
+    return InventoryManager()
 
-# Endpoint to get all items (dummy data for now)
+
+def use_sync_inventory():
+    # SQLite runs one writer at a time, and aiosqlite adds a thread hop per query, so /items has
+    # lower tail latency with the sync manager on the thread pool (benchmarks/bench_items_api.py).
+    # Other databases use the async drivers.
+    return make_url(get_database_url()).get_backend_name() == "sqlite"
+
+
+async def _with_sync_inventory(function):
+    # Runs function(manager) on the thread pool, in one unit of work that releases the session
+    def call():
+        inventory = get_sync_inventory()
+        with inventory.session_scope():
+            return function(inventory)
+    return await run_in_threadpool(call)
+
+
+def _json_default(value):
+    # Dates in the same ISO format as the JSON endpoints
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _item_fields(fields):
+    # Comma separated field names from the query string
+    return tuple(field.strip() for field in fields.split(",") if field.strip()) if fields else DEFAULT_ITEM_FIELDS
+
+
+# Endpoint to get the items on a list that have not been removed. Every item is returned unless
+# a limit is given; pages then stay a plain list, and the cursor of the next page is in the
+# X-Next-Cursor and Link headers.
 @app.get("/items")
-def read_items():
-    return [{"name": "Apple", "quantity": 10}, {"name": "Banana", "quantity": 5}]
+async def read_items(request: Request, response: Response, username: str = DEFAULT_USERNAME,
+                     list_name: str = DEFAULT_LIST, limit: Optional[int] = None, cursor: Optional[str] = None,
+                     fields: Optional[str] = None):
+    if limit is not None and not 1 <= limit <= MAX_ITEMS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_ITEMS_PAGE_SIZE}")
+    fields = _item_fields(fields)
+    try:
+        if use_sync_inventory():
+            items, next_cursor = await _with_sync_inventory(
+                lambda inventory: inventory.get_active_items_page(username, list_name, limit, cursor, fields)
+            )
+        else:
+            items, next_cursor = await get_inventory().get_active_items_page(username, list_name, limit, cursor, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return items
+
+
+# Endpoint to export every item still on a list as newline-delimited JSON, streamed from the
+# database in batches so memory does not grow with the size of the list
+@app.get("/items/export")
+async def export_items(username: str = DEFAULT_USERNAME, list_name: str = DEFAULT_LIST,
+                       fields: Optional[str] = None):
+    fields = _item_fields(fields)
+    try:
+        # Checked before the response starts, since errors cannot be reported once it has
+        check_item_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def lines():
+        async for items in get_inventory().iter_active_item_batches(username, list_name, fields, EXPORT_BATCH_SIZE):
+            yield "".join(json.dumps(item, default=_json_default) + "\n" for item in items)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 # Endpoint to add an item
 @app.post("/items")
-def create_item(item: Item):
+async def create_item(item: Item, username: str = DEFAULT_USERNAME, list_name: str = DEFAULT_LIST):
+    def add(inventory):
+        inventory.add_category(item.category)
+        inventory.add_list_item(username, list_name, item.name, item.quantity, item.category)
+
+    try:
+        if use_sync_inventory():
+            await _with_sync_inventory(add)
+        else:
+            inventory = get_inventory()
+            await inventory.add_category(item.category)
+            await inventory.add_list_item(username, list_name, item.name, item.quantity, item.category)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {"message": f"Item {item.name} added with quantity {item.quantity}"}
 
 
+# Endpoint to forecast when items run out and suggest a shopping list, from the action history
+@app.get("/forecast")
+async def read_forecast(username: str = DEFAULT_USERNAME, window_days: float = 90, horizon_days: float = 7,
+                        cover_days: float = 14):
+    if window_days <= 0 or horizon_days < 0 or cover_days <= 0:
+        raise HTTPException(status_code=400, detail="window_days and cover_days must be positive, horizon_days at least 0")
+    forecast = await get_inventory().get_forecast(username, window_days=window_days)
+    return {
+        "items": forecast.items(),
+        "shopping_list": forecast.shopping_list(horizon_days=horizon_days, cover_days=cover_days),
+    }
+
+
+# Endpoint to search foods and list items as the user types, one page at a time
+@app.get("/search")
+async def search(q: str, username: str = DEFAULT_USERNAME, kind: Optional[str] = None, limit: int = 20,
+                 offset: int = 0):
+    if kind is not None and kind not in SEARCH_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(SEARCH_KINDS)}")
+    if not 1 <= limit <= MAX_SEARCH_RESULTS or offset < 0:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SEARCH_RESULTS}, offset at least 0")
+    try:
+        page = await get_inventory().search(q, username, SEARCH_KINDS if kind is None else (kind,), limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return page.as_dict()
+
+
+def _limit_body(request, max_bytes):
+    # A request whose body is read through it fails with 413 as soon as it exceeds max_bytes,
+    # so an oversized upload is never buffered whole
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise HTTPException(status_code=413, detail="Upload too large")
+    received = 0
+
+    async def receive():
+        nonlocal received
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > max_bytes:
+                raise HTTPException(status_code=413, detail="Upload too large")
+        return message
+
+    return Request(request.scope, receive)
+
+
+async def _read_upload(request):
+    request = _limit_body(request, MAX_UPLOAD_BYTES)
+    # Multipart form uploads use the "file" field, anything else is taken as the raw image
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Missing file field")
+        data = await upload.read()
+    else:
+        data = await request.body()
+
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return data
+
+
+# Endpoint to detect and decode the barcodes in an uploaded photo and look up their products
+@app.post("/scan")
+async def scan_image(request: Request):
+    data = await _read_upload(request)
+    try:
+        barcodes = await get_scan_pool().scan(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    codes = [barcode_data for _, barcode_data in barcodes]
+    try:
+        # The client blocks on HTTP, so it runs on the thread pool
+        products = await run_in_threadpool(get_food_client().fetch_products, codes)
+    except requests.RequestException:
+        products = [None] * len(codes)
+
+    return {
+        "barcodes": [
+            {
+                "type": barcode_type,
+                "data": barcode_data,
+                "product": None if product is None else {
+                    "product_name": product.product_name,
+                    "brands": product.brands,
+                    "categories": product.categories,
+                    "image_url": product.image_url,
+                },
+            }
+            for (barcode_type, barcode_data), product in zip(barcodes, products)
+        ]
+    }
+
+
+@lru_cache(maxsize=None)
+def get_image_store():
+    return ImageStore(IMAGE_DIR)
+
+
+# Endpoint to get the thumbnail of a product image by its content hash
+@app.get("/images/{image_hash}/thumbnail")
+def read_thumbnail(image_hash: str):
+    image_store = get_image_store()
+    if not IMAGE_HASH_PATTERN.match(image_hash) or image_hash not in image_store:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    # Content-addressed, so the thumbnail for a hash never changes
+    media_type = "image/webp" if image_store.thumbnail_format == "WEBP" else "image/jpeg"
+    return FileResponse(
+        image_store.thumbnail_path(image_hash),
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 # Run the app with uvicorn
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,165 @@
+import asyncio
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from shelfaware import server
+from shelfaware.food_inventory.async_inventory import AsyncInventoryManager, get_async_engine
+from shelfaware.food_inventory.inventory import InventoryManager
+from shelfaware.food_inventory.models import Base, get_engine
+
+
+class TestItemsEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(self.tmpdir, 'server.db')}"
+        Base.metadata.create_all(get_engine(url))
+        self.engine = get_async_engine(url)
+        self.manager = AsyncInventoryManager(self.engine)
+
+        async def seed():
+            await self.manager.add_user("alice")
+            await self.manager.add_list("alice", "Pantry")
+        asyncio.run(seed())
+
+        patchers = (
+            patch.object(server, "get_inventory", return_value=self.manager),
+            patch.object(server, "get_sync_inventory", return_value=InventoryManager(get_engine(url))),
+        )
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(server.app)
+
+    def tearDown(self):
+        asyncio.run(self.engine.dispose())
+        shutil.rmtree(self.tmpdir)
+
+    def test_create_and_read_items(self):
+        params = {"username": "alice", "list_name": "Pantry"}
+        expected = []
+        # The sync manager on the thread pool (SQLite) and the async manager (other databases)
+        for sync, name in ((True, "Rice"), (False, "Oats")):
+            with self.subTest(sync=sync), patch.object(server, "use_sync_inventory", return_value=sync):
+                response = self.client.post("/items", params=params,
+                                            json={"name": name, "quantity": 2, "category": "Grains"})
+                self.assertEqual(response.status_code, 200)
+
+                expected.append({"name": name, "quantity": 2.0})
+                response = self.client.get("/items", params=params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected)
+
+                response = self.client.post("/items", params={"username": "alice", "list_name": "Missing"},
+                                            json={"name": name, "quantity": 1})
+                self.assertEqual(response.status_code, 404)
+
+    def test_read_items_pages(self):
+        async def seed():
+            await self.manager.add_category("Grains")
+            for i in range(5):
+                await self.manager.add_list_item("alice", "Pantry", f"Grain {i}", i, "Grains")
+        asyncio.run(seed())
+
+        params = {"username": "alice", "list_name": "Pantry", "limit": 2}
+        names = []
+        while True:
+            response = self.client.get("/items", params=params)
+            self.assertEqual(response.status_code, 200)
+            names.extend(item["name"] for item in response.json())
+            if "X-Next-Cursor" not in response.headers:
+                break
+            self.assertIn('rel="next"', response.headers["Link"])
+            params["cursor"] = response.headers["X-Next-Cursor"]
+        self.assertEqual(names, [f"Grain {i}" for i in range(5)])
+
+        # Without a limit every item comes back in one response
+        response = self.client.get("/items", params={"username": "alice", "list_name": "Pantry"})
+        self.assertEqual([item["name"] for item in response.json()], names)
+        self.assertNotIn("X-Next-Cursor", response.headers)
+
+        response = self.client.get("/items", params={"username": "alice", "list_name": "Pantry", "limit": 1,
+                                                      "fields": "id,name,category"})
+        self.assertEqual(list(response.json()[0]), ["id", "name", "category"])
+        self.assertEqual(response.json()[0]["category"], "Grains")
+
+        for params in ({"cursor": "nope"}, {"fields": "name,image"}, {"limit": 0}):
+            self.assertEqual(self.client.get("/items", params=params).status_code, 400)
+
+    def test_export_items(self):
+        async def seed():
+            await self.manager.add_category("Grains")
+            for i in range(3):
+                await self.manager.add_list_item("alice", "Pantry", f"Grain {i}", i, "Grains")
+        asyncio.run(seed())
+
+        params = {"username": "alice", "list_name": "Pantry", "fields": "name,quantity,date_added"}
+        with patch.object(server, "EXPORT_BATCH_SIZE", 2):
+            response = self.client.get("/items/export", params=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        items = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([(item["name"], item["quantity"]) for item in items],
+                         [("Grain 0", 0.0), ("Grain 1", 1.0), ("Grain 2", 2.0)])
+        datetime.datetime.fromisoformat(items[0]["date_added"])
+
+        self.assertEqual(self.client.get("/items/export", params={"fields": "image"}).status_code, 400)
+
+    def test_forecast(self):
+        async def seed():
+            await self.manager.add_category("Grains")
+            await self.manager.add_list_item("alice", "Pantry", "Oats", 1, "Grains")
+            await self.manager.add_action("alice", "Oats", "purchase", 10)
+            await self.manager.add_action("alice", "Oats", "consume", 4)
+        asyncio.run(seed())
+
+        response = self.client.get("/forecast", params={"username": "alice", "cover_days": 2})
+        self.assertEqual(response.status_code, 200)
+        # Everything happened today, so the rate is taken over a single day
+        self.assertEqual(response.json(), {
+            "items": [{"name": "Oats", "stock": 6.0, "daily_rate": 4.0, "days_until_empty": 1.5}],
+            "shopping_list": [{"name": "Oats", "quantity": 2.0, "days_until_empty": 1.5, "daily_rate": 4.0}],
+        })
+
+        response = self.client.get("/forecast", params={"username": "nobody"})
+        self.assertEqual(response.json(), {"items": [], "shopping_list": []})
+        self.assertEqual(self.client.get("/forecast", params={"window_days": 0}).status_code, 400)
+        response = self.client.get("/forecast", params={"horizon_days": -1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("horizon_days", response.json()["detail"])
+
+    def test_search(self):
+        async def seed():
+            await self.manager.add_category("Produce")
+            for name in ("Bananas", "Banana bread", "Green bananas"):
+                await self.manager.add_list_item("alice", "Pantry", name, 1, "Produce")
+        asyncio.run(seed())
+
+        response = self.client.get("/search", params={"q": "banan", "username": "alice", "limit": 2})
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual((page["mode"], len(page["results"]), page["next_offset"]), ("full_text", 2, 2))
+
+        response = self.client.get("/search", params={"q": "banan", "username": "alice", "limit": 2, "offset": 2})
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertIsNone(response.json()["next_offset"])
+
+        response = self.client.get("/search", params={"q": "bananna", "username": "alice", "kind": "list_item"})
+        self.assertEqual(response.json()["mode"], "fuzzy")
+        self.assertEqual(self.client.get("/search", params={"q": "x", "kind": "user"}).status_code, 400)
+        self.assertEqual(self.client.get("/search", params={"q": "x", "limit": 1000}).status_code, 400)
+        self.assertEqual(self.client.get("/search", params={"q": "x", "username": "nobody"}).status_code, 404)
+
+    def test_create_item_unknown_list(self):
+        response = self.client.post("/items", params={"username": "alice", "list_name": "Nope"},
+                                    json={"name": "Rice", "quantity": 1})
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from shelfaware import server
+from shelfaware.barcode.pool import PoolUnavailableError
+from shelfaware.openfoods.food import FoodProduct
+
+
+class TestScanEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = Mock()
+        self.pool.scan = AsyncMock(return_value=[("EAN13", "4099100207149"), ("EAN13", "0000000000000")])
+        self.client_off = Mock()
+        self.client_off.fetch_products.return_value = [
+            FoodProduct("Oat Milk", ["oatly"], ["plant-based-milks"], "http://example.com/oat.jpg"),
+            None,
+        ]
+        for name, value in (("get_scan_pool", self.pool), ("get_food_client", self.client_off)):
+            patcher = patch.object(server, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = TestClient(server.app)
+
+    def test_raw_jpeg(self):
+        response = self.client.post("/scan", content=b"jpeg bytes", headers={"Content-Type": "image/jpeg"})
+
+        self.assertEqual(response.status_code, 200)
+        self.pool.scan.assert_awaited_once_with(b"jpeg bytes")
+        self.client_off.fetch_products.assert_called_once_with(["4099100207149", "0000000000000"])
+        barcodes = response.json()["barcodes"]
+        self.assertEqual(barcodes[0]["product"]["product_name"], "Oat Milk")
+        self.assertIsNone(barcodes[1]["product"])
+
+    def test_multipart(self):
+        response = self.client.post("/scan", files={"file": ("photo.jpg", b"jpeg bytes", "image/jpeg")})
+
+        self.assertEqual(response.status_code, 200)
+        self.pool.scan.assert_awaited_once_with(b"jpeg bytes")
+
+    def test_bad_uploads(self):
+        self.assertEqual(self.client.post("/scan", content=b"").status_code, 400)
+
+        self.pool.scan.side_effect = ValueError("Uploaded data is not a decodable image.")
+        self.assertEqual(self.client.post("/scan", content=b"garbage").status_code, 400)
+
+    def test_upload_too_large(self):
+        with patch.object(server, "MAX_UPLOAD_BYTES", 1024):
+            # Rejected from Content-Length before the body is read
+            response = self.client.post("/scan", content=b"x" * 2048, headers={"Content-Type": "image/jpeg"})
+            self.assertEqual(response.status_code, 413)
+
+            # Without Content-Length, the upload is cut off while it is received
+            chunks = (b"x" * 512 for _ in range(4))
+            response = self.client.post("/scan", content=chunks, headers={"Content-Type": "image/jpeg"})
+            self.assertEqual(response.status_code, 413)
+
+            response = self.client.post("/scan", files={"file": ("photo.jpg", b"x" * 2048, "image/jpeg")})
+            self.assertEqual(response.status_code, 413)
+        self.pool.scan.assert_not_awaited()
+
+    def test_scanning_unavailable(self):
+        self.pool.scan.side_effect = PoolUnavailableError("Barcode workers failed to load models/barcodes.pt.")
+        response = self.client.post("/scan", content=b"jpeg bytes", headers={"Content-Type": "image/jpeg"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_startup_does_not_load_the_detector(self):
+        self.pool.start = AsyncMock()
+        self.pool.close = AsyncMock()
+        with TestClient(server.app):
+            pass
+        self.pool.start.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()